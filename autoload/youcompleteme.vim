@@ -42,19 +42,29 @@ let s:pollers = {
       \   'completion': {
       \     'id': -1,
       \     'wait_milliseconds': 10,
+      \     'max_wait_milliseconds': 80,
+      \     'interval': 0,
       \   },
       \   'signature_help': {
       \     'id': -1,
       \     'wait_milliseconds': 10,
+      \     'max_wait_milliseconds': 80,
+      \     'interval': 0,
       \   },
       \   'file_parse_response': {
       \     'id': -1,
       \     'wait_milliseconds': 100,
+      \     'max_wait_milliseconds': 800,
+      \     'interval': 0,
       \   },
       \   'server_ready': {
       \     'id': -1,
       \     'wait_milliseconds': 100,
       \   },
+      \   'server_supervisor': {
+      \     'id': -1,
+      \     'wait_milliseconds': 1000,
+      \   },
       \   'receive_messages': {
       \     'id': -1,
       \     'wait_milliseconds': 100,
@@ -67,10 +77,14 @@ let s:pollers = {
       \   'semantic_highlighting': {
       \     'id': -1,
       \     'wait_milliseconds': 100,
+      \     'max_wait_milliseconds': 800,
+      \     'interval': 0,
       \   },
       \   'inlay_hints': {
       \     'id': -1,
       \     'wait_milliseconds': 100,
+      \     'max_wait_milliseconds': 800,
+      \     'interval': 0,
       \   },
       \ }
 let s:buftype_blacklist = {
@@ -84,14 +98,105 @@ let s:last_char_inserted_by_user = v:true
 let s:enable_hover = 0
 let s:cursorhold_popup = -1
 let s:enable_inlay_hints = 0
+" Whether the events are recorded for :YcmRecordSession.
+let s:recording_session = 0
+" Whether the state of the buffers must be sent to the server once it's ready,
+" because it was restarted.
+let s:replay_server_state = 0
 
 let s:force_preview_popup = 0
 
+" Interval between the polls of responses whose arrival is notified to us (see
+" s:StartResponseNotifier). Polling is then only a safety net in case a
+" notification is missed.
+let s:notified_poll_milliseconds = 1000
+let s:unnotified_poll_milliseconds = {}
+
 let s:RESOLVE_NONE = 0
 let s:RESOLVE_UP_FRONT = 1
 let s:RESOLVE_ON_DEMAND = 2
 let s:resolve_completions = s:RESOLVE_NONE
 
+function! s:StartResponseNotifier() abort
+  if !g:ycm_response_notifications || s:is_neovim || !has( 'channel' )
+    return
+  endif
+
+  let notifier = py3eval( 'ycm_state.StartResponseNotifier()' )
+  if empty( notifier )
+    return
+  endif
+
+  let channel = ch_open( notifier.address, {
+        \   'mode': 'nl',
+        \   'callback': function( 's:OnResponseNotification' ),
+        \   'close_cb': function( 's:OnResponseNotifierClosed' ),
+        \   'waittime': 100,
+        \ } )
+  if ch_status( channel ) !=# 'open'
+    py3 ycm_state.StopResponseNotifier()
+    return
+  endif
+  call ch_sendraw( channel, notifier.token . "\n" )
+
+  for poller in notifier.pollers
+    let s:unnotified_poll_milliseconds[ poller ] =
+          \ s:pollers[ poller ].wait_milliseconds
+    let s:pollers[ poller ].wait_milliseconds = s:notified_poll_milliseconds
+  endfor
+endfunction
+
+
+function! s:OnResponseNotification( channel, poller ) abort
+  let poller = get( s:pollers, a:poller, {} )
+  if empty( poller ) || poller.id < 0
+    return
+  endif
+  let timer = timer_info( poller.id )
+  if empty( timer )
+    return
+  endif
+  " Run the pending poll now rather than when its timer fires.
+  call timer_stop( poller.id )
+  let poller.id = -1
+  call call( timer[ 0 ].callback, [ timer[ 0 ].id ] )
+endfunction
+
+
+function! s:OnResponseNotifierClosed( channel ) abort
+  for [ poller, milliseconds ] in items( s:unnotified_poll_milliseconds )
+    let s:pollers[ poller ].wait_milliseconds = milliseconds
+  endfor
+  let s:unnotified_poll_milliseconds = {}
+endfunction
+
+
+" Returns the time to wait before the next poll of the poller named |name|.
+" Unless their responses are notified to us, the pollers with
+" a max_wait_milliseconds entry adapt to the latency of the server: the first
+" poll after a request is scheduled around the time its response is expected to
+" arrive, then the interval between polls doubles from wait_milliseconds up to
+" max_wait_milliseconds. s:StopPoller starts over.
+function! s:PollDelay( name ) abort
+  let poller = s:pollers[ a:name ]
+  if !has_key( poller, 'max_wait_milliseconds' ) ||
+        \ has_key( s:unnotified_poll_milliseconds, a:name )
+    return poller.wait_milliseconds
+  endif
+
+  if poller.interval == 0
+    let poller.interval = poller.wait_milliseconds
+    return max( [ poller.wait_milliseconds,
+          \ py3eval( 'ycm_state.FirstPollDelay( "' . a:name . '" )' ) ] )
+  endif
+
+  let delay = poller.interval
+  let poller.interval = min( [ 2 * poller.interval,
+        \                      poller.max_wait_milliseconds ] )
+  return delay
+endfunction
+
+
 function! s:StartMessagePoll()
   if s:pollers.receive_messages.id < 0
     let s:pollers.receive_messages.id = timer_start(
@@ -182,9 +287,13 @@ function! youcompleteme#Enable()
   endif
 
   call s:SetUpOptions()
+  py3 ycm_startup_profile.EndPhase( 'Set up the options' )
+  call s:StartResponseNotifier()
+  py3 ycm_startup_profile.EndPhase( 'Start the response notifier' )
 
-  py3 ycm_semantic_highlighting.Initialise()
-  let s:enable_inlay_hints = py3eval( 'ycm_inlay_hints.Initialise()' ) ? 1 : 0
+  " The text properties used by semantic highlighting and inlay hints are
+  " defined when first needed.
+  let s:enable_inlay_hints = !s:is_neovim
 
   call youcompleteme#EnableCursorMovedAutocommands()
   augroup youcompleteme
@@ -205,6 +314,12 @@ function! youcompleteme#Enable()
     autocmd VimLeave * call s:OnVimLeave()
     autocmd CompleteDone * call s:OnCompleteDone()
     autocmd CompleteChanged * call s:OnCompleteChanged()
+    " Keep track of the modified buffers so that we don't have to go through all
+    " buffers to find them each time we send a request.
+    if exists( '##BufModifiedSet' )
+      autocmd BufModifiedSet,BufWritePost * call s:OnBufferModifiedSet()
+      py3 vimsupport.IndexModifiedBuffers()
+    endif
   augroup END
 
   " The FileType event is not triggered for the first loaded file. We wait until
@@ -212,6 +327,9 @@ function! youcompleteme#Enable()
   let s:pollers.server_ready.id = timer_start(
         \ s:pollers.server_ready.wait_milliseconds,
         \ function( 's:PollServerReady' ) )
+  let s:pollers.server_supervisor.id = timer_start(
+        \ s:pollers.server_supervisor.wait_milliseconds,
+        \ function( 's:SuperviseServer' ) )
 
   let s:default_completion = py3eval( 'vimsupport.NO_COMPLETIONS' )
   let s:completion = s:default_completion
@@ -229,6 +347,9 @@ function! youcompleteme#Enable()
         \ :call youcompleteme#finder#FindSymbol( 'workspace' )<CR>
   nnoremap <silent> <plug>(YCMFindSymbolInDocument)
         \ :call youcompleteme#finder#FindSymbol( 'document' )<CR>
+
+  py3 ycm_startup_profile.EndPhase( 'Set up the autocommands' )
+  py3 ycm_startup_profile.Stop()
 endfunction
 
 
@@ -280,10 +401,15 @@ sys.path[ 0:0 ] = [ p.join( root_folder, 'python' ),
 
 # We enclose this code in a try/except block to avoid backtraces in Vim.
 try:
-  # Import the modules used in this file.
+  # Imported first so that the import of the other modules can be profiled.
+  from ycm import startup_profile as ycm_startup_profile
+  if int( vim.eval( 'g:ycm_profile_startup' ) ):
+    ycm_startup_profile.Start()
+
+  # Import the modules used in this file. The other modules are imported when
+  # first used.
   from ycm import base, vimsupport, youcompleteme
-  from ycm import semantic_highlighting as ycm_semantic_highlighting
-  from ycm import inlay_hints as ycm_inlay_hints
+  ycm_startup_profile.EndPhase( 'Import the modules' )
 
   if 'ycm_state' in globals():
     # If re-initializing, pretend that we shut down
@@ -654,6 +780,9 @@ endfunction
 function s:StopPoller( poller ) abort
   call timer_stop( a:poller.id )
   let a:poller.id = -1
+  if has_key( a:poller, 'interval' )
+    let a:poller.interval = 0
+  endif
 endfunction
 
 
@@ -747,13 +876,20 @@ function! s:OnFileTypeSet()
     return
   endif
 
+  call s:RecordSessionEvent( 'FileTypeSet' )
   call s:SetUpCompleteopt()
   call s:EnableCompletingInCurrentBuffer()
   call s:StartMessagePoll()
   call s:EnableAutoHover()
 
-  py3 ycm_state.OnFileTypeSet()
-  call s:OnFileReadyToParse( 1 )
+  " Send the requests triggered by the new filetype together.
+  py3 ycm_state.StartRequestBatch()
+  try
+    py3 ycm_state.OnFileTypeSet()
+    call s:OnFileReadyToParse( 1 )
+  finally
+    py3 ycm_state.FlushRequestBatch()
+  endtry
 endfunction
 
 
@@ -787,16 +923,32 @@ function! s:OnBufferEnter()
     return
   endif
 
+  call s:RecordSessionEvent( 'BufferEnter' )
   call s:AbortAutohoverRequest()
 
   call s:SetUpCompleteopt()
   call s:EnableCompletingInCurrentBuffer()
 
   py3 ycm_state.UpdateMatches()
-  py3 ycm_state.OnBufferVisit()
-  " Last parse may be outdated because of changes from other buffers. Force a
-  " new parse.
-  call s:OnFileReadyToParse( 1 )
+  " Send the requests triggered by the buffer visit together.
+  py3 ycm_state.StartRequestBatch()
+  try
+    py3 ycm_state.OnBufferVisit()
+    " Last parse may be outdated because of changes from other buffers. Force a
+    " new parse.
+    call s:OnFileReadyToParse( 1 )
+  finally
+    py3 ycm_state.FlushRequestBatch()
+  endtry
+endfunction
+
+
+function! s:OnBufferModifiedSet()
+  let buffer_number = str2nr( expand( '<abuf>' ) )
+  let modified = getbufvar( buffer_number, '&modified' )
+  py3 vimsupport.SetBufferModified(
+        \ vimsupport.GetIntValue( 'buffer_number' ),
+        \ vimsupport.GetBoolValue( 'modified' ) )
 endfunction
 
 
@@ -804,6 +956,7 @@ function! s:OnBufferUnload()
   " Expanding <abuf> returns the unloaded buffer number as a string but we want
   " it as a true number for the getbufvar function.
   let buffer_number = str2nr( expand( '<abuf>' ) )
+  py3 vimsupport.ForgetBuffer( vimsupport.GetIntValue( 'buffer_number' ) )
   if !s:AllowedToCompleteInBuffer( buffer_number )
     return
   endif
@@ -827,6 +980,74 @@ function! s:PollServerReady( timer_id )
   endif
 
   call s:OnFileTypeSet()
+  if s:replay_server_state
+    let s:replay_server_state = 0
+    let buffers = s:ReplayableBuffers()
+    py3 ycm_state.ReplayServerState( vim.eval( 'buffers' ) )
+  endif
+endfunction
+
+
+function! s:SuperviseServer( timer_id )
+  let supervision = py3eval( 'ycm_state.SuperviseServer()' )
+  if supervision.restarted
+    call s:OnServerRestarted()
+  endif
+  if supervision.replay
+    " The server replacing the current one knows none of the buffers.
+    let buffers = s:ReplayableBuffers()
+    if s:BufferCanBeReplayed( bufnr() )
+      call insert( buffers, bufnr() )
+    endif
+    py3 ycm_state.ReplayServerState( vim.eval( 'buffers' ) )
+  endif
+  if supervision.replaced
+    call s:StopPoller( s:pollers.receive_messages )
+    call s:StartMessagePoll()
+  endif
+  let s:pollers.server_supervisor.id = timer_start(
+        \ supervision.wait_milliseconds,
+        \ function( 's:SuperviseServer' ) )
+endfunction
+
+
+" Returns the buffers whose state is sent to a restarted server, other than the
+" current one: the visible buffers, those of the current tab page first, then
+" the other loaded buffers.
+function! s:ReplayableBuffers()
+  let candidates = tabpagebuflist()
+  for tabpage in range( 1, tabpagenr( '$' ) )
+    call extend( candidates, tabpagebuflist( tabpage ) )
+  endfor
+  call extend( candidates,
+        \ filter( range( 1, bufnr( '$' ) ), 'bufloaded( v:val )' ) )
+
+  let buffers = []
+  for buffer in candidates
+    if buffer != bufnr() &&
+          \ index( buffers, buffer ) == -1 &&
+          \ s:BufferCanBeReplayed( buffer )
+      call add( buffers, buffer )
+    endif
+  endfor
+  return buffers
+endfunction
+
+
+" Like s:AllowedToCompleteInBuffer but for any buffer and without side effects.
+function! s:BufferCanBeReplayed( buffer )
+  if has_key( s:buftype_blacklist, getbufvar( a:buffer, '&buftype' ) )
+    return 0
+  endif
+
+  let filetype = getbufvar( a:buffer, '&filetype' )
+  if !youcompleteme#filetypes#AllowedForFiletype(
+        \ empty( filetype ) ? 'ycm_nofiletype' : filetype )
+    return 0
+  endif
+
+  let threshold = g:ycm_disable_for_files_larger_than_kb * 1024
+  return !( threshold > 0 && getfsize( bufname( a:buffer ) ) > threshold )
 endfunction
 
 
@@ -846,7 +1067,7 @@ function! s:OnFileReadyToParse( ... )
 
     call s:StopPoller( s:pollers.file_parse_response )
     let s:pollers.file_parse_response.id = timer_start(
-          \ s:pollers.file_parse_response.wait_milliseconds,
+          \ s:PollDelay( 'file_parse_response' ),
           \ function( 's:PollFileParseResponse' ) )
 
     call s:UpdateSemanticHighlighting( bufnr(), 1, 0 )
@@ -866,7 +1087,7 @@ function! s:UpdateSemanticHighlighting( bufnr, force, redraw_anyway ) abort
         \ . 'semantic_highlighting.Request( '
         \ . '  force=int( vim.eval( "a:force" ) ) )' )
       let s:pollers.semantic_highlighting.id = timer_start(
-            \ s:pollers.semantic_highlighting.wait_milliseconds,
+            \ s:PollDelay( 'semantic_highlighting' ),
             \ function( 's:PollSemanticHighlighting', [ a:bufnr ] ) )
     elseif a:redraw_anyway
       py3 ycm_state.Buffer(
@@ -890,7 +1111,7 @@ function! s:UpdateInlayHints( bufnr, force, redraw_anyway ) abort
         \ 'ycm_state.Buffer( int( vim.eval( "a:bufnr" ) ) ).'
         \ . 'inlay_hints.Request( force=int( vim.eval( "a:force" ) ) )' )
       let s:pollers.inlay_hints.id = timer_start(
-            \ s:pollers.inlay_hints.wait_milliseconds,
+            \ s:PollDelay( 'inlay_hints' ),
             \ function( 's:PollInlayHints', [ a:bufnr ] ) )
     elseif a:redraw_anyway
       py3 ycm_state.Buffer( int( vim.eval( "a:bufnr" ) ) ).inlay_hints.Refresh()
@@ -903,7 +1124,7 @@ endfunction
 function! s:PollFileParseResponse( ... )
   if !py3eval( "ycm_state.FileParseRequestReady()" )
     let s:pollers.file_parse_response.id = timer_start(
-          \ s:pollers.file_parse_response.wait_milliseconds,
+          \ s:PollDelay( 'file_parse_response' ),
           \ function( 's:PollFileParseResponse' ) )
     return
   endif
@@ -930,13 +1151,15 @@ function! s:PollScrollable( bufnr, scrollable, ... ) abort
       \ 'ycm_state.Buffer( int( vim.eval( "a:bufnr" ) ) )'
       \ . '.' . a:scrollable . '.Ready()' )
     let s:pollers[a:scrollable].id = timer_start(
-          \ s:pollers[a:scrollable].wait_milliseconds,
+          \ s:PollDelay( a:scrollable ),
           \ function( 's:PollScrollable', [ a:bufnr, a:scrollable ] ) )
   elseif ! py3eval(
       \ 'ycm_state.Buffer( int( vim.eval( "a:bufnr" ) ) )'
       \ . '.' . a:scrollable . '.Update()' )
+    " The response was outdated and a new request was sent.
+    let s:pollers[ a:scrollable ].interval = 0
     let s:pollers[ a:scrollable ].id = timer_start(
-          \ s:pollers[ a:scrollable ].wait_milliseconds,
+          \ s:PollDelay( a:scrollable ),
           \ function( 's:PollScrollable', [ a:bufnr, a:scrollable ] ) )
   endif
 endfunction
@@ -989,6 +1212,7 @@ function! s:OnCursorMovedNormalMode()
     return
   endif
 
+  call s:RecordSessionEvent( 'CursorMovedNormalMode' )
   call s:AbortAutohoverRequest()
 
   py3 ycm_state.OnCursorMoved()
@@ -1000,6 +1224,7 @@ function! s:OnWinScrolled()
     return
   endif
   let bufnr = winbufnr( expand( '<afile>' ) )
+  call s:RecordSessionEvent( 'WinScrolled', bufnr )
   call s:UpdateSemanticHighlighting( bufnr, 0, 0 )
   call s:UpdateInlayHints( bufnr, 0, 0 )
 endfunction
@@ -1010,6 +1235,7 @@ function! s:OnTextChangedNormalMode()
     return
   endif
 
+  call s:RecordSessionEvent( 'TextChangedNormalMode' )
   call s:OnFileReadyToParse()
 endfunction
 
@@ -1027,6 +1253,7 @@ function! s:OnTextChangedInsertMode( popup_is_visible )
     return
   endif
 
+  call s:RecordSessionEvent( 'TextChangedInsertMode' )
   let s:current_cursor_position = getpos( '.' )
   if s:completion_stopped
     let s:completion_stopped = 0
@@ -1061,6 +1288,7 @@ endfunction
 
 
 function! s:OnInsertEnter() abort
+  call s:RecordSessionEvent( 'InsertEnter' )
   let s:current_cursor_position = getpos( '.' )
   py3 ycm_state.OnInsertEnter()
   if s:ShouldUseInlayHintsNow( bufnr() ) &&
@@ -1074,6 +1302,7 @@ function! s:OnInsertLeave()
     return
   endif
 
+  call s:RecordSessionEvent( 'InsertLeave' )
   let s:last_char_inserted_by_user = v:false
 
   call s:StopPoller( s:pollers.completion )
@@ -1251,7 +1480,7 @@ endfunction
 function! s:PollCompletion( ... )
   if !py3eval( 'ycm_state.CompletionRequestReady()' )
     let s:pollers.completion.id = timer_start(
-          \ s:pollers.completion.wait_milliseconds,
+          \ s:PollDelay( 'completion' ),
           \ function( 's:PollCompletion' ) )
     return
   endif
@@ -1266,7 +1495,7 @@ endfunction
 function! s:PollResolve( item, ... )
   if !py3eval( 'ycm_state.CompletionRequestReady()' )
     let s:pollers.completion.id = timer_start(
-          \ s:pollers.completion.wait_milliseconds,
+          \ s:PollDelay( 'completion' ),
           \ function( 's:PollResolve', [ a:item ] ) )
     return
   endif
@@ -1326,7 +1555,7 @@ function! s:PollSignatureHelp( ... )
 
   if !py3eval( 'ycm_state.SignatureHelpRequestReady()' )
     let s:pollers.signature_help.id = timer_start(
-          \ s:pollers.signature_help.wait_milliseconds,
+          \ s:PollDelay( 'signature_help' ),
           \ function( 's:PollSignatureHelp' ) )
     return
   endif
@@ -1359,9 +1588,12 @@ function! s:Complete()
   if len( s:completion.completions )
     let old_completeopt = &completeopt
     setlocal completeopt+=noselect
+    let start_time = reltime()
     call complete( s:completion.completion_start_column,
                  \ s:completion.completions )
     let &completeopt = old_completeopt
+    call py3eval( printf( 'ycm_state.OnCompletionDisplayed( %f )',
+                        \ reltimefloat( reltime( start_time ) ) ) )
   elseif pumvisible()
     call s:CloseCompletionMenu()
   endif
@@ -1396,6 +1628,13 @@ endfunction
 function! s:SetUpCommands()
   command! YcmRestartServer call s:RestartServer()
   command! YcmDebugInfo call s:DebugInfo()
+  command! -nargs=? -complete=file
+        \ YcmLatencyStats call s:LatencyStats( <f-args> )
+  command! -nargs=1 -complete=file
+        \ YcmDumpTrace call s:DumpTrace( <f-args> )
+  command! -nargs=? -complete=file
+        \ YcmRecordSession call s:RecordSession( <f-args> )
+  command! YcmStartupProfile call s:StartupProfile()
   command! -nargs=* -complete=custom,youcompleteme#LogsComplete -count=0
         \ YcmToggleLogs call s:ToggleLogs( <f-count>,
                                          \ <f-mods>,
@@ -1417,11 +1656,16 @@ function! s:RestartServer()
   call s:SetUpOptions()
 
   py3 ycm_state.RestartServer()
+  call s:OnServerRestarted()
+endfunction
 
+
+function! s:OnServerRestarted()
   call s:StopPoller( s:pollers.receive_messages )
   call s:StopPoller( s:pollers.command )
   call s:ClearSignatureHelp()
 
+  let s:replay_server_state = 1
   call s:StopPoller( s:pollers.server_ready )
   let s:pollers.server_ready.id = timer_start(
         \ s:pollers.server_ready.wait_milliseconds,
@@ -1442,6 +1686,55 @@ function! s:DebugInfo()
 endfunction
 
 
+function! s:LatencyStats( ... )
+  if a:0 > 0
+    py3 ycm_state.DumpLatencySamples( vim.eval( 'expand( a:1 )' ) )
+    return
+  endif
+  for line in split( py3eval( 'ycm_state.LatencyStats()' ), "\n" )
+    echom line
+  endfor
+endfunction
+
+
+function! s:DumpTrace( filepath )
+  py3 ycm_state.DumpTrace( vim.eval( 'expand( a:filepath )' ) )
+endfunction
+
+
+function! s:StartupProfile()
+  for line in split( py3eval( 'ycm_startup_profile.Report()' ), "\n" )
+    echom line
+  endfor
+endfunction
+
+
+function! s:RecordSession( ... )
+  if a:0 == 0
+    let s:recording_session = 0
+    py3 ycm_state.StopSessionRecording()
+    return
+  endif
+  " The options deciding which requests are sent, which are read by this
+  " script rather than by the Python code.
+  let options = {
+        \ 'semantic_highlighting':
+        \   get( g:, 'ycm_enable_semantic_highlighting', 0 ),
+        \ 'inlay_hints': s:ShouldUseInlayHintsNow( bufnr() ) }
+  py3 ycm_state.StartSessionRecording( vim.eval( 'expand( a:1 )' ),
+                                     \ vim.eval( 'options' ) )
+  let s:recording_session = 1
+endfunction
+
+
+function! s:RecordSessionEvent( event, ... )
+  if s:recording_session
+    py3 ycm_state.RecordSessionEvent( vim.eval( 'a:event' ),
+                                    \ vim.eval( 'a:000' ) )
+  endif
+endfunction
+
+
 function! s:ToggleLogs( count, ... )
   py3 ycm_state.ToggleLogs( vimsupport.GetIntValue( 'a:count' ),
                           \ *vim.eval( 'a:000' ) )
@@ -1564,6 +1857,8 @@ endfunction
 
 
 function! s:CompleterCommand( mods, count, line1, line2, ... )
+  call s:RecordSessionEvent( 'Command', a:000, a:mods, a:count, a:line1,
+                           \ a:line2 )
   py3 ycm_state.SendCommandRequest(
         \ vim.eval( 'a:000' ),
         \ vim.eval( 'a:mods' ),
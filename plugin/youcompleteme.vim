@@ -137,6 +137,30 @@ let g:ycm_keep_logfiles =
       \ get( g:, 'ycm_keep_logfiles',
       \ get( g:, 'ycm_server_keep_logfiles', 0 ) )
 
+let g:ycm_server_use_unix_socket =
+      \ get( g:, 'ycm_server_use_unix_socket', 0 )
+
+let g:ycm_response_notifications =
+      \ get( g:, 'ycm_response_notifications', 1 )
+
+let g:ycm_trace_events =
+      \ get( g:, 'ycm_trace_events', 0 )
+
+let g:ycm_profile_startup =
+      \ get( g:, 'ycm_profile_startup', 0 )
+
+let g:ycm_shared_server =
+      \ get( g:, 'ycm_shared_server', 0 )
+
+let g:ycm_startup_cache =
+      \ get( g:, 'ycm_startup_cache', 1 )
+
+let g:ycm_auto_restart_server =
+      \ get( g:, 'ycm_auto_restart_server', 1 )
+
+let g:ycm_server_memory_limit_mb =
+      \ get( g:, 'ycm_server_memory_limit_mb', 0 )
+
 let g:ycm_extra_conf_vim_data =
       \ get( g:, 'ycm_extra_conf_vim_data', [] )
 
@@ -19,15 +19,38 @@ import os
 import json
 
 from ycm import vimsupport, paths
+from ycm.persistent_cache import FileStamp, PersistentCache
 from ycmd import identifier_utils
 
 YCM_VAR_PREFIX = 'ycm_'
 
+_OPTIONS_CACHE = PersistentCache( 'options' )
+
 
 def GetUserOptions( default_options = {} ):
   """Builds a dictionary mapping YCM Vim user options to values. Option names
-  don't have the 'ycm_' prefix."""
+  don't have the 'ycm_' prefix. Unless disabled by g:ycm_startup_cache, the
+  options are cached until ycmd's defaults or the YCM Vim globals change, which
+  is checked with a single evaluation rather than one per option."""
+  defaults_file = os.path.join( paths.DIR_OF_YCMD,
+                                'ycmd',
+                                'default_settings.json' )
+  fingerprint = vimsupport.GetVimGlobalsFingerprint( YCM_VAR_PREFIX )
+  if fingerprint is None:
+    return _ReadUserOptions( defaults_file, default_options )
+
+  cache_key = [ FileStamp( defaults_file ), default_options, fingerprint ]
+  user_options = _OPTIONS_CACHE.Get( cache_key )
+  if user_options is not None:
+    return user_options
+
+  user_options = _ReadUserOptions( defaults_file, default_options )
+  if user_options.get( 'startup_cache' ):
+    _OPTIONS_CACHE.Set( cache_key, user_options )
+  return user_options
+
 
+def _ReadUserOptions( defaults_file, default_options ):
   user_options = {}
 
   # First load the default settings from ycmd. We do this to ensure that any
@@ -35,9 +58,6 @@ def GetUserOptions( default_options = {} ):
   # omnicompleter) don't have to constantly check for values being present, and
   # so that we don't jave to dulicate the list of server settings in
   # youcomplete.vim
-  defaults_file =  os.path.join( paths.DIR_OF_YCMD,
-                                 'ycmd',
-                                 'default_settings.json' )
   if os.path.exists( defaults_file ):
     with open( defaults_file ) as defaults_file_handle:
       user_options = json.load( defaults_file_handle )
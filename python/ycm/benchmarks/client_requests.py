@@ -0,0 +1,372 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Measures the latency and the memory allocations of the requests sent by the
+client, from building their data to converting their response, against a fake
+ycmd started in another process. Run it from the python directory, with ycmd
+in the Python path, with:
+
+  python -m ycm.benchmarks.client_requests
+
+The fake ycmd supports the protocol extensions of the client, which negotiates
+them like with ycmd: the requests of the buffer_enter scenario are batched,
+unchanged buffers aren't sent again and superseded requests are cancelled on
+the server. Compare with a server without them with --extensions=.
+
+Save the results with --json and compare later runs to them with --baseline:
+the command then fails if the median latency, or the peak memory allocated, of
+a scenario grew by more than --max-regression percent. Results are only
+comparable between runs with the same arguments on the same machine."""
+
+from ycm.benchmarks import simulation
+vim = simulation.Install()
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from base64 import b64encode
+from concurrent.futures import wait
+
+import ycm
+import ycmd
+from ycm.benchmarks.fake_ycmd import EXTENSIONS
+from ycm.client.base_request import BaseRequest, BuildRequestData
+from ycm.client.completion_request import CompletionRequest
+from ycm.client.event_notification import EventNotification
+from ycm.client.semantic_tokens_request import SemanticTokensRequest
+from ycmd import utils
+
+HMAC_SECRET_LENGTH = 16
+_SERVER_STARTUP_TIMEOUT_SEC = 10
+# The cursor is at the end of the first line of the buffer.
+_CURSOR = ( 1, 9 )
+
+
+def _Wait( request ):
+  # Rather than polling like Vim, which would add the polling interval to the
+  # measures.
+  wait( [ request._response_future ] )
+
+
+def _Ready( buffer ):
+  return BaseRequest().GetDataFromHandler( 'ready', display_message = False )
+
+
+def _Completion( buffer ):
+  request = CompletionRequest( BuildRequestData() )
+  request.Start()
+  _Wait( request )
+  return request.Response()[ 'completions' ]
+
+
+def _Typing( buffer ):
+  # Every keystroke changes the buffer, so its data isn't cached.
+  buffer[ 0 ] = buffer[ 0 ] + 'x'
+  return _Completion( buffer )
+
+
+def _FileReadyToParse( buffer ):
+  request = EventNotification( 'FileReadyToParse', buffer.number )
+  request.Start()
+  _Wait( request )
+  return request.Response()
+
+
+def _BufferVisit( buffer ):
+  request = EventNotification( 'BufferVisit', buffer.number )
+  request.Start()
+  _Wait( request )
+  return request.Done()
+
+
+def _BufferEnter( buffer ):
+  # The event notifications sent when entering a buffer, in a single batch if
+  # the server supports it.
+  BaseRequest.StartRequestBatch()
+  try:
+    visit = EventNotification( 'BufferVisit', buffer.number )
+    visit.Start()
+    parse = EventNotification( 'FileReadyToParse', buffer.number )
+    parse.Start()
+  finally:
+    BaseRequest.FlushRequestBatch()
+  _Wait( visit )
+  _Wait( parse )
+  return visit.Done() and parse.Response()
+
+
+def _CancelledCompletion( buffer ):
+  # A completion request abandoned for a newer one, like when typing faster
+  # than the server responds. The server is asked to stop working on the first
+  # one if it was sent already.
+  request = CompletionRequest( BuildRequestData() )
+  request.Start()
+  request.Cancel()
+  return _Completion( buffer )
+
+
+def _SemanticTokens( buffer ):
+  request = SemanticTokensRequest( BuildRequestData( buffer.number ) )
+  request.Start()
+  _Wait( request )
+  return request.Response()[ 'tokens' ]
+
+
+# Each scenario does what the client does for a single request and returns a
+# non-empty value if it succeeded.
+SCENARIOS = {
+  'ready': _Ready,
+  'completion': _Completion,
+  'typing': _Typing,
+  'file_ready_to_parse': _FileReadyToParse,
+  'buffer_visit': _BufferVisit,
+  'buffer_enter': _BufferEnter,
+  'cancelled_completion': _CancelledCompletion,
+  'semantic_tokens': _SemanticTokens,
+}
+
+
+def _Buffer( lines ):
+  contents = [ f'int line_{ index } = compute( argument_{ index } );'
+               for index in range( lines ) ]
+  contents[ 0 ] = 'candidate'
+  return simulation.Buffer(
+    os.path.join( tempfile.gettempdir(), 'benchmark.cpp' ),
+    contents = contents,
+    filetype = 'cpp' )
+
+
+def _StartServer( args ):
+  hmac_secret = os.urandom( HMAC_SECRET_LENGTH )
+  # The options file is deleted by the server, like ycmd does.
+  with tempfile.NamedTemporaryFile( delete = False,
+                                    mode = 'w+' ) as options_file:
+    json.dump( { 'hmac_secret': utils.ToUnicode( b64encode( hmac_secret ) ) },
+               options_file )
+  port = utils.GetUnusedLocalhostPort()
+  command = [ sys.executable, '-m', 'ycm.benchmarks.fake_ycmd',
+              f'--port={ port }',
+              f'--options_file={ options_file.name }',
+              f'--completions={ args.completions }',
+              f'--detail={ args.detail }',
+              f'--diagnostics={ args.diagnostics }',
+              f'--tokens={ args.tokens }',
+              f'--extensions={ args.extensions }' ]
+  command.extend( f'--delay={ delay }' for delay in args.delay )
+  python_path = [ os.path.dirname( os.path.dirname( package.__file__ ) )
+                  for package in ( ycm, ycmd ) ]
+  server = subprocess.Popen(
+    command,
+    env = dict( os.environ, PYTHONPATH = os.pathsep.join( python_path ) ) )
+
+  BaseRequest.server_location = f'http://127.0.0.1:{ port }'
+  BaseRequest.hmac_secret = hmac_secret
+  BaseRequest.ConnectionPool().Reset()
+  BaseRequest.FileDataSync().Reset()
+
+  # Don't log the connection errors while the server starts.
+  logger = logging.getLogger( 'ycm.client.base_request' )
+  logger.disabled = True
+  try:
+    deadline = time.monotonic() + _SERVER_STARTUP_TIMEOUT_SEC
+    while not _Ready( None ):
+      if server.poll() is not None or time.monotonic() > deadline:
+        server.kill()
+        raise RuntimeError( 'The fake ycmd server failed to start.' )
+      time.sleep( 0.05 )
+  finally:
+    logger.disabled = False
+  return server
+
+
+def _MeasureLatency( scenario, buffer, requests ):
+  gc.collect()
+  durations = []
+  for _ in range( requests ):
+    start = time.perf_counter()
+    scenario( buffer )
+    durations.append( time.perf_counter() - start )
+  return durations
+
+
+def _MeasureAllocations( scenario, buffer, requests ):
+  """Returns the median of the peak memory allocated by each request, and the
+  memory still allocated after all of them, per request. Allocations on the
+  executor threads are included."""
+  gc.collect()
+  tracemalloc.start()
+  try:
+    start_memory, _ = tracemalloc.get_traced_memory()
+    peaks = []
+    for _ in range( requests ):
+      memory, _ = tracemalloc.get_traced_memory()
+      tracemalloc.reset_peak()
+      scenario( buffer )
+      peaks.append( tracemalloc.get_traced_memory()[ 1 ] - memory )
+    gc.collect()
+    end_memory, _ = tracemalloc.get_traced_memory()
+  finally:
+    tracemalloc.stop()
+  return statistics.median( peaks ), ( end_memory - start_memory ) / requests
+
+
+def _RunScenario( name, buffer, args ):
+  scenario = SCENARIOS[ name ]
+  for _ in range( args.warmup ):
+    if not scenario( buffer ):
+      raise RuntimeError( f'The { name } scenario failed.' )
+  durations = _MeasureLatency( scenario, buffer, args.requests )
+  peak, retained = _MeasureAllocations( scenario, buffer,
+                                        args.allocation_requests )
+  percentiles = statistics.quantiles( durations, n = 100 )
+  return { 'requests': len( durations ),
+           'median_ms': statistics.median( durations ) * 1000,
+           'p95_ms': percentiles[ 94 ] * 1000,
+           'p99_ms': percentiles[ 98 ] * 1000,
+           'mean_ms': statistics.mean( durations ) * 1000,
+           'requests_per_second': len( durations ) / sum( durations ),
+           'peak_kib': peak / 1024,
+           'retained_bytes': retained }
+
+
+def _Report( results ):
+  print( f'{ "scenario":<20} { "median":>8} { "p95":>8} { "p99":>8} '
+         f'{ "req/s":>8} { "peak":>10} { "retained":>10}' )
+  for name, result in results.items():
+    print( f'{ name:<20} '
+           f'{ result[ "median_ms" ]:6.2f}ms '
+           f'{ result[ "p95_ms" ]:6.2f}ms '
+           f'{ result[ "p99_ms" ]:6.2f}ms '
+           f'{ result[ "requests_per_second" ]:8.0f} '
+           f'{ result[ "peak_kib" ]:7.1f}KiB '
+           f'{ result[ "retained_bytes" ]:9.0f}B' )
+
+
+def Regressions( results, baseline, max_regression ):
+  """Returns the descriptions of the measures in |results| that are more than
+  |max_regression| percent higher than in |baseline|."""
+  regressions = []
+  for name, result in results[ 'scenarios' ].items():
+    baseline_result = baseline[ 'scenarios' ].get( name )
+    if baseline_result is None:
+      continue
+    for measure in [ 'median_ms', 'peak_kib' ]:
+      limit = baseline_result[ measure ] * ( 1 + max_regression / 100 )
+      if result[ measure ] > limit:
+        regressions.append( f'{ name } { measure }: '
+                            f'{ baseline_result[ measure ]:.2f} -> '
+                            f'{ result[ measure ]:.2f}' )
+  return regressions
+
+
+def ParseArguments():
+  parser = argparse.ArgumentParser( description = __doc__.split( '\n' )[ 0 ] )
+  parser.add_argument( '--scenario', action = 'append',
+                       choices = list( SCENARIOS ),
+                       help = 'Scenario to run. Can be given several times. '
+                              'All scenarios are run by default.' )
+  parser.add_argument( '--requests', type = int, default = 500,
+                       help = 'Number of requests timed per scenario.' )
+  parser.add_argument( '--warmup', type = int, default = 20,
+                       help = 'Number of requests sent before timing a '
+                              'scenario.' )
+  parser.add_argument( '--allocation-requests', type = int, default = 50,
+                       help = 'Number of requests whose allocations are '
+                              'traced per scenario.' )
+  parser.add_argument( '--lines', type = int, default = 1000,
+                       help = 'Number of lines of the buffer.' )
+  parser.add_argument( '--completions', type = int, default = 100,
+                       help = 'Number of completions returned.' )
+  parser.add_argument( '--detail', type = int, default = 100,
+                       help = 'Length of the detailed info of each '
+                              'completion.' )
+  parser.add_argument( '--diagnostics', type = int, default = 20,
+                       help = 'Number of diagnostics returned on '
+                              'FileReadyToParse.' )
+  parser.add_argument( '--tokens', type = int, default = 1000,
+                       help = 'Number of semantic tokens returned.' )
+  parser.add_argument( '--delay', action = 'append', default = [],
+                       metavar = 'HANDLER=MILLISECONDS',
+                       help = 'Time the server waits before responding to a '
+                              'handler. Can be given several times.' )
+  parser.add_argument( '--extensions', default = ','.join( EXTENSIONS ),
+                       help = 'Comma-separated list of the protocol '
+                              'extensions supported by the server. All by '
+                              'default.' )
+  parser.add_argument( '--json', metavar = 'FILE',
+                       help = 'Write the results to FILE.' )
+  parser.add_argument( '--baseline', metavar = 'FILE',
+                       help = 'Compare the results to the ones in FILE, '
+                              'written with --json.' )
+  parser.add_argument( '--max-regression', type = float, default = 20,
+                       metavar = 'PERCENT',
+                       help = 'Regression tolerated when comparing to the '
+                              'baseline.' )
+  return parser.parse_args()
+
+
+def _Configuration( args ):
+  """Returns what must not change for results to be comparable."""
+  configuration = {
+    name: value for name, value in vars( args ).items()
+    if name not in [ 'scenario', 'json', 'baseline', 'max_regression' ] }
+  configuration[ 'python' ] = platform.python_version()
+  return configuration
+
+
+def Main():
+  args = ParseArguments()
+  buffer = _Buffer( args.lines )
+  results = { 'configuration': _Configuration( args ), 'scenarios': {} }
+
+  vim.Show( [ buffer ], buffer, _CURSOR )
+  server = _StartServer( args )
+  try:
+    for name in args.scenario or SCENARIOS:
+      results[ 'scenarios' ][ name ] = _RunScenario( name, buffer, args )
+  finally:
+    server.terminate()
+    server.wait()
+    BaseRequest.ConnectionPool().Reset()
+
+  _Report( results[ 'scenarios' ] )
+
+  if args.json:
+    with open( args.json, 'w' ) as results_file:
+      json.dump( results, results_file, indent = 2 )
+
+  if args.baseline:
+    with open( args.baseline ) as baseline_file:
+      baseline = json.load( baseline_file )
+    if baseline[ 'configuration' ] != results[ 'configuration' ]:
+      sys.exit( 'The baseline was obtained with different arguments.' )
+    regressions = Regressions( results, baseline, args.max_regression )
+    if regressions:
+      sys.exit( 'Regressions:\n' + '\n'.join( regressions ) )
+
+
+if __name__ == '__main__':
+  Main()
@@ -0,0 +1,409 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+"""A stand-in for ycmd that speaks the same HMAC-signed JSON protocol and
+answers the completion, event notification and semantic token requests with
+generated responses of a given size after a given delay. The other requests
+sent while editing get minimal answers. It is started in its own process by
+the benchmarks, with the same arguments as ycmd:
+
+  python -m ycm.benchmarks.fake_ycmd --port=PORT --options_file=FILE
+
+The other arguments of ycmd are accepted and ignored.
+
+It supports the protocol extensions of the client (see ycm.client.request_batch,
+ycm.client.file_data_sync, ycm.client.messages_request and the Cancel method
+of ycm.client.base_request.BaseRequest) and advertises them, unless they are
+disabled with --extensions. The poll for messages is held until it's cancelled
+or MESSAGES_POLL_SECONDS passed, without any message. The number of requests
+received by handler, and of requests cancelled, is returned by the stats
+handler.
+
+The responses only depend on the arguments and on the request so that runs can
+be compared."""
+
+import argparse
+import base64
+import json
+import os
+import threading
+from collections import Counter
+from hmac import compare_digest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from ycmd.hmac_utils import CreateHmac, CreateRequestHmac
+
+_HMAC_HEADER = 'x-ycm-hmac'
+_EXTENSIONS_HEADER = 'x-ycm-extensions'
+_REQUEST_ID_HEADER = 'x-ycm-request-id'
+HTTP_OK = 200
+HTTP_UNAUTHORIZED = 401
+HTTP_NOT_FOUND = 404
+HTTP_CONFLICT = 409
+HTTP_SERVER_ERROR = 500
+
+BATCH_EXTENSION = 'batch'
+CANCEL_REQUEST_EXTENSION = 'cancel-request'
+FILE_DATA_VERSIONS_EXTENSION = 'file-data-versions'
+MULTIPLEXED_MESSAGES_EXTENSION = 'multiplexed-messages'
+EXTENSIONS = [ BATCH_EXTENSION,
+               CANCEL_REQUEST_EXTENSION,
+               FILE_DATA_VERSIONS_EXTENSION,
+               MULTIPLEXED_MESSAGES_EXTENSION ]
+MESSAGES_POLL_SECONDS = 10
+
+
+class FakeResponses:
+  """Generates the response to each handler. |sizes| is a dictionary with the
+  number of completions, diagnostics and semantic tokens to return and the
+  length of the detailed info of each completion. |delays| maps handlers to the
+  time in seconds to wait before responding. |extensions| lists the protocol
+  extensions supported. The bodies of the batched responses are signed with
+  |hmac_secret|."""
+
+  def __init__( self, sizes, delays, extensions, hmac_secret ):
+    self._sizes = sizes
+    self._delays = delays
+    self._extensions = extensions
+    self._hmac_secret = hmac_secret
+    self._lock = threading.Lock()
+    # Map from filepath to the version and the contents last received.
+    self._files = {}
+    # Map from the ID of the requests being handled to the event set when they
+    # are cancelled.
+    self._pending = {}
+    self._received = Counter()
+    self._cancelled = 0
+    self._handlers = {
+      'ready': self._Ready,
+      'healthy': self._Ready,
+      'shutdown': self._Ready,
+      'stats': self._Stats,
+      'completions': self._Completions,
+      'event_notification': self._EventNotification,
+      'semantic_tokens': self._SemanticTokens,
+      'inlay_hints': lambda request, cancelled: { 'inlay_hints': [] },
+      'signature_help_available':
+        lambda request, cancelled: { 'available': 'NO' },
+      'semantic_completion_available': self._Ready,
+      'defined_subcommands': lambda request, cancelled: [],
+      'run_completer_command': self._CompleterCommand,
+      'receive_messages': self._ReceiveMessages,
+    }
+    if BATCH_EXTENSION in extensions:
+      self._handlers[ 'batch' ] = self._Batch
+    if CANCEL_REQUEST_EXTENSION in extensions:
+      self._handlers[ 'cancel_request' ] = self._CancelRequest
+
+
+  def Extensions( self ):
+    return self._extensions
+
+
+  def Respond( self, handler, request, request_id = None ):
+    """Returns the status and the data to send back for |request|, sent to
+    |handler|. |request_id| identifies the request for the cancel-request
+    extension."""
+    respond = self._handlers.get( handler )
+    if respond is None:
+      return HTTP_NOT_FOUND, None
+    with self._lock:
+      self._received[ handler ] += 1
+    if request and 'file_data' in request:
+      request = self._WithContents( request )
+      if request is None:
+        return HTTP_CONFLICT, None
+
+    cancelled = threading.Event()
+    if request_id is not None:
+      with self._lock:
+        self._pending[ request_id ] = cancelled
+    try:
+      delay = self._delays.get( handler )
+      if delay:
+        cancelled.wait( delay )
+      data = respond( request, cancelled )
+    finally:
+      if request_id is not None:
+        with self._lock:
+          self._pending.pop( request_id, None )
+    if cancelled.is_set():
+      # Nobody reads the response anymore.
+      return HTTP_SERVER_ERROR, None
+    return HTTP_OK, data
+
+
+  def _WithContents( self, request ):
+    """Returns a copy of |request| where the file_data entries without contents
+    have the contents last received for their version, or None if one of these
+    versions isn't known."""
+    file_data = {}
+    with self._lock:
+      for filepath, entry in request[ 'file_data' ].items():
+        version = entry.get( 'version' )
+        if 'contents' in entry:
+          if version is not None:
+            self._files[ filepath ] = ( version, entry[ 'contents' ] )
+          file_data[ filepath ] = entry
+          continue
+        known_version, contents = self._files.get( filepath, ( None, None ) )
+        if ( FILE_DATA_VERSIONS_EXTENSION not in self._extensions or
+             version is None or version != known_version ):
+          return None
+        file_data[ filepath ] = dict( entry, contents = contents )
+    return dict( request, file_data = file_data )
+
+
+  def _Ready( self, request, cancelled ):
+    return True
+
+
+  def _Stats( self, request, cancelled ):
+    with self._lock:
+      return { 'received': dict( self._received ),
+               'cancelled': self._cancelled }
+
+
+  def _Batch( self, request, cancelled ):
+    responses = []
+    for item in request[ 'requests' ]:
+      if item[ 'method' ] == 'POST':
+        data = item[ 'data' ]
+        if 'file_data' not in data and 'file_data' in request:
+          data = dict( data, file_data = request[ 'file_data' ] )
+      else:
+        # Like the GET requests sent on their own, the payload is ignored.
+        data = None
+      status, data = self.Respond( item[ 'handler' ],
+                                   data,
+                                   item.get( 'request_id' ) )
+      body = json.dumps( data ).encode( 'utf-8' ) if data is not None else b''
+      responses.append( {
+        'status': status,
+        'headers': { _HMAC_HEADER: _Sign( body, self._hmac_secret ) },
+        'body': body.decode( 'utf-8' ) } )
+    return responses
+
+
+  def _CancelRequest( self, request, cancelled ):
+    with self._lock:
+      pending = self._pending.get( request[ 'request_id' ] )
+      if pending is None:
+        return False
+      self._cancelled += 1
+    pending.set()
+    return True
+
+
+  def _ReceiveMessages( self, request, cancelled ):
+    if ( MULTIPLEXED_MESSAGES_EXTENSION not in self._extensions or
+         'subscriptions' not in request ):
+      # Don't poll for messages.
+      return False
+    cancelled.wait( MESSAGES_POLL_SECONDS )
+    return { 'messages': [], 'unsubscribed': [] }
+
+
+  def _Completions( self, request, cancelled ):
+    detail = 'x' * self._sizes[ 'detail' ]
+    return {
+      'completions': [ {
+        'insertion_text': f'candidate_{ index }',
+        'menu_text': f'candidate_{ index }( int argument )',
+        'extra_menu_info': 'int',
+        'kind': 'FUNCTION',
+        'detailed_info': f'int candidate_{ index }( int argument )\n{ detail }',
+        'extra_data': { 'doc_string': detail }
+      } for index in range( self._sizes[ 'completions' ] ) ],
+      'completion_start_column': request[ 'column_num' ],
+      'errors': []
+    }
+
+
+  def _EventNotification( self, request, cancelled ):
+    if request[ 'event_name' ] != 'FileReadyToParse':
+      return {}
+    filepath = request[ 'filepath' ]
+    return [ {
+      'kind': 'ERROR' if index % 2 else 'WARNING',
+      'text': f'diagnostic { index }',
+      'location': _Location( filepath, index + 1, 1 ),
+      'location_extent': { 'start': _Location( filepath, index + 1, 1 ),
+                           'end': _Location( filepath, index + 1, 5 ) },
+      'ranges': [],
+      'fixit_available': False
+    } for index in range( self._sizes[ 'diagnostics' ] ) ]
+
+
+  def _CompleterCommand( self, request, cancelled ):
+    return { 'message': ' '.join( request[ 'command_arguments' ] ) }
+
+
+  def _SemanticTokens( self, request, cancelled ):
+    filepath = request[ 'filepath' ]
+    return {
+      'semantic_tokens': { 'tokens': [ {
+        'range': { 'start': _Location( filepath, index // 10 + 1,
+                                       index % 10 * 8 + 1 ),
+                   'end': _Location( filepath, index // 10 + 1,
+                                     index % 10 * 8 + 7 ) },
+        'type': 'variable',
+        'modifiers': []
+      } for index in range( self._sizes[ 'tokens' ] ) ] },
+      'errors': []
+    }
+
+
+def _Location( filepath, line_num, column_num ):
+  return { 'filepath': filepath,
+           'line_num': line_num,
+           'column_num': column_num }
+
+
+def _Sign( body, hmac_secret ):
+  return base64.b64encode( CreateHmac( body, hmac_secret ) ).decode( 'ascii' )
+
+
+class _FakeYcmdHandler( BaseHTTPRequestHandler ):
+  protocol_version = 'HTTP/1.1'
+  # Like ycmd, the headers and the body are written separately.
+  disable_nagle_algorithm = True
+
+
+  def do_GET( self ):
+    self._Handle( None )
+
+
+  def do_POST( self ):
+    body = self.rfile.read( int( self.headers[ 'Content-Length' ] ) )
+    self._Handle( body )
+
+
+  def _Handle( self, body ):
+    path = urlparse( self.path ).path
+    if not self._IsAuthentic( path, body or b'' ):
+      self._Send( HTTP_UNAUTHORIZED, b'' )
+      return
+    request_id = self.headers.get( _REQUEST_ID_HEADER )
+    status, data = self.server.responses.Respond(
+      path.lstrip( '/' ),
+      json.loads( body ) if body else None,
+      int( request_id ) if request_id else None )
+    self._Send( status,
+                json.dumps( data ).encode( 'utf-8' ) if data is not None
+                else b'' )
+    if path == '/shutdown':
+      # Can't be done from the thread handling the request.
+      threading.Thread( target = self.server.shutdown ).start()
+
+
+  def _IsAuthentic( self, path, body ):
+    request_hmac = self.headers.get( _HMAC_HEADER )
+    if not request_hmac:
+      return False
+    expected_hmac = CreateRequestHmac( self.command.encode( 'utf-8' ),
+                                       path.encode( 'utf-8' ),
+                                       body,
+                                       self.server.hmac_secret )
+    return compare_digest( base64.b64decode( request_hmac ), expected_hmac )
+
+
+  def _Send( self, code, body ):
+    self.send_response( code )
+    self.send_header( 'Content-Type', 'application/json' )
+    self.send_header( 'Content-Length', str( len( body ) ) )
+    self.send_header( _HMAC_HEADER, _Sign( body, self.server.hmac_secret ) )
+    extensions = self.server.responses.Extensions()
+    if extensions:
+      self.send_header( _EXTENSIONS_HEADER, ','.join( extensions ) )
+    self.end_headers()
+    try:
+      self.wfile.write( body )
+    except ConnectionError:
+      # The client gave up on the request, e.g. because it was cancelled.
+      self.close_connection = True
+
+
+  def log_message( self, *args ):
+    pass
+
+
+def _ParseDelays( delays ):
+  """Parses a list of HANDLER=MILLISECONDS strings into a dictionary of
+  delays in seconds."""
+  parsed_delays = {}
+  for delay in delays:
+    handler, _, milliseconds = delay.partition( '=' )
+    parsed_delays[ handler ] = float( milliseconds ) / 1000
+  return parsed_delays
+
+
+def ParseArguments():
+  parser = argparse.ArgumentParser( description = __doc__.split( '\n' )[ 0 ] )
+  parser.add_argument( '--port', type = int, required = True )
+  parser.add_argument( '--options_file', required = True,
+                       help = 'JSON file with the base64-encoded HMAC secret, '
+                              'deleted once read.' )
+  parser.add_argument( '--completions', type = int, default = 100,
+                       help = 'Number of completions returned.' )
+  parser.add_argument( '--detail', type = int, default = 100,
+                       help = 'Length of the detailed info of each '
+                              'completion.' )
+  parser.add_argument( '--diagnostics', type = int, default = 20,
+                       help = 'Number of diagnostics returned on '
+                              'FileReadyToParse.' )
+  parser.add_argument( '--tokens', type = int, default = 1000,
+                       help = 'Number of semantic tokens returned.' )
+  parser.add_argument( '--extensions', default = ','.join( EXTENSIONS ),
+                       help = 'Comma-separated list of the protocol '
+                              'extensions supported. All by default.' )
+  parser.add_argument( '--delay', action = 'append', default = [],
+                       metavar = 'HANDLER=MILLISECONDS',
+                       help = 'Time to wait before responding to a handler. '
+                              'Can be given several times.' )
+  return parser.parse_known_args()[ 0 ]
+
+
+def Main():
+  args = ParseArguments()
+  with open( args.options_file ) as options_file:
+    options = json.load( options_file )
+  os.remove( args.options_file )
+
+  server = ThreadingHTTPServer( ( '127.0.0.1', args.port ), _FakeYcmdHandler )
+  server.daemon_threads = True
+  server.hmac_secret = base64.b64decode( options[ 'hmac_secret' ] )
+  server.responses = FakeResponses( { 'completions': args.completions,
+                                      'detail': args.detail,
+                                      'diagnostics': args.diagnostics,
+                                      'tokens': args.tokens },
+                                    _ParseDelays( args.delay ),
+                                    [ extension for extension
+                                      in args.extensions.split( ',' )
+                                      if extension ],
+                                    server.hmac_secret )
+  try:
+    server.serve_forever()
+  except KeyboardInterrupt:
+    pass
+  finally:
+    server.server_close()
+
+
+if __name__ == '__main__':
+  Main()
@@ -0,0 +1,151 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Measures the time from the start of YCM to the first completion response,
+with a server of its own and with a server shared with another Vim instance
+(see g:ycm_shared_server), against the fake ycmd of ycm.benchmarks.fake_ycmd
+or against ycmd. Run it from the python directory, with ycmd in the Python
+path, with:
+
+  python -m ycm.benchmarks.first_completion
+
+Vim is simulated by ycm.benchmarks.simulation: the server is polled until it's
+ready, then a completion request is sent and polled for, at the intervals of
+the pollers of the autoload script. In the shared mode, the server is started
+beforehand by another YouCompleteMe instance standing for the first Vim."""
+
+from ycm.benchmarks import simulation
+vim = simulation.Install()
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from unittest.mock import patch
+
+from ycm import shared_server
+from ycm.youcompleteme import YouCompleteMe
+
+_POLLERS = simulation.Pollers()
+_SERVER_READY_POLL_SEC = (
+  _POLLERS[ 'server_ready' ][ 'wait_milliseconds' ] / 1000 )
+_COMPLETION_POLL_SEC = _POLLERS[ 'completion' ][ 'wait_milliseconds' ] / 1000
+_TIMEOUT_SEC = 60
+# The cursor is at the end of the first line of the buffer.
+_CURSOR = ( 1, 9 )
+
+
+def _Buffer():
+  return simulation.Buffer(
+    os.path.join( tempfile.gettempdir(), 'benchmark.cpp' ),
+    contents = [ 'candidate', 'int candidates = 0;' ],
+    filetype = 'cpp' )
+
+
+def _WaitFor( condition, interval ):
+  # Like the pollers of Vim, the condition is first checked after the interval.
+  expiration = time.monotonic() + _TIMEOUT_SEC
+  while True:
+    time.sleep( interval )
+    if condition():
+      return
+    if time.monotonic() > expiration:
+      raise RuntimeError( f'Gave up after { _TIMEOUT_SEC } seconds.' )
+
+
+def _FirstCompletion():
+  """Starts YCM and returns the time taken to get the first completion
+  response, in seconds."""
+  start_time = time.monotonic()
+  ycm = YouCompleteMe()
+  try:
+    _WaitFor( ycm.CheckIfServerIsReady, _SERVER_READY_POLL_SEC )
+    ycm.SendCompletionRequest()
+    _WaitFor( ycm.CompletionRequestReady, _COMPLETION_POLL_SEC )
+    ycm.GetCompletionResponse()
+    return time.monotonic() - start_time
+  finally:
+    simulation.StopServer( ycm )
+
+
+def _Private( runs ):
+  return [ _FirstCompletion() for _ in range( runs ) ]
+
+
+def _Shared( runs ):
+  # The first Vim, which starts the server and stays attached to it.
+  first_vim = YouCompleteMe()
+  try:
+    _WaitFor( first_vim.CheckIfServerIsReady, _SERVER_READY_POLL_SEC )
+    return [ _FirstCompletion() for _ in range( runs ) ]
+  finally:
+    simulation.StopServer( first_vim )
+
+
+def _Summarise( samples ):
+  return { 'runs': len( samples ),
+           'median_ms': statistics.median( samples ) * 1000,
+           'min_ms': min( samples ) * 1000,
+           'max_ms': max( samples ) * 1000 }
+
+
+def ParseArguments():
+  parser = argparse.ArgumentParser( description = __doc__.split( '\n' )[ 0 ] )
+  parser.add_argument( '--server', choices = [ 'fake', 'ycmd' ],
+                       default = 'fake',
+                       help = 'Measure with the fake ycmd or with ycmd. The '
+                              'fake ycmd runs with its default arguments.' )
+  parser.add_argument( '--runs', type = int, default = 10,
+                       help = 'Number of times YCM is started in each mode.' )
+  parser.add_argument( '--json', metavar = 'FILE',
+                       help = 'Write the results to FILE.' )
+  return parser.parse_args()
+
+
+def Main():
+  if not shared_server.Supported():
+    raise SystemExit( 'The server cannot be shared on this system.' )
+  args = ParseArguments()
+  buffer = _Buffer()
+  vim.Show( [ buffer ], buffer, _CURSOR )
+  results = {}
+
+  # The registry of the shared server is isolated from the one of the Vim
+  # instances of the user.
+  with tempfile.TemporaryDirectory() as registry_directory:
+    with patch.dict( os.environ, { 'XDG_RUNTIME_DIR': registry_directory } ):
+      with simulation.Server( args.server ):
+        for mode, measure in [ ( 'private', _Private ),
+                               ( 'shared', _Shared ) ]:
+          vim.vars[ 'ycm_shared_server' ] = int( mode == 'shared' )
+          results[ mode ] = _Summarise( measure( args.runs ) )
+
+  for mode, summary in results.items():
+    print( f'{ mode:<8} first completion over { summary[ "runs" ] } runs: '
+           f'median { summary[ "median_ms" ]:.2f} ms, '
+           f'min { summary[ "min_ms" ]:.2f} ms, '
+           f'max { summary[ "max_ms" ]:.2f} ms' )
+
+  if args.json:
+    with open( args.json, 'w' ) as results_file:
+      json.dump( results, results_file, indent = 2 )
+
+
+if __name__ == '__main__':
+  Main()
@@ -0,0 +1,353 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Replays a session recorded with :YcmRecordSession against the fake ycmd of
+ycm.benchmarks.fake_ycmd or against ycmd, and reports the time spent handling
+each kind of event, which is time Vim is blocked, and the latency of the
+requests. Run it from the python directory, with ycmd in the Python path,
+with:
+
+  python -m ycm.benchmarks.replay_session SESSION_FILE
+
+Vim is simulated: each event calls the same YouCompleteMe methods as the
+autocommand that recorded it, and the responses are polled for like Vim does
+with timers. Completion in comments and strings and the popups aren't
+simulated."""
+
+from ycm.benchmarks import simulation
+vim = simulation.Install()
+
+import argparse
+import json
+import statistics
+import time
+
+from ycm import base, tracing
+from ycm.client.base_request import BaseRequest
+from ycm.session_recording import ApplySnapshot, ReadSession
+from ycm.youcompleteme import YouCompleteMe
+
+# The delays between the polls are the ones of the autoload script.
+_POLLERS = simulation.Pollers()
+# Time given to the pending responses after the last event.
+_DRAIN_TIMEOUT_SEC = 10
+# Pollers that run for as long as Vim does, which aren't waited for after the
+# last event.
+_BACKGROUND_POLLERS = { 'receive_messages' }
+
+
+class _Replay:
+  def __init__( self, ycm, options, speed, pollers = _POLLERS ):
+    self._ycm = ycm
+    self._options = options
+    self._speed = speed
+    self._poller_delays = pollers
+    self._buffers = {}
+    self._modified = set()
+    self._current = None
+    self._cursor = ( 1, 0 )
+    self._visible = ( 1, 1 )
+    # Map from poller name to its due time, interval and function, which
+    # returns True once done.
+    self._pollers = {}
+    # Map from event, or poller, to the seconds spent handling each one.
+    self.durations = {}
+    self._handlers = {
+      'FileTypeSet': self._OnFileTypeSet,
+      'BufferEnter': self._OnBufferEnter,
+      'CursorMovedNormalMode': lambda event: self._ycm.OnCursorMoved(),
+      'WinScrolled': self._OnWinScrolled,
+      'TextChangedNormalMode': lambda event: self._OnFileReadyToParse(),
+      'TextChangedInsertMode': self._OnTextChangedInsertMode,
+      'InsertEnter': self._OnInsertEnter,
+      'InsertLeave': self._OnInsertLeave,
+      'Command': self._OnCommand,
+    }
+
+
+  def Run( self, events ):
+    start_time = time.monotonic()
+    for event in events:
+      # Without waiting, only the responses already due are polled for.
+      self._RunPollers( start_time + event[ 'time' ] / self._speed
+                        if self._speed else time.monotonic() )
+      self._Apply( event )
+      handler = self._handlers.get( event[ 'event' ] )
+      if handler is None:
+        continue
+      handler_start_time = time.perf_counter()
+      handler( event )
+      self.durations.setdefault( event[ 'event' ], [] ).append(
+        time.perf_counter() - handler_start_time )
+    self._RunPollers( time.monotonic() + _DRAIN_TIMEOUT_SEC,
+                      stop_when_idle = True )
+
+
+  def _Apply( self, event ):
+    """Updates the simulated Vim to the state it was in when |event|
+    happened."""
+    bufnr = event[ 'buffer' ]
+    snapshot = event.get( 'snapshot' )
+    if snapshot is not None:
+      previous = self._buffers.get( bufnr )
+      if previous is not None:
+        self._modified.add( bufnr )
+      name = snapshot.get( 'name', previous and previous.name )
+      filetype = snapshot.get( 'filetype', previous and previous.filetype )
+      # A new buffer object has a new changedtick.
+      self._buffers[ bufnr ] = simulation.Buffer(
+        name,
+        number = bufnr,
+        contents = ApplySnapshot( previous.contents if previous else [],
+                                  snapshot ),
+        filetype = filetype,
+        modified = bufnr in self._modified )
+    self._current = self._buffers[ bufnr ]
+    self._cursor = tuple( event[ 'cursor' ] )
+    vim.Show( list( self._buffers.values() ),
+              self._current,
+              self._cursor,
+              tuple( event[ 'visible' ] ) )
+
+
+  def _StartPoller( self, name, poll ):
+    interval = max( self._poller_delays[ name ][ 'wait_milliseconds' ],
+                    self._ycm.FirstPollDelay( name ) ) / 1000
+    self._pollers[ name ] = [ time.monotonic() + interval, interval, poll ]
+
+
+  def _StartMessagePoll( self ):
+    # Unlike the other pollers, it polls at a fixed interval from the start.
+    if 'receive_messages' not in self._pollers:
+      interval = (
+        self._poller_delays[ 'receive_messages' ][ 'wait_milliseconds' ] /
+        1000 )
+      self._pollers[ 'receive_messages' ] = [
+        time.monotonic() + interval, interval,
+        lambda: not self._ycm.OnPeriodicTick() ]
+
+
+  def _RunPollers( self, until, stop_when_idle = False ):
+    while True:
+      now = time.monotonic()
+      if stop_when_idle and not self._pollers.keys() - _BACKGROUND_POLLERS:
+        return
+      if not self._pollers:
+        time.sleep( max( 0, until - now ) )
+        return
+      name, ( due_time, interval, poll ) = min(
+        self._pollers.items(), key = lambda item: item[ 1 ][ 0 ] )
+      if due_time > until:
+        time.sleep( max( 0, until - now ) )
+        return
+      time.sleep( max( 0, due_time - now ) )
+      poll_start_time = time.perf_counter()
+      done = poll()
+      self.durations.setdefault( f'{ name } poll', [] ).append(
+        time.perf_counter() - poll_start_time )
+      # The poller may have been replaced while polling.
+      if self._pollers.get( name, [ None ] * 3 )[ 2 ] is not poll:
+        continue
+      if done:
+        del self._pollers[ name ]
+        continue
+      max_wait = self._poller_delays[ name ].get( 'max_wait_milliseconds' )
+      if max_wait is not None:
+        interval = min( interval * 2, max_wait / 1000 )
+      self._pollers[ name ] = [ time.monotonic() + interval, interval, poll ]
+
+
+  def _OnFileTypeSet( self, event ):
+    self._StartMessagePoll()
+    self._ycm.StartRequestBatch()
+    try:
+      self._ycm.OnFileTypeSet()
+      self._OnFileReadyToParse( force = True )
+    finally:
+      self._ycm.FlushRequestBatch()
+
+
+  def _OnBufferEnter( self, event ):
+    self._StartMessagePoll()
+    self._ycm.UpdateMatches()
+    self._ycm.StartRequestBatch()
+    try:
+      self._ycm.OnBufferVisit()
+      self._OnFileReadyToParse( force = True )
+    finally:
+      self._ycm.FlushRequestBatch()
+
+
+  def _OnFileReadyToParse( self, force = False ):
+    if not force and not self._ycm.NeedsReparse():
+      return
+    self._ycm.OnFileReadyToParse()
+    self._StartPoller( 'file_parse_response', self._PollFileParseResponse )
+    self._UpdateScrollables( force = True )
+
+
+  def _PollFileParseResponse( self ):
+    if not self._ycm.FileParseRequestReady():
+      return False
+    self._ycm.HandleFileParseRequest()
+    if self._ycm.ShouldResendFileParseRequest():
+      self._OnFileReadyToParse( force = True )
+    return True
+
+
+  def _OnWinScrolled( self, event ):
+    self._UpdateScrollables( force = False )
+
+
+  def _UpdateScrollables( self, force ):
+    buffer = self._ycm.CurrentBuffer()
+    for name in [ 'semantic_highlighting', 'inlay_hints' ]:
+      if int( self._options.get( name, 0 ) ):
+        self._pollers.pop( name, None )
+        scrollable = getattr( buffer, name )
+        if scrollable.Request( force = force ):
+          self._StartPoller( name, self._ScrollablePoller( scrollable ) )
+
+
+  def _ScrollablePoller( self, scrollable ):
+    def Poll():
+      return scrollable.Ready() and scrollable.Update()
+    return Poll
+
+
+  def _OnTextChangedInsertMode( self, event ):
+    if base.CurrentIdentifierFinished():
+      self._ycm.OnCurrentIdentifierFinished()
+    if self._current[ self._cursor[ 0 ] - 1 ].strip():
+      self._RequestCompletion()
+      if self._ycm.SendSignatureHelpRequest():
+        self._StartPoller( 'signature_help', self._PollSignatureHelp )
+    self._ycm.OnCursorMoved()
+
+
+  def _RequestCompletion( self ):
+    self._ycm.SendCompletionRequest( False )
+    cursor = self._cursor
+
+    def Poll():
+      if not self._ycm.CompletionRequestReady():
+        return False
+      self._ycm.GetCompletionResponse()
+      if self._cursor == cursor:
+        # There is no menu to display.
+        self._ycm.OnCompletionDisplayed( 0 )
+      return True
+
+    self._StartPoller( 'completion', Poll )
+
+
+  def _PollSignatureHelp( self ):
+    if not self._ycm.SignatureHelpRequestReady():
+      return False
+    self._ycm.GetSignatureHelpResponse()
+    return True
+
+
+  def _OnInsertEnter( self, event ):
+    vim.mode = 'i'
+    self._ycm.OnInsertEnter()
+
+
+  def _OnInsertLeave( self, event ):
+    vim.mode = 'n'
+    self._pollers.pop( 'completion', None )
+    self._OnFileReadyToParse()
+    self._ycm.OnInsertLeave()
+
+
+  def _OnCommand( self, event ):
+    arguments, modifiers, count, line1, line2 = event[ 'args' ]
+    self._ycm.SendCommandRequest( arguments,
+                                  modifiers,
+                                  int( count ) != -1,
+                                  int( line1 ),
+                                  int( line2 ) )
+
+
+def _Report( durations ):
+  print( f'{ "event":<28} { "count":>6} { "median":>8} { "p95":>8} '
+         f'{ "max":>8}' )
+  for event, samples in sorted( durations.items() ):
+    print( f'{ event:<28} { len( samples ):6} '
+           f'{ statistics.median( samples ) * 1000:6.2f}ms '
+           f'{ _Percentile( samples, 95 ) * 1000:6.2f}ms '
+           f'{ max( samples ) * 1000:6.2f}ms' )
+
+
+def _Percentile( samples, percentile ):
+  samples = sorted( samples )
+  return samples[ min( len( samples ) - 1,
+                       len( samples ) * percentile // 100 ) ]
+
+
+def ParseArguments():
+  parser = argparse.ArgumentParser( description = __doc__.split( '\n' )[ 0 ] )
+  parser.add_argument( 'session', help = 'File written by :YcmRecordSession.' )
+  parser.add_argument( '--server', choices = [ 'fake', 'ycmd' ],
+                       default = 'fake',
+                       help = 'Replay against the fake ycmd or against ycmd. '
+                              'The fake ycmd runs with its default '
+                              'arguments.' )
+  parser.add_argument( '--speed', type = float, default = 1,
+                       help = 'Replay speed relative to the recording. 0 '
+                              'replays the events without waiting.' )
+  parser.add_argument( '--json', metavar = 'FILE',
+                       help = 'Write the event durations and the request '
+                              'latencies to FILE.' )
+  parser.add_argument( '--trace', metavar = 'FILE',
+                       help = 'Write a trace of the replay to FILE in the '
+                              'Chrome trace event format.' )
+  return parser.parse_args()
+
+
+def Main():
+  args = ParseArguments()
+  header, events = ReadSession( args.session )
+  vim.vars[ 'ycm_trace_events' ] = 100000 if args.trace else 0
+
+  with simulation.Server( args.server ):
+    ycm = YouCompleteMe()
+    try:
+      simulation.WaitUntilServerIsReady( ycm )
+      replay = _Replay( ycm, header[ 'options' ], args.speed )
+      start_time = time.monotonic()
+      replay.Run( events )
+      print( f'Replayed in { time.monotonic() - start_time:.1f}s' )
+      _Report( replay.durations )
+      print( ycm.LatencyStats() )
+      if args.trace:
+        print( f'{ tracing.Dump( args.trace ) } events written to '
+               f'{ args.trace }' )
+    finally:
+      simulation.StopServer( ycm )
+
+  if args.json:
+    with open( args.json, 'w' ) as results_file:
+      json.dump( {
+        'events': { event: [ sample * 1000 for sample in samples ]
+                    for event, samples in replay.durations.items() },
+        'requests': BaseRequest.request_timings.Percentiles()
+      }, results_file, indent = 2 )
+
+
+if __name__ == '__main__':
+  Main()
@@ -0,0 +1,494 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Simulates the Vim the benchmarks run YouCompleteMe in: a Vim with the
+defaults of plugin/youcompleteme.vim, a single window and no popups, whose
+buffers, signs and text properties are kept in memory. Unlike the mock of the
+tests, it doesn't record the calls so it doesn't skew the measures.
+
+Install must be called before importing the other modules of YCM:
+
+  from ycm.benchmarks import simulation
+  vim = simulation.Install()
+"""
+
+import ast
+import contextlib
+import itertools
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+DIR_OF_YCM = os.path.join( os.path.dirname( os.path.abspath( __file__ ) ),
+                           '..', '..', '..' )
+PATH_TO_PLUGIN = os.path.join( DIR_OF_YCM, 'plugin', 'youcompleteme.vim' )
+PATH_TO_AUTOLOAD = os.path.join( DIR_OF_YCM, 'autoload', 'youcompleteme.vim' )
+
+_LINE_CONTINUATION_REGEX = re.compile( r'\n\s*\\' )
+_OPTION_REGEX = re.compile( r"^let g:(?P<name>ycm_\w+) =\s*(?P<value>.*)$",
+                            re.MULTILINE )
+_GET_REGEX = re.compile( r"^get\( g:, '\w+',\s*(?P<default>.*?)\s*\)$" )
+_POLLERS_REGEX = re.compile( r'^let s:pollers = (?P<pollers>\{.*?\})$',
+                             re.MULTILINE )
+
+# A recent Vim without popups.
+_VIM_VERSION = 900
+_WINDOW_ID = 1000
+_TAB_PAGE_NUMBER = 1
+_OPTIONS = {
+  'ambiwidth': 'single',
+  'columns': 80,
+  'completeopt': '',
+  'expandtab': 1,
+  'hidden': 0,
+  'previewheight': 12,
+  'ruler': 0,
+  'shiftwidth': 2,
+  'showcmd': 1,
+}
+
+_CHANGEDTICKS = itertools.count( 1 )
+_PROPERTY_IDS = itertools.count( 1 )
+_SIGN_IDS = itertools.count( 1 )
+
+
+def _ReadVimScript( filepath ):
+  with open( filepath ) as vim_script:
+    return _LINE_CONTINUATION_REGEX.sub( ' ', vim_script.read() )
+
+
+def PluginDefaults():
+  """Returns the default value of each g:ycm_ option set by
+  plugin/youcompleteme.vim, by name without the g: prefix."""
+  defaults = {}
+  for match in _OPTION_REGEX.finditer( _ReadVimScript( PATH_TO_PLUGIN ) ):
+    value = match.group( 'value' ).strip()
+    # The default may be the value of an older option.
+    while ( default := _GET_REGEX.match( value ) ) is not None:
+      value = default.group( 'default' )
+    defaults[ match.group( 'name' ) ] = ast.literal_eval( value )
+  return defaults
+
+
+def Pollers():
+  """Returns the pollers of autoload/youcompleteme.vim, whose
+  wait_milliseconds and max_wait_milliseconds entries are the delays between
+  the polls, by name."""
+  match = _POLLERS_REGEX.search( _ReadVimScript( PATH_TO_AUTOLOAD ) )
+  return ast.literal_eval( match.group( 'pollers' ) )
+
+
+class VimError( Exception ):
+  pass
+
+
+class Buffer:
+  """A buffer as seen through the vim module. Each Buffer object has a new
+  changedtick, which changes again when a line is modified."""
+
+  def __init__( self,
+                name,
+                number = 1,
+                contents = [ '' ],
+                filetype = '',
+                modified = False ):
+    self.name = os.path.realpath( name ) if name else ''
+    self.number = number
+    self.contents = contents
+    self.filetype = filetype
+    self.changedtick = next( _CHANGEDTICKS )
+    self.options = { 'mod': modified, 'bh': '' }
+    self.vars = {}
+
+
+  def __getitem__( self, index ):
+    return self.contents[ index ]
+
+
+  def __setitem__( self, index, value ):
+    self.changedtick = next( _CHANGEDTICKS )
+    self.contents[ index ] = value
+
+
+  def __len__( self ):
+    return len( self.contents )
+
+
+class _Buffers:
+  def __init__( self, buffers ):
+    self._buffers = { buffer.number: buffer for buffer in buffers }
+
+
+  def __getitem__( self, number ):
+    return self._buffers[ number ]
+
+
+  def __iter__( self ):
+    return iter( self._buffers.values() )
+
+
+  def __len__( self ):
+    return len( self._buffers )
+
+
+  def get( self, number ):
+    return self._buffers.get( number )
+
+
+class _TabPage:
+  number = _TAB_PAGE_NUMBER
+
+
+class _Window:
+  def __init__( self, buffer, cursor, visible ):
+    self.number = 1
+    self.tabpage = _TabPage()
+    self.buffer = buffer
+    self.cursor = cursor
+    self.visible = visible
+    self.options = {}
+    self.vars = {}
+
+
+class _Current:
+  def __init__( self, window ):
+    self.tabpage = window.tabpage
+    self.window = window
+    self.buffer = window.buffer
+
+
+  @property
+  def line( self ):
+    return self.buffer[ self.window.cursor[ 0 ] - 1 ]
+
+
+class Vim:
+  """The vim module. Set the state of the editor with Show. The options of
+  YCM are in |vars|, by name without the g: prefix."""
+
+  error = VimError
+
+  def __init__( self, options = {} ):
+    self.vars = PluginDefaults()
+    # Set by autoload/youcompleteme.vim, only used in Neovim.
+    self.vars[ 'ycm_neovim_ns_id' ] = -1
+    self.vars.update( options )
+    self.options = dict( _OPTIONS )
+    self.mode = 'n'
+    self.buffers = _Buffers( [] )
+    self.windows = []
+    self.tabpages = [ _TabPage() ]
+    self.current = None
+    self._signs = {}
+    self._properties = {}
+    self._property_types = []
+    self._evaluations = [
+      ( re.compile( r'^-?\d+$' ), lambda match: int( match.group( 0 ) ) ),
+      ( re.compile( r'^g:(\w+)$' ), self._Variable ),
+      ( re.compile( r'^&(\w+)$' ), self._Option ),
+      ( re.compile( r'^keys\( g: \)$' ), lambda match: list( self.vars ) ),
+      ( re.compile( r'^string\( map\( sort\( filter\( keys\( g: \), '
+                    r"'v:val =~# \"\^(\w+)\"' \) \)" ),
+        self._VariablesFingerprint ),
+      ( re.compile( r"^exists\( '(.+)' \)$" ), self._Exists ),
+      ( re.compile( r'^has\( ["\']patch\d+["\'] \)$' ), lambda match: 1 ),
+      ( re.compile( r'^has\( ["\'].+["\'] \)$' ), lambda match: 0 ),
+      ( re.compile( r'^v:version$' ), lambda match: _VIM_VERSION ),
+      ( re.compile( r'^mode\(\)$' ), lambda match: self.mode ),
+      ( re.compile( r'^tempname\(\)$' ),
+        lambda match: os.path.join( tempfile.gettempdir(), 'ycm_benchmark' ) ),
+      ( re.compile( r'^shiftwidth\(\)$' ),
+        lambda match: self.options[ 'shiftwidth' ] ),
+      ( re.compile( r'^winnr\("#"\)$' ), lambda match: 0 ),
+      ( re.compile( r"^fnameescape\('(.*)'\)$" ), lambda match: match[ 1 ] ),
+      ( re.compile( r"^bufnr\( '(.*)', \d \)$" ), self._BufferNumber ),
+      ( re.compile( r'^bufwinnr\( (\d+) \)$' ), self._BufferWindowNumber ),
+      ( re.compile( r'^bufloaded\( (\d+) \)$' ), self._BufferLoaded ),
+      ( re.compile( r'^getbufvar\((\d+), "(.+)"\)$' ), self._BufferVariable ),
+      ( re.compile( r'^win_findbuf\( (\d+) \)$' ), self._FindBufferWindows ),
+      ( re.compile( r'^win_id2tabwin\( (\d+) \)\[ 0 \]$' ),
+        lambda match: _TAB_PAGE_NUMBER ),
+      ( re.compile( r'^win_getid\( 1, 1 \)$' ), lambda match: _WINDOW_ID ),
+      ( re.compile( r'^getwininfo\( (\d+) \)\[ 0 \]$' ), self._WindowInfo ),
+      ( re.compile( r'^sign_getplaced\( (\d+), ' ), self._PlacedSigns ),
+      ( re.compile( r'^sign_placelist\( (.*) \)$' ), self._PlaceSigns ),
+      ( re.compile( r'^sign_unplacelist\( (.*) \)$' ), self._UnplaceSigns ),
+      ( re.compile( r"^hlexists\( '\w+' \)$" ), lambda match: 1 ),
+      ( re.compile( r'^prop_type_list\(\)$' ),
+        lambda match: list( self._property_types ) ),
+      ( re.compile( r"^prop_type_add\( '(.+?)'," ), self._AddPropertyType ),
+      ( re.compile( r'^prop_add\( *(\d+), *(\d+), *(.*) \)$', re.DOTALL ),
+        self._AddProperty ),
+      ( re.compile( r'^prop_remove\( *(\{.*?\})'
+                    r'(?:, *(\d+))?(?:, *(\d+))? \)$' ),
+        self._RemoveProperties ),
+      ( re.compile( r'^prop_list\( (\d+), (\{.*\}) \)$' ),
+        self._ListProperties ),
+    ]
+
+
+  def Show( self, buffers, current_buffer, cursor, visible = None ):
+    """Makes |buffers| the loaded buffers and displays |current_buffer| in the
+    only window, with the cursor at the 1-based line and 0-based column
+    |cursor| and the lines |visible| visible, all of them by default."""
+    self.buffers = _Buffers( buffers )
+    window = _Window( current_buffer,
+                      cursor,
+                      visible or ( 1, len( current_buffer ) ) )
+    self.windows = [ window ]
+    self.current = _Current( window )
+
+
+  def eval( self, expression ):
+    for regex, evaluate in self._evaluations:
+      match = regex.search( expression )
+      if match:
+        return _ToPython( evaluate( match ) )
+    # Like Vim, when calling a function of a plugin that isn't installed.
+    raise VimError( f'Unknown expression: { expression }' )
+
+
+  def command( self, command ):
+    # Only the variables are kept, the other commands change what is drawn.
+    if command.startswith( 'let g:' ):
+      name, value = command[ len( 'let g:' ): ].split( ' = ', 1 )
+      self.vars[ name ] = json.loads( value )
+    elif command.startswith( 'unlet g:' ):
+      self.vars.pop( command[ len( 'unlet g:' ): ], None )
+
+
+  def _Variable( self, match ):
+    try:
+      return self.vars[ match[ 1 ] ]
+    except KeyError:
+      raise VimError( f'Undefined variable: g:{ match[ 1 ] }' )
+
+
+  def _Option( self, match ):
+    if match[ 1 ] == 'filetype':
+      return self.current.buffer.filetype
+    return self.options.get( match[ 1 ], '' )
+
+
+  def _VariablesFingerprint( self, match ):
+    return str( sorted( [ name, value ] for name, value in self.vars.items()
+                        if name.startswith( match[ 1 ] ) ) )
+
+
+  def _Exists( self, match ):
+    name = match[ 1 ]
+    if name.startswith( 'g:' ):
+      return int( name[ 2: ] in self.vars )
+    # No functions of other plugins nor popups.
+    return 0
+
+
+  def _BufferNumber( self, match ):
+    for buffer in self.buffers:
+      if buffer.name == match[ 1 ]:
+        return buffer.number
+    return -1
+
+
+  def _BufferLoaded( self, match ):
+    return int( self.buffers.get( int( match[ 1 ] ) ) is not None )
+
+
+  def _BufferWindowNumber( self, match ):
+    return 1 if self._FindBufferWindows( match ) else -1
+
+
+  def _BufferVariable( self, match ):
+    buffer = self.buffers.get( int( match[ 1 ] ) )
+    if buffer is None:
+      return ''
+    if match[ 2 ] == 'changedtick':
+      return buffer.changedtick
+    if match[ 2 ] == '&ft':
+      return buffer.filetype
+    if match[ 2 ] == '&mod':
+      return int( buffer.options[ 'mod' ] )
+    if match[ 2 ] == '&bh':
+      return buffer.options[ 'bh' ]
+    return ''
+
+
+  def _FindBufferWindows( self, match ):
+    return [ _WINDOW_ID for window in self.windows
+             if window.buffer.number == int( match[ 1 ] ) ]
+
+
+  def _WindowInfo( self, match ):
+    window = self.windows[ 0 ]
+    return { 'topline': window.visible[ 0 ], 'botline': window.visible[ 1 ] }
+
+
+  def _PlacedSigns( self, match ):
+    # Like Vim, the signs don't have their buffer.
+    return [ { 'signs': [
+      { 'id': sign_id,
+        'lnum': sign[ 'lnum' ],
+        'name': sign[ 'name' ],
+        'group': sign[ 'group' ],
+        'priority': 10 }
+      for sign_id, sign in self._signs.items()
+      if sign[ 'buffer' ] == int( match[ 1 ] ) ] } ]
+
+
+  def _PlaceSigns( self, match ):
+    sign_ids = []
+    for sign in ast.literal_eval( match[ 1 ] ):
+      sign_id = next( _SIGN_IDS )
+      self._signs[ sign_id ] = sign
+      sign_ids.append( sign_id )
+    return sign_ids
+
+
+  def _UnplaceSigns( self, match ):
+    # The signs are found by ID, in any buffer.
+    for sign in ast.literal_eval( match[ 1 ] ):
+      self._signs.pop( int( sign[ 'id' ] ), None )
+    return [ 0 ] * len( ast.literal_eval( match[ 1 ] ) )
+
+
+  def _AddPropertyType( self, match ):
+    self._property_types.append( match[ 1 ] )
+    return 0
+
+
+  def _AddProperty( self, match ):
+    properties = json.loads( match[ 3 ] )
+    line = int( match[ 1 ] )
+    column = int( match[ 2 ] )
+    end_column = properties.get( 'end_col', column )
+    if properties.get( 'end_lnum', line ) != line:
+      end_column = column
+    property_id = properties.get( 'id', next( _PROPERTY_IDS ) )
+    self._properties.setdefault( properties[ 'bufnr' ], [] ).append( {
+      'id': property_id,
+      'type': properties[ 'type' ],
+      'lnum': line,
+      'col': column,
+      'length': end_column - column } )
+    return property_id
+
+
+  def _RemoveProperties( self, match ):
+    # Given as JSON or as a Python dictionary.
+    criteria = ast.literal_eval( match[ 1 ] )
+    first_line = int( match[ 2 ] ) if match[ 2 ] else 1
+    last_line = int( match[ 3 ] ) if match[ 3 ] else first_line
+    if not match[ 2 ]:
+      last_line = sys.maxsize
+    properties = self._properties.get( criteria[ 'bufnr' ], [] )
+    kept = [ prop for prop in properties
+             if not ( first_line <= prop[ 'lnum' ] <= last_line and
+                      _PropertyMatches( prop, criteria ) ) ]
+    self._properties[ criteria[ 'bufnr' ] ] = kept
+    return len( properties ) - len( kept )
+
+
+  def _ListProperties( self, match ):
+    options = json.loads( match[ 2 ] )
+    first_line = int( match[ 1 ] )
+    last_line = options.get( 'end_lnum', first_line )
+    if last_line == -1:
+      last_line = sys.maxsize
+    return [ prop for prop in self._properties.get( options[ 'bufnr' ], [] )
+             if first_line <= prop[ 'lnum' ] <= last_line and
+                prop[ 'type' ] in options.get( 'types', [ prop[ 'type' ] ] ) ]
+
+
+def _ToPython( value ):
+  """Converts |value| like Vim does when returning it from vim.eval: numbers
+  become strings."""
+  if isinstance( value, dict ):
+    return { key: _ToPython( item ) for key, item in value.items() }
+  if isinstance( value, list ):
+    return [ _ToPython( item ) for item in value ]
+  if isinstance( value, ( bool, int ) ):
+    return str( int( value ) )
+  return value
+
+
+def _PropertyMatches( prop, criteria ):
+  """Whether the text property |prop| is removed by prop_remove with
+  |criteria|."""
+  types = criteria.get( 'types', [ criteria.get( 'type' ) ] )
+  matches_type = prop[ 'type' ] in types
+  matches_id = prop[ 'id' ] == criteria.get( 'id' )
+  if 'id' not in criteria:
+    return matches_type
+  if types == [ None ]:
+    return matches_id
+  if criteria.get( 'both' ):
+    return matches_id and matches_type
+  return matches_id or matches_type
+
+
+def Install( options = {} ):
+  """Makes the simulated Vim the vim module and returns it. |options|
+  override the defaults of plugin/youcompleteme.vim, by name without the g:
+  prefix."""
+  vim = Vim( options )
+  sys.modules[ 'vim' ] = vim
+  return vim
+
+
+@contextlib.contextmanager
+def Server( server ):
+  """Makes YouCompleteMe start the fake ycmd of ycm.benchmarks.fake_ycmd if
+  |server| is 'fake', or ycmd if it's 'ycmd'."""
+  if server == 'ycmd':
+    yield
+    return
+  import ycmd
+  from ycm.benchmarks import fake_ycmd
+  # The fake server needs ycmd in its Python path.
+  python_path = os.pathsep.join( filter( None, [
+    os.path.dirname( os.path.dirname( ycmd.__file__ ) ),
+    os.environ.get( 'PYTHONPATH' ) ] ) )
+  with patch.dict( os.environ, { 'PYTHONPATH': python_path } ):
+    with patch( 'ycm.paths.PathToServerScript',
+                return_value = fake_ycmd.__file__ ):
+      yield
+
+
+def StopServer( ycm ):
+  """Shuts down the server of the YouCompleteMe instance |ycm| like Vim does
+  when leaving, and waits for it to exit."""
+  from ycmd.utils import CloseStandardStreams, WaitUntilProcessIsTerminated
+  ycm.OnVimLeave()
+  if ycm._server_popen is not None:
+    WaitUntilProcessIsTerminated( ycm._server_popen )
+    CloseStandardStreams( ycm._server_popen )
+
+
+def WaitUntilServerIsReady( ycm, timeout = 60 ):
+  """Polls the server of the YouCompleteMe instance |ycm| at the interval of
+  Vim until it's ready."""
+  interval = Pollers()[ 'server_ready' ][ 'wait_milliseconds' ] / 1000
+  expiration = time.monotonic() + timeout
+  while not ycm.CheckIfServerIsReady():
+    if time.monotonic() > expiration:
+      raise RuntimeError( f'The server wasn\'t ready after { timeout } '
+                          'seconds.' )
+    time.sleep( interval )
@@ -0,0 +1,135 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Measures the time taken to import the modules loaded when YCM starts, each
+time in a new Python interpreter so that none of them is already imported. Run
+it from the python directory, with ycmd in the Python path, with:
+
+  python -m ycm.benchmarks.startup
+
+With --budget, the command fails if the median import time is over the given
+number of milliseconds, so that the startup time can be checked on each
+machine. The first import compiles the modules so it isn't measured."""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+import ycm
+import ycmd
+
+# Run in the new interpreter. The vim module is replaced by one that is just
+# enough to import the modules, rather than by the mock of the tests, which
+# would import many modules before the measure.
+_IMPORT_SCRIPT = '''
+import sys
+import types
+
+vim = types.ModuleType( 'vim' )
+vim.error = Exception
+vim.eval = lambda expression: '-1'
+sys.modules[ 'vim' ] = vim
+
+from ycm import startup_profile
+startup_profile.Start()
+# Like s:SetUpPython in autoload/youcompleteme.vim.
+from ycm import base, vimsupport, youcompleteme
+startup_profile.Stop()
+
+import json
+print( json.dumps( startup_profile.Results() ) )
+'''
+
+
+def _ImportOnce():
+  python_path = [ os.path.dirname( os.path.dirname( package.__file__ ) )
+                  for package in ( ycm, ycmd ) ]
+  output = subprocess.check_output(
+    [ sys.executable, '-c', _IMPORT_SCRIPT ],
+    env = dict( os.environ, PYTHONPATH = os.pathsep.join( python_path ) ) )
+  return json.loads( output )
+
+
+def _Summarise( runs ):
+  """Returns the median of the import times of |runs|, and of each module
+  imported in all of them."""
+  modules = {}
+  for name in runs[ 0 ][ 'modules' ]:
+    times = [ run[ 'modules' ].get( name ) for run in runs ]
+    if None in times:
+      continue
+    modules[ name ] = {
+      'total_ms': statistics.median( time[ 'total_ms' ] for time in times ),
+      'own_ms': statistics.median( time[ 'own_ms' ] for time in times )
+    }
+  import_times = [ run[ 'import_ms' ] for run in runs ]
+  return { 'runs': len( runs ),
+           'median_ms': statistics.median( import_times ),
+           'min_ms': min( import_times ),
+           'max_ms': max( import_times ),
+           'modules': modules }
+
+
+def _Report( results, max_modules ):
+  print( f'Import time over { results[ "runs" ] } runs: '
+         f'median { results[ "median_ms" ]:.2f} ms, '
+         f'min { results[ "min_ms" ]:.2f} ms, '
+         f'max { results[ "max_ms" ]:.2f} ms' )
+  print( f'{ "module":<40} { "total":>9} { "own":>9}' )
+  modules = sorted( results[ 'modules' ].items(),
+                    key = lambda item: item[ 1 ][ 'total_ms' ],
+                    reverse = True )
+  for name, times in modules[ : max_modules ]:
+    print( f'{ name:<40} { times[ "total_ms" ]:7.2f}ms '
+           f'{ times[ "own_ms" ]:7.2f}ms' )
+
+
+def ParseArguments():
+  parser = argparse.ArgumentParser( description = __doc__.split( '\n' )[ 0 ] )
+  parser.add_argument( '--runs', type = int, default = 20,
+                       help = 'Number of times the modules are imported.' )
+  parser.add_argument( '--modules', type = int, default = 30,
+                       help = 'Number of modules shown, the slowest first.' )
+  parser.add_argument( '--json', metavar = 'FILE',
+                       help = 'Write the results to FILE.' )
+  parser.add_argument( '--budget', type = float, metavar = 'MILLISECONDS',
+                       help = 'Fail if the median import time is higher.' )
+  return parser.parse_args()
+
+
+def Main():
+  args = ParseArguments()
+  # Compiles the modules.
+  _ImportOnce()
+  results = _Summarise( [ _ImportOnce() for _ in range( args.runs ) ] )
+
+  _Report( results, args.modules )
+
+  if args.json:
+    with open( args.json, 'w' ) as results_file:
+      json.dump( results, results_file, indent = 2 )
+
+  if args.budget is not None and results[ 'median_ms' ] > args.budget:
+    sys.exit( f'The median import time, { results[ "median_ms" ]:.2f} ms, is '
+              f'over the budget of { args.budget } ms.' )
+
+
+if __name__ == '__main__':
+  Main()
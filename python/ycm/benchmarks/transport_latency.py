@@ -0,0 +1,141 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Compares the round-trip latency of requests sent to a local HTTP server over
+TCP and over a Unix domain socket, using the same connection pool as the
+requests to ycmd. Run it from the python directory with:
+
+  python -m ycm.benchmarks.transport_latency
+"""
+
+import argparse
+import os
+import socketserver
+import statistics
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ycm.client.connection_pool import ConnectionPool
+
+
+class _EchoHandler( BaseHTTPRequestHandler ):
+  protocol_version = 'HTTP/1.1'
+
+  def do_POST( self ):
+    body = self.rfile.read( int( self.headers[ 'Content-Length' ] ) )
+    self.send_response( 200 )
+    self.send_header( 'Content-Type', 'application/json' )
+    self.send_header( 'Content-Length', str( len( body ) ) )
+    self.end_headers()
+    self.wfile.write( body )
+
+
+  def log_message( self, *args ):
+    pass
+
+
+class _TcpEchoHandler( _EchoHandler ):
+  # The headers and the body are written separately so, without this, Nagle's
+  # algorithm would delay every response by tens of milliseconds.
+  disable_nagle_algorithm = True
+
+
+class _UnixHTTPServer( socketserver.ThreadingMixIn,
+                       socketserver.UnixStreamServer ):
+  daemon_threads = True
+
+
+  def get_request( self ):
+    request, _ = super().get_request()
+    return request, ( 'unix', 0 )
+
+
+def _Serve( server ):
+  thread = threading.Thread( target = server.serve_forever )
+  thread.daemon = True
+  thread.start()
+
+
+def _Measure( pool, url, body, count, keep_alive ):
+  headers = { 'content-type': 'application/json' }
+  # Warm up, so that the first connection isn't counted when keeping it alive.
+  pool.Request( 'POST', url, body = body, headers = headers ).read()
+  durations = []
+  for _ in range( count ):
+    if not keep_alive:
+      pool.Reset()
+    start = time.perf_counter()
+    pool.Request( 'POST', url, body = body, headers = headers ).read()
+    durations.append( time.perf_counter() - start )
+  pool.Reset()
+  return durations
+
+
+def _Report( transport, durations ):
+  durations = sorted( durations )
+  p90 = durations[ int( len( durations ) * 0.9 ) ]
+  print( f'{ transport:<5} '
+         f'median { statistics.median( durations ) * 1e6:8.1f} us  '
+         f'p90 { p90 * 1e6:8.1f} us  '
+         f'mean { statistics.mean( durations ) * 1e6:8.1f} us' )
+
+
+def ParseArguments():
+  parser = argparse.ArgumentParser( description = __doc__.split( '\n' )[ 0 ] )
+  parser.add_argument( '--requests', type = int, default = 2000,
+                       help = 'Number of requests per transport.' )
+  parser.add_argument( '--size', type = int, default = 1024,
+                       help = 'Size in bytes of the request and response '
+                              'bodies.' )
+  parser.add_argument( '--no-keep-alive', action = 'store_true',
+                       help = 'Open a new connection for each request.' )
+  return parser.parse_args()
+
+
+def Main():
+  args = ParseArguments()
+  body = b'"' + b'x' * max( 0, args.size - 2 ) + b'"'
+
+  tcp_server = ThreadingHTTPServer( ( '127.0.0.1', 0 ), _TcpEchoHandler )
+  tcp_server.daemon_threads = True
+  _Serve( tcp_server )
+  host, port = tcp_server.server_address
+  url = f'http://{ host }:{ port }/echo'
+
+  with tempfile.TemporaryDirectory() as directory:
+    unix_socket = os.path.join( directory, 'ycmd.sock' )
+    unix_server = _UnixHTTPServer( unix_socket, _EchoHandler )
+    _Serve( unix_server )
+
+    print( f'{ args.requests } requests of { args.size } bytes, '
+           f'{ "new" if args.no_keep_alive else "kept-alive" } connections' )
+    pool = ConnectionPool()
+    _Report( 'tcp', _Measure( pool, url, body, args.requests,
+                              not args.no_keep_alive ) )
+    pool.SetUnixSocket( unix_socket )
+    _Report( 'unix', _Measure( pool, url, body, args.requests,
+                               not args.no_keep_alive ) )
+
+    for server in ( tcp_server, unix_server ):
+      server.shutdown()
+      server.server_close()
+
+
+if __name__ == '__main__':
+  Main()
@@ -16,10 +16,9 @@
 # along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
 
 from ycm import vimsupport
+from ycm import tracing
 from ycm.client.event_notification import EventNotification
 from ycm.diagnostic_interface import DiagnosticInterface
-from ycm.semantic_highlighting import SemanticHighlighting
-from ycm.inlay_hints import InlayHints
 
 
 # Emulates Vim buffer
@@ -37,11 +36,29 @@ class Buffer:
     self._diag_interface = DiagnosticInterface( bufnr, user_options )
     self._open_loclist_on_ycm_diags = user_options[
                                         'open_loclist_on_ycm_diags' ]
-    self.semantic_highlighting = SemanticHighlighting( bufnr )
-    self.inlay_hints = InlayHints( bufnr )
+    # Most buffers are never highlighted nor hinted, so these are only created,
+    # and their modules imported, when first used.
+    self._semantic_highlighting = None
+    self._inlay_hints = None
     self.UpdateFromFileTypes( filetypes )
 
 
+  @property
+  def semantic_highlighting( self ):
+    if self._semantic_highlighting is None:
+      from ycm.semantic_highlighting import SemanticHighlighting
+      self._semantic_highlighting = SemanticHighlighting( self._number )
+    return self._semantic_highlighting
+
+
+  @property
+  def inlay_hints( self ):
+    if self._inlay_hints is None:
+      from ycm.inlay_hints import InlayHints
+      self._inlay_hints = InlayHints( self._number )
+    return self._inlay_hints
+
+
   def FileParseRequestReady( self, block = False ):
     return ( bool( self._parse_request ) and
              ( block or self._parse_request.Done() ) )
@@ -88,6 +105,7 @@ class Buffer:
       self._parse_request.Response()
 
 
+  @tracing.Traced( tracing.UI )
   def UpdateWithNewDiagnostics( self, diagnostics, async_message ):
     self._async_diags = async_message
     self._diag_interface.UpdateWithNewDiagnostics(
@@ -95,6 +113,7 @@ class Buffer:
         not self._async_diags and self._open_loclist_on_ycm_diags )
 
 
+  @tracing.Traced( tracing.UI )
   def UpdateMatches( self ):
     self._diag_interface.UpdateMatches()
 
@@ -0,0 +1,92 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+from collections import OrderedDict
+
+MAX_ENTRIES = 64
+# Total number of characters of buffer contents kept in the cache.
+MAX_SIZE = 32 * 1024 * 1024
+
+
+class BufferDataCache:
+  """Least recently used cache of the data sent to the server for each buffer,
+  i.e. its contents joined as a single string and its filetypes. An entry is
+  valid as long as the changedtick of the buffer and its filetypes don't change.
+  Filetypes are part of the key because setting them doesn't increase the
+  changedtick."""
+
+  def __init__( self, max_entries = MAX_ENTRIES, max_size = MAX_SIZE ):
+    self._max_entries = max_entries
+    self._max_size = max_size
+    self._entries = OrderedDict()
+    self._size = 0
+    self._hits = 0
+    self._misses = 0
+
+
+  def Get( self, buffer_number, changedtick, filetypes, compute ):
+    """Returns the cached data for the buffer |buffer_number| or calls
+    |compute| to get it if the buffer changed since it was cached. A
+    |changedtick| of 0 means that it couldn't be read, in which case the data is
+    always computed."""
+    entry = self._entries.get( buffer_number )
+    if ( entry is not None and
+         changedtick and
+         entry[ 0 ] == changedtick and
+         entry[ 1 ] == filetypes ):
+      self._entries.move_to_end( buffer_number )
+      self._hits += 1
+      return entry[ 2 ]
+
+    self._misses += 1
+    data = compute()
+    self.Invalidate( buffer_number )
+    if changedtick:
+      self._entries[ buffer_number ] = ( changedtick, filetypes, data )
+      self._size += len( data[ 'contents' ] )
+      self._Evict()
+    return data
+
+
+  def Invalidate( self, buffer_number ):
+    entry = self._entries.pop( buffer_number, None )
+    if entry is not None:
+      self._size -= len( entry[ 2 ][ 'contents' ] )
+
+
+  def Clear( self ):
+    self._entries.clear()
+    self._size = 0
+
+
+  def Stats( self ):
+    return {
+      'hits': self._hits,
+      'misses': self._misses,
+      'entries': len( self._entries ),
+      'size': self._size
+    }
+
+
+  def _Evict( self ):
+    # The most recently used entry is always kept, even if it's too large on its
+    # own: it's the one that is going to be requested next.
+    while ( len( self._entries ) > 1 and
+            ( len( self._entries ) > self._max_entries or
+              self._size > self._max_size ) ):
+      _, ( _, _, data ) = self._entries.popitem( last = False )
+      self._size -= len( data[ 'contents' ] )
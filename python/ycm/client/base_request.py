@@ -16,18 +16,28 @@
 # along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
 
 import logging
-import json
 import vim
 from base64 import b64decode, b64encode
+from collections import Counter
+from concurrent.futures import CancelledError
 from hmac import compare_digest
+from time import monotonic
 from urllib.parse import urljoin, urlparse, urlencode
-from urllib.request import Request, urlopen
 from urllib.error import URLError, HTTPError
-from ycm import vimsupport
+from ycm import tracing, vimsupport
+from ycm.client import json_codec
+from ycm.client.connection_pool import Cancellation, ConnectionPool
+from ycm.client.file_data_sync import ServerExtensions
+from ycm.client.latency_estimates import LatencyEstimates
+from ycm.client.request_batch import ( BATCH_EXTENSION, BATCH_HANDLER,
+                                       BatchBody, BatchedRequest,
+                                       RequestBatch, SplitBatchResponse )
+from ycm.client.request_timings import RequestTimer, RequestTimings, ServerTime
 from ycmd.utils import ToBytes, GetCurrentDirectory, ToUnicode
 from ycmd.hmac_utils import CreateRequestHmac, CreateHmac
 from ycmd.responses import ServerError, UnknownExtraConf
 
+HTTP_NOT_FOUND = 404
 HTTP_SERVER_ERROR = 500
 
 _HEADERS = { 'content-type': 'application/json' }
@@ -35,13 +45,63 @@ _CONNECT_TIMEOUT_SEC = 0.01
 # Setting this to None seems to screw up the Requests/urllib3 libs.
 _READ_TIMEOUT_SEC = 30
 _HMAC_HEADER = 'x-ycm-hmac'
+_REQUEST_ID_HEADER = 'x-ycm-request-id'
+# Extension through which the server can be told to abandon a request.
+_CANCEL_REQUEST_EXTENSION = 'cancel-request'
 _logger = logging.getLogger( __name__ )
 
+# Requests are scheduled by priority, the lowest number first:
+#  - interactive requests are the ones the user is waiting for, including all
+#    blocking requests since Vim is frozen until they complete;
+#  - commands are the requests triggered by the user that may take a while;
+#  - parse requests are the event notifications;
+#  - background requests update highlighting and check the server status;
+#  - long-polls wait on the server until it has something to say.
+PRIORITY_INTERACTIVE = 0
+PRIORITY_COMMAND = 1
+PRIORITY_PARSE = 2
+PRIORITY_BACKGROUND = 3
+PRIORITY_LONG_POLL = 4
+_HANDLER_PRIORITIES = {
+  'cancel_request': PRIORITY_INTERACTIVE,
+  'completions': PRIORITY_INTERACTIVE,
+  'resolve_completion': PRIORITY_INTERACTIVE,
+  'signature_help': PRIORITY_INTERACTIVE,
+  'event_notification': PRIORITY_PARSE,
+  'healthy': PRIORITY_BACKGROUND,
+  'inlay_hints': PRIORITY_BACKGROUND,
+  'ready': PRIORITY_BACKGROUND,
+  'semantic_tokens': PRIORITY_BACKGROUND,
+  'signature_help_available': PRIORITY_BACKGROUND,
+  'receive_messages': PRIORITY_LONG_POLL,
+}
+# Vim pollers waiting for the responses of these handlers; they are woken up as
+# soon as a response arrives if a response notifier is set up. Otherwise, they
+# are scheduled according to the latency of the responses they wait for.
+_HANDLER_POLLERS = {
+  'completions': 'completion',
+  'resolve_completion': 'completion',
+  'signature_help': 'signature_help',
+  'event_notification': 'file_parse_response',
+  'semantic_tokens': 'semantic_highlighting',
+  'inlay_hints': 'inlay_hints',
+}
+NOTIFIED_POLLERS = sorted( set( _HANDLER_POLLERS.values() ) )
+# Maximum number of requests of a given priority sent at the same time. This
+# leaves enough workers for interactive requests and commands, whatever the
+# number of pending highlighting requests or long-polls.
+_PRIORITY_LIMITS = {
+  PRIORITY_PARSE: 8,
+  PRIORITY_BACKGROUND: 8,
+  PRIORITY_LONG_POLL: 6,
+}
+
 
 class BaseRequest:
 
   def __init__( self ):
     self._should_resend = False
+    self._cancellation = None
 
 
   def Start( self ):
@@ -60,6 +120,28 @@ class BaseRequest:
     return self._should_resend
 
 
+  def Cancel( self ):
+    """Abandon the request if its response is not needed anymore, e.g. because a
+    newer request supersedes it. Only requests started with a cancellation token
+    (see _NewCancellation) can be cancelled. The request is not sent if it's
+    still queued; otherwise, its connection is closed and the server is asked to
+    stop working on it if it supports that."""
+    if self._cancellation is None or not self._cancellation.Cancel():
+      return
+    BaseRequest.dropped_requests[ self._cancelled_handler ] += 1
+    if ( self._cancellation.Sent() and
+         _CANCEL_REQUEST_EXTENSION in BaseRequest.server_extensions ):
+      BaseRequest.PostDataToHandlerAsync(
+        { 'request_id': self._cancellation.request_id },
+        'cancel_request' )
+
+
+  def _NewCancellation( self, handler ):
+    self._cancellation = Cancellation()
+    self._cancelled_handler = handler
+    return self._cancellation
+
+
   def HandleFuture( self,
                     future,
                     display_message = True,
@@ -72,9 +154,17 @@ class BaseRequest:
     status line. Unset the |display_message| parameter to hide the message from
     the user. Set the |truncate_message| parameter to avoid hit-enter prompts
     from this message."""
+    # Don't wait forever for a request that is still waiting in a batch.
+    batch = BaseRequest.request_batch
+    if batch is not None and batch.Contains( future ):
+      BaseRequest._SendBatchedRequests( batch )
+
     try:
       try:
         return _JsonFromFuture( future )
+      except CancelledError:
+        # The request was abandoned on purpose; nobody waits for its response.
+        return None
       except UnknownExtraConf as e:
         if vimsupport.Confirm( str( e ) ):
           _LoadExtraConfFile( e.extra_conf_file )
@@ -107,7 +197,13 @@ class BaseRequest:
                           truncate_message = False,
                           payload = None ):
     return self.HandleFuture(
-        self.GetDataFromHandlerAsync( handler, timeout, payload ),
+        BaseRequest._TalkToHandlerAsync( '',
+                                         handler,
+                                         'GET',
+                                         timeout,
+                                         payload,
+                                         priority = PRIORITY_INTERACTIVE,
+                                         batchable = False ),
         display_message,
         truncate_message )
 
@@ -115,9 +211,32 @@ class BaseRequest:
   def GetDataFromHandlerAsync( self,
                                handler,
                                timeout = _READ_TIMEOUT_SEC,
-                               payload = None ):
+                               payload = None,
+                               priority = None,
+                               server = None ):
     return BaseRequest._TalkToHandlerAsync(
-        '', handler, 'GET', timeout, payload )
+        '', handler, 'GET', timeout, payload, priority = priority,
+        server = server )
+
+
+  # This method blocks and can be called from a background thread: the request
+  # is never added to the request batch of the main thread nor flushes it, and
+  # errors are only logged. Returns None if the request failed.
+  @staticmethod
+  def GetDataFromHandlerInBackground( handler,
+                                      timeout = _READ_TIMEOUT_SEC,
+                                      priority = PRIORITY_BACKGROUND ):
+    try:
+      return _JsonFromFuture(
+        BaseRequest._TalkToHandlerAsync( '',
+                                         handler,
+                                         'GET',
+                                         timeout,
+                                         priority = priority,
+                                         batchable = False ) )
+    except Exception as e:
+      _logger.error( e )
+      return None
 
 
   # This is the blocking version of the method. See below for async.
@@ -132,7 +251,12 @@ class BaseRequest:
                          display_message = True,
                          truncate_message = False ):
     return self.HandleFuture(
-        BaseRequest.PostDataToHandlerAsync( data, handler, timeout ),
+        BaseRequest._TalkToHandlerAsync( data,
+                                         handler,
+                                         'POST',
+                                         timeout,
+                                         priority = PRIORITY_INTERACTIVE,
+                                         batchable = False ),
         display_message,
         truncate_message )
 
@@ -140,56 +264,134 @@ class BaseRequest:
   # This returns a future! Use HandleFuture to get the value.
   # |timeout| is num seconds to tolerate no response from server before giving
   # up; see Requests docs for details (we just pass the param along).
+  # |cancellation| allows abandoning the request; see the Cancel method.
+  # |priority| overrides the priority of the handler; see _HANDLER_PRIORITIES.
+  # |server| is the Server to send the request to instead of the current one.
   @staticmethod
-  def PostDataToHandlerAsync( data, handler, timeout = _READ_TIMEOUT_SEC ):
-    return BaseRequest._TalkToHandlerAsync( data, handler, 'POST', timeout )
+  def PostDataToHandlerAsync( data,
+                              handler,
+                              timeout = _READ_TIMEOUT_SEC,
+                              cancellation = None,
+                              priority = None,
+                              timer = None,
+                              server = None ):
+    return BaseRequest._TalkToHandlerAsync( data,
+                                            handler,
+                                            'POST',
+                                            timeout,
+                                            cancellation = cancellation,
+                                            priority = priority,
+                                            timer = timer,
+                                            server = server )
 
 
   # This returns a future! Use HandleFuture to get the value.
   # |method| is either 'POST' or 'GET'.
   # |timeout| is num seconds to tolerate no response from server before giving
   # up; see Requests docs for details (we just pass the param along).
+  # |batchable| must be unset if the response is waited for straight away.
   @staticmethod
   def _TalkToHandlerAsync( data,
                            handler,
                            method,
                            timeout = _READ_TIMEOUT_SEC,
-                           payload = None ):
-    def _MakeRequest( data, handler, method, timeout, payload ):
-      request_uri = _BuildUri( handler )
+                           payload = None,
+                           cancellation = None,
+                           priority = None,
+                           batchable = True,
+                           timer = None,
+                           server = None ):
+    if priority is None:
+      priority = _HANDLER_PRIORITIES.get( handler, PRIORITY_COMMAND )
+    if timer is None:
+      timer = NewRequestTimer( handler )
+    if not timer.filetype:
+      timer.filetype = RequestFiletype( data )
+    timer.queued_time = monotonic()
+    trace_id = tracing.BeginAsync( handler,
+                                   tracing.REQUEST,
+                                   { 'filetype': timer.filetype } )
+
+    if batchable and server is None and BaseRequest._Batching():
+      future = BaseRequest.request_batch.Add( BatchedRequest( method,
+                                                              handler,
+                                                              data,
+                                                              payload,
+                                                              timeout,
+                                                              cancellation,
+                                                              priority ) )
+    else:
+      future = BaseRequest.Executor().submit_with_priority(
+        priority,
+        _MakeProcessedRequest,
+        data,
+        handler,
+        method,
+        timeout,
+        payload,
+        cancellation,
+        timer,
+        server )
+
+    future.add_done_callback( lambda future: timer.OnResponse() )
+    future.add_done_callback(
+      lambda future: tracing.EndAsync( handler, tracing.REQUEST, trace_id ) )
+    poller = _HANDLER_POLLERS.get( handler )
+    # Vim only polls for the responses of the current server.
+    if poller is None or server is not None:
+      return future
+
+    start_time = monotonic()
+    estimates = BaseRequest.latency_estimates
+
+    def RecordLatency( future ):
+      if not future.cancelled() and future.exception() is None:
+        estimates.Record( poller, monotonic() - start_time )
+
+    future.add_done_callback( RecordLatency )
+    notifier = BaseRequest.response_notifier
+    if notifier is not None:
+      future.add_done_callback( lambda future: notifier.Notify( poller ) )
+    return future
+
+
+  # Requests issued between StartRequestBatch and FlushRequestBatch are sent
+  # together in a single request if the server supports it, and their request
+  # data is only built once. Calls can be nested.
+  @staticmethod
+  def StartRequestBatch():
+    if BaseRequest.request_batch is None:
+      BaseRequest.request_batch = RequestBatch()
+    BaseRequest.request_batch.Open()
+
+
+  @staticmethod
+  def FlushRequestBatch():
+    batch = BaseRequest.request_batch
+    if batch is None or not batch.Close():
+      return
+    BaseRequest.request_batch = None
+    BaseRequest._SendBatchedRequests( batch )
 
-      if method == 'POST':
-        sent_data = _ToUtf8Json( data )
-        headers = BaseRequest._ExtraHeaders( method,
-                                             request_uri,
-                                             sent_data )
-        _logger.debug( 'POST %s\n%s\n%s', request_uri, headers, sent_data )
-      else:
-        headers = BaseRequest._ExtraHeaders( method, request_uri )
-        if payload:
-          request_uri += ToBytes( f'?{ urlencode( payload ) }' )
-
-        _logger.debug( 'GET %s (%s)\n%s', request_uri, payload, headers )
-      return urlopen(
-        Request(
-          ToUnicode( request_uri ),
-          data = sent_data if data else None,
-          headers = headers,
-          method = method ),
-        timeout = max( _CONNECT_TIMEOUT_SEC, timeout ) )
-
-
-    return BaseRequest.Executor().submit(
-      _MakeRequest,
-      data,
-      handler,
-      method,
-      timeout,
-      payload )
+
+  @staticmethod
+  def _Batching():
+    return ( BaseRequest.request_batch is not None and
+             BATCH_EXTENSION in BaseRequest.server_extensions )
+
+
+  @staticmethod
+  def _SendBatchedRequests( batch ):
+    requests = batch.TakeRequests()
+    if requests:
+      BaseRequest.Executor().submit_with_priority(
+        min( request.priority for request in requests ),
+        _SendBatch,
+        requests )
 
 
   @staticmethod
-  def _ExtraHeaders( method, request_uri, request_body = None ):
+  def _ExtraHeaders( method, request_uri, request_body = None, server = None ):
     if not request_body:
       request_body = bytes( b'' )
     headers = dict( _HEADERS )
@@ -197,7 +399,7 @@ class BaseRequest:
         CreateRequestHmac( ToBytes( method ),
                            ToBytes( urlparse( request_uri ).path ),
                            request_body,
-                           BaseRequest.hmac_secret ) )
+                           _HmacSecret( server ) ) )
     return headers
 
 
@@ -209,17 +411,93 @@ class BaseRequest:
       return cls.executor
     except AttributeError:
       from ycm.unsafe_thread_pool_executor import UnsafeThreadPoolExecutor
-      cls.executor = UnsafeThreadPoolExecutor( max_workers = 30 )
+      cls.executor = UnsafeThreadPoolExecutor( max_workers = 30,
+                                               limits = _PRIORITY_LIMITS )
       return cls.executor
 
 
+  # The pool of keep-alive connections to the server, shared by all the threads
+  # of the executor.
+  @classmethod
+  def ConnectionPool( cls ):
+    try:
+      return cls.connection_pool
+    except AttributeError:
+      from ycm.client.connection_pool import ConnectionPool
+      cls.connection_pool = ConnectionPool()
+      return cls.connection_pool
+
+
+  # Tracks which file contents the server already has, so that they are not
+  # sent again.
+  @classmethod
+  def FileDataSync( cls ):
+    try:
+      return cls.file_data_sync
+    except AttributeError:
+      from ycm.client.file_data_sync import FileDataSync
+      cls.file_data_sync = FileDataSync()
+      return cls.file_data_sync
+
+
   server_location = ''
   hmac_secret = ''
+  # Protocol extensions supported by the server, as advertised in its last
+  # response.
+  server_extensions = set()
+  # Number of requests abandoned with Cancel, by handler.
+  dropped_requests = Counter()
+  # The batch collecting requests, if any; see StartRequestBatch.
+  request_batch = None
+  # Tells Vim when responses arrive, if set up; see ResponseNotifier.
+  response_notifier = None
+  # Time taken by the responses Vim polls for, by poller.
+  latency_estimates = LatencyEstimates()
+  # Time taken by each phase of the requests; see :YcmLatencyStats.
+  request_timings = RequestTimings()
+
+
+class Server:
+  """A server that requests can be sent to instead of the current one, which is
+  at BaseRequest.server_location, e.g. a server started to replace it. It has
+  connections of its own. What is known about the current server, like the
+  protocol extensions it supports or the files it has, doesn't apply to it, so
+  its requests are neither batched nor versioned."""
+
+  def __init__( self, location, hmac_secret, unix_socket = None ):
+    self.location = location
+    self.hmac_secret = hmac_secret
+    self.unix_socket = unix_socket
+    self.connection_pool = ConnectionPool()
+    self.connection_pool.SetUnixSocket( unix_socket )
+
+
+def NewRequestTimer( handler ):
+  """Returns an object timing the phases of a request to |handler|. Requests
+  create one by default, but it can be created earlier and passed to them to
+  time the building of their data."""
+  return RequestTimer( BaseRequest.request_timings, handler )
+
+
+def RequestFiletype( data ):
+  """Returns the filetype under which the timings of a request with |data|
+  are recorded."""
+  try:
+    return data[ 'file_data' ][ data[ 'filepath' ] ][ 'filetypes' ][ 0 ]
+  except ( KeyError, IndexError, TypeError ):
+    return ''
 
 
 def BuildRequestData( buffer_number = None ):
   """Build request for the current buffer or the buffer with number
   |buffer_number| if specified."""
+  if BaseRequest.request_batch is not None:
+    return BaseRequest.request_batch.RequestData(
+      buffer_number, lambda: _BuildRequestData( buffer_number ) )
+  return _BuildRequestData( buffer_number )
+
+
+def _BuildRequestData( buffer_number ):
   working_dir = GetCurrentDirectory()
   current_buffer = vim.current.buffer
 
@@ -269,25 +547,191 @@ def BuildRequestDataForLocation( file : str, line : int, column : int ):
   }
 
 
+def _MakeRequest( data,
+                  handler,
+                  method,
+                  timeout,
+                  payload,
+                  cancellation,
+                  timer,
+                  server = None ):
+  request_uri = _BuildUri( handler, server )
+
+  def _Send( data ):
+    uri = request_uri
+    if method == 'POST':
+      with timer.Time( 'encode' ):
+        sent_data = _ToUtf8Json( data )
+      headers = BaseRequest._ExtraHeaders( method, uri, sent_data, server )
+      _logger.debug( 'POST %s\n%s\n%s', uri, headers, sent_data )
+    else:
+      sent_data = None
+      headers = BaseRequest._ExtraHeaders( method, uri, server = server )
+      if payload:
+        uri += ToBytes( f'?{ urlencode( payload ) }' )
+
+      _logger.debug( 'GET %s (%s)\n%s', uri, payload, headers )
+    if cancellation is not None:
+      headers[ _REQUEST_ID_HEADER ] = str( cancellation.request_id )
+    connection_pool = ( BaseRequest.ConnectionPool() if server is None else
+                        server.connection_pool )
+    with timer.Time( 'http' ):
+      response = connection_pool.Request(
+        method,
+        ToUnicode( uri ),
+        body = sent_data if data else None,
+        headers = headers,
+        timeout = max( _CONNECT_TIMEOUT_SEC, timeout ),
+        cancellation = cancellation )
+    server_time = ServerTime( response.headers )
+    if server_time is not None:
+      timer.Record( 'server', server_time )
+    return response
+
+  try:
+    if server is None:
+      response = BaseRequest.FileDataSync().Send( data, _Send )
+    else:
+      response = _Send( data )
+  finally:
+    if cancellation is not None:
+      cancellation.Finish()
+  if server is None:
+    BaseRequest.server_extensions = ServerExtensions( response )
+  return response
+
+
+class _ProcessedResponse:
+  """The data of a response that was read, validated and decoded on the
+  executor thread, so that Vim only has to pick it up."""
+
+  def __init__( self, data ):
+    self.data = data
+
+
+def _MakeProcessedRequest( data,
+                           handler,
+                           method,
+                           timeout,
+                           payload,
+                           cancellation,
+                           timer = None,
+                           server = None ):
+  if timer is None:
+    timer = NewRequestTimer( handler )
+  else:
+    timer.RecordSince( 'queue', timer.queued_time )
+  try:
+    response = _MakeRequest( data,
+                             handler,
+                             method,
+                             timeout,
+                             payload,
+                             cancellation,
+                             timer,
+                             server )
+  except HTTPError as error:
+    response = error
+  with timer.Time( 'decode' ):
+    return _ProcessedResponse( _ReadResponse( response, server ) )
+
+
+def _SendBatch( requests ):
+  requests = [ request for request in requests if request.Start() ]
+  if len( requests ) < 2:
+    # Not worth a batch.
+    _SendOneByOne( requests )
+    return
+
+  try:
+    responses = SplitBatchResponse(
+      ToUnicode( _BuildUri( BATCH_HANDLER ) ),
+      _MakeRequest( BatchBody( requests ),
+                    BATCH_HANDLER,
+                    'POST',
+                    max( request.timeout for request in requests ),
+                    None,
+                    None,
+                    NewRequestTimer( BATCH_HANDLER ) ),
+      len( requests ),
+      _ValidateResponseObject )
+  except HTTPError as error:
+    # The server may have been restarted without support for batches.
+    if error.code == HTTP_NOT_FOUND:
+      _SendOneByOne( requests )
+      return
+    _FailBatch( requests, error )
+    return
+  except Exception as error:
+    _FailBatch( requests, error )
+    return
+
+  for request, response in zip( requests, responses ):
+    _ResolveBatchedRequest( request, response )
+
+
+def _FailBatch( requests, error ):
+  if isinstance( error, HTTPError ):
+    # Extract the error returned by the server, if any.
+    try:
+      _ReadResponse( error )
+    except Exception as server_error:
+      error = server_error
+  for request in requests:
+    request.SetException( error )
+
+
+def _SendOneByOne( requests ):
+  for request in requests:
+    try:
+      request.SetResponse( _MakeProcessedRequest( request.data,
+                                                  request.handler,
+                                                  request.method,
+                                                  request.timeout,
+                                                  request.payload,
+                                                  request.cancellation ) )
+    except Exception as error:
+      request.SetException( error )
+
+
+def _ResolveBatchedRequest( request, response ):
+  try:
+    request.SetResponse( _ProcessedResponse( _ReadResponse( response ) ) )
+  except Exception as error:
+    request.SetException( error )
+
+
 def _JsonFromFuture( future ):
   try:
     response = future.result()
-    response_text = response.read()
-    _ValidateResponseObject( response, response_text )
-    response.close()
-
-    if response_text:
-      return json.loads( response_text )
-    return None
-  except HTTPError as response:
+  except HTTPError as error:
+    response = error
+  if isinstance( response, _ProcessedResponse ):
+    return response.data
+  # The response wasn't sent through the executor.
+  return _ReadResponse( response )
+
+
+def _ReadResponse( response, server = None ):
+  """Returns the decoded data of |response| after checking that it comes from
+  |server|, the current server by default, or raises the error returned by the
+  server. |response| may be an HTTPError."""
+  if isinstance( response, HTTPError ):
     if response.code == HTTP_SERVER_ERROR:
       response_text = response.read()
       response.close()
       if response_text:
-        raise MakeServerException( json.loads( response_text ) )
-      else:
-        return None
-    raise
+        raise MakeServerException( json_codec.Loads( response_text ) )
+      return None
+    raise response
+
+  response_text = response.read()
+  _ValidateResponseObject( response, response_text, server )
+  response.close()
+
+  if response_text:
+    return json_codec.Loads( response_text )
+  return None
 
 
 def _LoadExtraConfFile( filepath ):
@@ -311,20 +755,25 @@ def DisplayServerException( exception, truncate_message = False ):
 
 
 def _ToUtf8Json( data ):
-  return ToBytes( json.dumps( data ) if data else None )
+  return json_codec.Dumps( data ) if data else ToBytes( None )
 
 
-def _ValidateResponseObject( response, response_text ):
+def _ValidateResponseObject( response, response_text, server = None ):
   if not response_text:
     return
-  our_hmac = CreateHmac( response_text, BaseRequest.hmac_secret )
+  our_hmac = CreateHmac( response_text, _HmacSecret( server ) )
   their_hmac = ToBytes( b64decode( response.headers[ _HMAC_HEADER ] ) )
   if not compare_digest( our_hmac, their_hmac ):
     raise RuntimeError( 'Received invalid HMAC for response!' )
 
 
-def _BuildUri( handler ):
-  return ToBytes( urljoin( BaseRequest.server_location, handler ) )
+def _BuildUri( handler, server = None ):
+  location = BaseRequest.server_location if server is None else server.location
+  return ToBytes( urljoin( location, handler ) )
+
+
+def _HmacSecret( server ):
+  return BaseRequest.hmac_secret if server is None else server.hmac_secret
 
 
 def MakeServerException( data ):
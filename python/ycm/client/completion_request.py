@@ -20,7 +20,8 @@ import logging
 from ycmd.utils import ToUnicode
 from ycm.client.base_request import ( BaseRequest,
                                       DisplayServerException,
-                                      MakeServerException )
+                                      MakeServerException,
+                                      NewRequestTimer )
 from ycm import vimsupport, base
 from ycm.vimsupport import NO_COMPLETIONS
 
@@ -28,15 +29,20 @@ _logger = logging.getLogger( __name__ )
 
 
 class CompletionRequest( BaseRequest ):
-  def __init__( self, request_data ):
+  def __init__( self, request_data, timer = None ):
     super().__init__()
     self.request_data = request_data
     self._response_future = None
+    self._timer = timer or NewRequestTimer( 'completions' )
+    self._picked_up = False
 
 
   def Start( self ):
-    self._response_future = self.PostDataToHandlerAsync( self.request_data,
-                                                         'completions' )
+    self._response_future = self.PostDataToHandlerAsync(
+      self.request_data,
+      'completions',
+      cancellation = self._NewCancellation( 'completions' ),
+      timer = self._timer )
 
 
   def Done( self ):
@@ -66,16 +72,33 @@ class CompletionRequest( BaseRequest ):
 
 
   def Response( self ):
-    response = self._RawResponse()
-    response[ 'completions' ] = _ConvertCompletionDatasToVimDatas(
-        response[ 'completions' ] )
-    # FIXME: Do we really need to do this AdjustCandidateInsertionText ? I feel
-    # like Vim should do that for us
-    response[ 'completions' ] = base.AdjustCandidateInsertionText(
-        response[ 'completions' ] )
+    self._RecordPollTime()
+    with self._timer.Time( 'convert' ):
+      response = self._RawResponse()
+      response[ 'completions' ] = _ConvertCompletionDatasToVimDatas(
+          response[ 'completions' ] )
+      # FIXME: Do we really need to do this AdjustCandidateInsertionText ? I
+      # feel like Vim should do that for us
+      response[ 'completions' ] = base.AdjustCandidateInsertionText(
+          response[ 'completions' ] )
     return response
 
 
+  def _RecordPollTime( self ):
+    if self._picked_up:
+      return
+    self._picked_up = True
+    if self._timer.response_time is not None:
+      self._timer.RecordSince( 'poll', self._timer.response_time )
+
+
+  def OnDisplayed( self, seconds ):
+    """Records the |seconds| Vim took to display the completion menu, and the
+    time taken from the start of the request until then."""
+    self._timer.Record( 'complete', seconds )
+    self._timer.RecordSince( 'total', self._timer.start_time )
+
+
   def OnCompleteDone( self ):
     if not self.Done():
       return
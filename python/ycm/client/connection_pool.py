@@ -0,0 +1,370 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+import itertools
+import select
+import socket
+import threading
+from concurrent.futures import CancelledError
+from http.client import HTTPConnection
+from io import BytesIO
+from time import monotonic
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlparse
+from urllib.response import addinfourl
+
+# Maximum number of connections kept open while no request is using them. A
+# request that finds no idle connection opens a new one, so this only bounds the
+# number of sockets left open between bursts of requests.
+MAX_IDLE_CONNECTIONS = 8
+
+# Errors raised when the server has closed a kept-alive connection before
+# receiving our request. The request is then sent again on a new connection.
+_STALE_CONNECTION_ERRORS = ( BrokenPipeError,
+                             ConnectionAbortedError,
+                             ConnectionResetError )
+
+_REQUEST_IDS = itertools.count( 1 )
+
+
+class Cancellation:
+  """Allows abandoning a request from another thread. A request cancelled before
+  being sent is not sent at all; a request in flight has its connection shut
+  down, which makes the thread waiting for the response raise CancelledError.
+  The same token may be used for several attempts of a request; Finish must be
+  called once the last one is done."""
+
+  def __init__( self ):
+    self.request_id = next( _REQUEST_IDS )
+    self._lock = threading.Lock()
+    self._cancelled = False
+    self._sent = False
+    self._finished = False
+    self._connection = None
+
+
+  def Cancel( self ):
+    """Returns False if the request was already finished or cancelled."""
+    with self._lock:
+      if self._cancelled or self._finished:
+        return False
+      self._cancelled = True
+      # The connection is shut down while holding the lock: a request detaches
+      # its connection, under this lock, before giving it back to the pool, so
+      # it can't be in use by another request here.
+      connection = self._connection
+      if connection is not None and connection.sock is not None:
+        try:
+          connection.sock.shutdown( socket.SHUT_RDWR )
+        except OSError:
+          pass
+    return True
+
+
+  def Cancelled( self ):
+    with self._lock:
+      return self._cancelled
+
+
+  def Sent( self ):
+    """Whether the request may have reached the server."""
+    with self._lock:
+      return self._sent
+
+
+  def Finish( self ):
+    with self._lock:
+      self._finished = True
+
+
+  def _Attach( self, connection ):
+    with self._lock:
+      if self._cancelled:
+        raise CancelledError()
+      self._sent = True
+      self._connection = connection
+
+
+  def _Detach( self ):
+    with self._lock:
+      self._connection = None
+
+
+class UnixHTTPConnection( HTTPConnection ):
+  """HTTP connection over a Unix domain socket. |host| and |port| are only
+  used for the Host header."""
+
+  def __init__( self, path, host, port = None, timeout = None ):
+    super().__init__( host, port, timeout = timeout )
+    self.path = path
+
+
+  def connect( self ):
+    sock = socket.socket( socket.AF_UNIX, socket.SOCK_STREAM )
+    try:
+      sock.settimeout( self.timeout )
+      sock.connect( self.path )
+    except BaseException:
+      sock.close()
+      raise
+    self.sock = sock
+
+
+class ConnectionPool:
+  """Keeps HTTP/1.1 connections to the server alive so that requests don't pay
+  for a new TCP handshake each time. Connections are shared by all the threads
+  of the executor: a request takes an idle connection (or opens a new one) and
+  gives it back to the pool once the response has been read.
+
+  If a Unix domain socket is set, connections are made through it instead of
+  TCP. The server may not listen on that socket (e.g. an older ycmd): when
+  connecting to it fails but connecting over TCP works, the socket is ignored
+  from then on and UnixSocketUnsupported returns True, so that the next servers
+  aren't asked to listen on a socket either."""
+
+  def __init__( self, max_idle_connections = MAX_IDLE_CONNECTIONS ):
+    self._max_idle_connections = max_idle_connections
+    self._lock = threading.Lock()
+    self._idle_connections = []
+    self._generation = 0
+    self._unix_socket = None
+    self._unix_socket_unsupported = False
+    self._opened = 0
+    self._reused = 0
+    self._reconnected = 0
+    self._last_activity = None
+
+
+  def Request( self,
+               method,
+               url,
+               body = None,
+               headers = {},
+               timeout = None,
+               cancellation = None ):
+    """Sends a |method| request to |url| and returns the response with its
+    body already read, so that the connection can be reused straight away.
+    Like urlopen, raises HTTPError on error status codes and URLError if the
+    server cannot be reached. Raises CancelledError if |cancellation| is
+    cancelled before the response is read."""
+    if cancellation is None:
+      cancellation = Cancellation()
+    elif cancellation.Cancelled():
+      raise CancelledError()
+
+    origin, selector = _ParseUrl( url )
+    request = ( method, selector, body, headers )
+    generation, connection, reused = self._Acquire( origin, timeout )
+    try:
+      cancellation._Attach( connection )
+      try:
+        response = _SendRequest( connection, *request )
+      except _STALE_CONNECTION_ERRORS:
+        if not reused:
+          raise
+        connection = self._Reconnect( connection, origin, timeout )
+        cancellation._Attach( connection )
+        response = _SendRequest( connection, *request )
+      response_body = response.read()
+      with self._lock:
+        self._last_activity = monotonic()
+    except BaseException as error:
+      connection.close()
+      if cancellation.Cancelled():
+        raise CancelledError() from error
+      raise
+    finally:
+      cancellation._Detach()
+
+    if response.will_close:
+      connection.close()
+    else:
+      self._Release( generation, origin, connection )
+
+    return MakeResponse( url,
+                         response.status,
+                         response.reason,
+                         response.headers,
+                         response_body )
+
+
+  def Reset( self ):
+    """Closes the idle connections. Must be called when the server is restarted.
+    Connections in use at that time are closed instead of being given back to
+    the pool."""
+    with self._lock:
+      idle_connections = self._idle_connections
+      self._idle_connections = []
+      self._generation += 1
+
+    for _, connection in idle_connections:
+      connection.close()
+
+
+  def SetUnixSocket( self, path ):
+    """Connects to the server through the Unix domain socket |path| or over
+    TCP if |path| is None."""
+    with self._lock:
+      self._unix_socket = path
+
+
+  def UnixSocketUnsupported( self ):
+    """Whether a server was reachable over TCP but not through the Unix
+    domain socket it was given, i.e. it doesn't support them."""
+    with self._lock:
+      return self._unix_socket_unsupported
+
+
+  def LastActivity( self ):
+    """Returns the time, as given by time.monotonic, at which the last response
+    was received from the server, or None if there was none yet."""
+    with self._lock:
+      return self._last_activity
+
+
+  def Stats( self ):
+    with self._lock:
+      return {
+        'transport': 'unix' if self._unix_socket else 'tcp',
+        'opened': self._opened,
+        'reused': self._reused,
+        'reconnected': self._reconnected,
+        'idle': len( self._idle_connections )
+      }
+
+
+  def _Acquire( self, origin, timeout ):
+    while True:
+      with self._lock:
+        generation = self._generation
+        if not self._idle_connections:
+          break
+        # Take the most recently used connection; it is the least likely to have
+        # been closed by the server.
+        connection_origin, connection = self._idle_connections.pop()
+
+      if connection_origin != origin or _ConnectionDropped( connection ):
+        connection.close()
+        continue
+
+      connection.sock.settimeout( timeout )
+      with self._lock:
+        self._reused += 1
+      return generation, connection, True
+
+    return generation, self._Connect( origin, timeout ), False
+
+
+  def _Connect( self, origin, timeout ):
+    with self._lock:
+      unix_socket = self._unix_socket
+    if unix_socket is None:
+      connection = _ConnectTcp( origin, timeout )
+    else:
+      try:
+        connection = _ConnectUnix( unix_socket, origin, timeout )
+      except URLError:
+        # Only stop using the socket if the server is otherwise reachable;
+        # otherwise it may simply not be started yet.
+        connection = _ConnectTcp( origin, timeout )
+        self._DisableUnixSocket( unix_socket )
+    with self._lock:
+      self._opened += 1
+    return connection
+
+
+  def _DisableUnixSocket( self, path ):
+    with self._lock:
+      self._unix_socket_unsupported = True
+      if self._unix_socket == path:
+        self._unix_socket = None
+
+
+  def _Reconnect( self, connection, origin, timeout ):
+    connection.close()
+    with self._lock:
+      self._reconnected += 1
+    return self._Connect( origin, timeout )
+
+
+  def _Release( self, generation, origin, connection ):
+    with self._lock:
+      if ( generation == self._generation and
+           len( self._idle_connections ) < self._max_idle_connections ):
+        self._idle_connections.append( ( origin, connection ) )
+        return
+    connection.close()
+
+
+def _ParseUrl( url ):
+  parsed_url = urlparse( url )
+  origin = ( parsed_url.hostname, parsed_url.port )
+  selector = parsed_url.path
+  if parsed_url.query:
+    selector += '?' + parsed_url.query
+  return origin, selector
+
+
+def MakeResponse( url, status, reason, headers, body ):
+  """Returns a response object like the ones returned by urlopen or raises
+  HTTPError if |status| is an error status code."""
+  if status >= 400:
+    raise HTTPError( url, status, reason, headers, BytesIO( body ) )
+  return addinfourl( BytesIO( body ), headers, url, status )
+
+
+def _ConnectTcp( origin, timeout ):
+  host, port = origin
+  connection = _Open( HTTPConnection( host, port, timeout = timeout ) )
+  # Requests and responses are small and latency matters more than throughput.
+  connection.sock.setsockopt( socket.IPPROTO_TCP, socket.TCP_NODELAY, 1 )
+  return connection
+
+
+def _ConnectUnix( path, origin, timeout ):
+  host, port = origin
+  return _Open( UnixHTTPConnection( path, host, port, timeout = timeout ) )
+
+
+def _Open( connection ):
+  try:
+    connection.connect()
+  except OSError as error:
+    connection.close()
+    raise URLError( error )
+  return connection
+
+
+def _SendRequest( connection, method, selector, body, headers ):
+  connection.request( method, selector, body = body, headers = headers )
+  return connection.getresponse()
+
+
+def _ConnectionDropped( connection ):
+  """An idle connection is readable only if the server closed it (or sent
+  unexpected data), in which case it can't be used anymore."""
+  sock = connection.sock
+  if sock is None:
+    return True
+  try:
+    if hasattr( select, 'poll' ):
+      poller = select.poll()
+      poller.register( sock, select.POLLIN )
+      return bool( poller.poll( 0 ) )
+    return bool( select.select( [ sock ], [], [], 0 )[ 0 ] )
+  except ( OSError, ValueError ):
+    return True
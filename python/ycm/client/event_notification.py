@@ -19,11 +19,16 @@ from ycm.client.base_request import BaseRequest, BuildRequestData
 
 
 class EventNotification( BaseRequest ):
-  def __init__( self, event_name, buffer_number = None, extra_data = None ):
+  def __init__( self,
+                event_name,
+                buffer_number = None,
+                extra_data = None,
+                server = None ):
     super( EventNotification, self ).__init__()
     self._event_name = event_name
     self._buffer_number = buffer_number
     self._extra_data = extra_data
+    self._server = server
     self._response_future = None
     self._cached_response = None
 
@@ -35,7 +40,8 @@ class EventNotification( BaseRequest ):
     request_data[ 'event_name' ] = self._event_name
 
     self._response_future = self.PostDataToHandlerAsync( request_data,
-                                                         'event_notification' )
+                                                         'event_notification',
+                                                         server = self._server )
 
 
   def Done( self ):
@@ -57,6 +63,7 @@ class EventNotification( BaseRequest ):
 
 def SendEventNotificationAsync( event_name,
                                 buffer_number = None,
-                                extra_data = None ):
-  event = EventNotification( event_name, buffer_number, extra_data )
+                                extra_data = None,
+                                server = None ):
+  event = EventNotification( event_name, buffer_number, extra_data, server )
   event.Start()
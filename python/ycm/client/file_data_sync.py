@@ -0,0 +1,161 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+import hashlib
+import threading
+from collections import OrderedDict
+from urllib.error import HTTPError
+from ycm.buffer_data_cache import MAX_ENTRIES
+
+# Response header through which the server lists the protocol extensions it
+# supports, separated by commas.
+EXTENSIONS_HEADER = 'x-ycm-extensions'
+FILE_DATA_VERSIONS_EXTENSION = 'file-data-versions'
+
+# Status returned by the server when it receives a file_data entry without
+# contents whose version it doesn't know.
+HTTP_CONFLICT = 409
+# Number of files whose version is remembered, as many as the buffers whose
+# contents are cached.
+MAX_VERSIONS = MAX_ENTRIES
+
+
+class FileDataSync:
+  """Avoids sending the contents of the same buffers over and over. Each entry
+  of the file_data field is tagged with a version, a hash of its contents. Once
+  a request has succeeded, the server is known to have these versions and
+  subsequent requests only send the version of the files that didn't change
+  since then. If the server doesn't recognize a version (e.g. it evicted the
+  file from its cache), it replies with a 409 status and the request is sent
+  again with all the contents.
+
+  This is only enabled if the server advertises the extension in the
+  x-ycm-extensions header of its responses. Otherwise, requests are sent as
+  is."""
+
+  def __init__( self ):
+    self._lock = threading.Lock()
+    self._enabled = False
+    self._acknowledged_versions = {}
+    self._versions = OrderedDict()
+    self._hashed = 0
+    self._sent = 0
+    self._skipped = 0
+    self._resynced = 0
+
+
+  def Send( self, data, send ):
+    """Calls |send| with the request |data|, or a copy of it where the contents
+    known by the server are left out, and returns its response. |send| must
+    raise HTTPError on error status codes."""
+    if not self._enabled or not data or 'file_data' not in data:
+      return self.Receive( send( data ) )
+
+    versions = { filepath: self._Version( filepath, file_data )
+                 for filepath, file_data in data[ 'file_data' ].items() }
+    try:
+      response = send( self._VersionedData( data,
+                                            versions,
+                                            skip_known = True ) )
+    except HTTPError as error:
+      if error.code != HTTP_CONFLICT:
+        raise
+      error.close()
+      with self._lock:
+        self._acknowledged_versions.clear()
+        self._resynced += 1
+      response = send( self._VersionedData( data,
+                                            versions,
+                                            skip_known = False ) )
+
+    with self._lock:
+      self._acknowledged_versions.update( versions )
+    return self.Receive( response )
+
+
+  def Receive( self, response ):
+    """Enables the protocol if the server supports it. Returns |response|."""
+    self._enabled = FILE_DATA_VERSIONS_EXTENSION in ServerExtensions( response )
+    return response
+
+
+  def Reset( self ):
+    """Forgets everything about the server. Must be called when the server is
+    restarted."""
+    with self._lock:
+      self._enabled = False
+      self._acknowledged_versions.clear()
+
+
+  def Stats( self ):
+    with self._lock:
+      return {
+        'enabled': self._enabled,
+        'hashed': self._hashed,
+        'sent': self._sent,
+        'skipped': self._skipped,
+        'resynced': self._resynced
+      }
+
+
+  def _Version( self, filepath, file_data ):
+    """Returns the version of the contents in |file_data|. The file data of a
+    buffer comes from vimsupport.BUFFER_DATA_CACHE, which returns the same
+    dictionary as long as the changedtick of the buffer doesn't change, so
+    contents are only hashed when their buffer changed."""
+    with self._lock:
+      known = self._versions.get( filepath )
+      if known is not None and known[ 0 ] is file_data:
+        self._versions.move_to_end( filepath )
+        return known[ 1 ]
+
+    version = hashlib.blake2b( file_data[ 'contents' ].encode( 'utf-8' ),
+                               digest_size = 16 ).hexdigest()
+    with self._lock:
+      self._hashed += 1
+      self._versions[ filepath ] = ( file_data, version )
+      self._versions.move_to_end( filepath )
+      while len( self._versions ) > MAX_VERSIONS:
+        self._versions.popitem( last = False )
+    return version
+
+
+  def _VersionedData( self, data, versions, skip_known ):
+    file_data = {}
+    with self._lock:
+      for filepath, buffer_data in data[ 'file_data' ].items():
+        version = versions[ filepath ]
+        if ( skip_known and
+             self._acknowledged_versions.get( filepath ) == version ):
+          file_data[ filepath ] = { 'filetypes': buffer_data[ 'filetypes' ],
+                                    'version': version }
+          self._skipped += 1
+        else:
+          file_data[ filepath ] = dict( buffer_data, version = version )
+          self._sent += 1
+
+    versioned_data = dict( data )
+    versioned_data[ 'file_data' ] = file_data
+    return versioned_data
+
+
+def ServerExtensions( response ):
+  """Returns the set of protocol extensions advertised by the server in
+  |response|."""
+  extensions = response.headers.get( EXTENSIONS_HEADER, '' )
+  return { extension.strip() for extension in extensions.split( ',' )
+           if extension.strip() }
@@ -33,8 +33,10 @@ class InlayHintsRequest( BaseRequest ):
 
 
   def Start( self ):
-    self._response_future = self.PostDataToHandlerAsync( self.request_data,
-                                                         'inlay_hints' )
+    self._response_future = self.PostDataToHandlerAsync(
+      self.request_data,
+      'inlay_hints',
+      cancellation = self._NewCancellation( 'inlay_hints' ) )
 
   def Done( self ):
     return bool( self._response_future ) and self._response_future.done()
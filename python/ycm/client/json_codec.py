@@ -0,0 +1,119 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Encoding and decoding of the JSON bodies of the requests to the server and
+of its responses. Uses the fastest JSON library available in the Python
+interpreter Vim is linked against: orjson, then ujson, then the standard
+library."""
+
+import json
+
+
+class _StandardCodec:
+  name = 'json'
+
+
+  @staticmethod
+  def Dumps( data ):
+    return json.dumps( data ).encode( 'utf-8' )
+
+
+  @staticmethod
+  def Loads( text ):
+    return json.loads( text )
+
+
+class _OrjsonCodec:
+  name = 'orjson'
+
+
+  def __init__( self, orjson ):
+    self._orjson = orjson
+    # Like the standard library, convert integer keys to strings.
+    self._options = orjson.OPT_NON_STR_KEYS
+
+
+  def Dumps( self, data ):
+    try:
+      return self._orjson.dumps( data, option = self._options )
+    except TypeError:
+      # Some values (e.g. integers larger than 64 bits) are only supported by
+      # the standard library.
+      return _StandardCodec.Dumps( data )
+
+
+  def Loads( self, text ):
+    return self._orjson.loads( text )
+
+
+class _UjsonCodec:
+  name = 'ujson'
+
+
+  def __init__( self, ujson ):
+    self._ujson = ujson
+
+
+  def Dumps( self, data ):
+    try:
+      return self._ujson.dumps( data, ensure_ascii = False ).encode( 'utf-8' )
+    except ( TypeError, OverflowError ):
+      return _StandardCodec.Dumps( data )
+
+
+  def Loads( self, text ):
+    return self._ujson.loads( text )
+
+
+def _FindCodec():
+  try:
+    import orjson
+    return _OrjsonCodec( orjson )
+  except ImportError:
+    pass
+  try:
+    import ujson
+    return _UjsonCodec( ujson )
+  except ImportError:
+    pass
+  return _StandardCodec()
+
+
+# The library is only imported when the first request is sent, rather than
+# when Vim starts.
+_codec = None
+
+
+def _Codec():
+  global _codec
+  if _codec is None:
+    _codec = _FindCodec()
+  return _codec
+
+
+def Dumps( data ):
+  """Returns |data| encoded as UTF-8 JSON bytes."""
+  return _Codec().Dumps( data )
+
+
+def Loads( text ):
+  """Decodes the JSON document |text|, given as bytes or str."""
+  return _Codec().Loads( text )
+
+
+def Name():
+  return _Codec().name
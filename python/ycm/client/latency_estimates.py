@@ -0,0 +1,73 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+import threading
+
+# Weights given to the last sample in the moving averages of the response time
+# and of its deviation. Same values as the TCP retransmission timer (RFC 6298).
+_MEAN_GAIN = 1 / 8
+_DEVIATION_GAIN = 1 / 4
+
+
+class LatencyEstimates:
+  """Keeps an exponentially weighted moving average of the time the server
+  takes to respond, and of its mean deviation, for each kind of request. Used
+  to poll for a response around the time it is expected to arrive rather than
+  at a fixed interval. Thread-safe: samples are recorded from the executor
+  threads."""
+
+  def __init__( self ):
+    self._lock = threading.Lock()
+    # Map from kind to a [ mean, deviation, samples ] list. Times are in
+    # seconds.
+    self._estimates = {}
+
+
+  def Record( self, kind, seconds ):
+    with self._lock:
+      estimate = self._estimates.get( kind )
+      if estimate is None:
+        self._estimates[ kind ] = [ seconds, seconds / 2, 1 ]
+        return
+      mean, deviation, samples = estimate
+      deviation += _DEVIATION_GAIN * ( abs( seconds - mean ) - deviation )
+      mean += _MEAN_GAIN * ( seconds - mean )
+      self._estimates[ kind ] = [ mean, deviation, samples + 1 ]
+
+
+  def FirstPollDelay( self, kind ):
+    """Returns the time in seconds after which the response to a request of
+    kind |kind| should be polled for the first time, or None if no response
+    was received yet. That's a bit before its expected arrival so that a
+    faster than usual response isn't delayed much."""
+    with self._lock:
+      estimate = self._estimates.get( kind )
+    if estimate is None:
+      return None
+    mean, deviation, _ = estimate
+    return max( 0, mean - deviation )
+
+
+  def Stats( self ):
+    """Returns the mean and deviation, in milliseconds, and the number of
+    samples of each estimate."""
+    with self._lock:
+      return { kind: { 'mean': round( mean * 1000 ),
+                       'deviation': round( deviation * 1000 ),
+                       'samples': samples }
+               for kind, ( mean, deviation, samples )
+               in self._estimates.items() }
@@ -24,6 +24,9 @@ _logger = logging.getLogger( __name__ )
 
 # Looooong poll
 TIMEOUT_SECONDS = 60
+# Extension through which the server accepts a single poll for the messages of
+# several filetypes.
+MULTIPLEXED_MESSAGES_EXTENSION = 'multiplexed-messages'
 
 
 class MessagesPoll( BaseRequest ):
@@ -70,6 +73,81 @@ class MessagesPoll( BaseRequest ):
     return False
 
 
+class MultiplexedMessagesPoll( BaseRequest ):
+  """Polls for the messages of all the filetypes subscribed to with a single
+  long-poll, rather than one per filetype like MessagesPoll, if the server
+  supports the multiplexed-messages extension. The request only lists the
+  subscriptions, a filetype and a file of that filetype each, instead of the
+  contents of a buffer. The server replies with the messages and diagnostics
+  of all these filetypes, and the filetypes it won't send messages for, e.g.:
+
+    {
+      "messages": [ { "filepath": "/foo.java", "diagnostics": [ ... ] } ],
+      "unsubscribed": [ "python" ]
+    }
+
+  Diagnostics are routed to their buffer through their filepath. When
+  a filetype is subscribed to while a poll is in progress, it's only part of the
+  next poll: the server takes the messages off its queue when it replies, so
+  those of a cancelled poll would be lost."""
+
+  def __init__( self ):
+    super( MultiplexedMessagesPoll, self ).__init__()
+    self._subscriptions = {}
+    self._unsubscribed = set()
+    self._response_future = None
+
+
+  def Subscribe( self, filetype, filepath ):
+    if filetype not in self._unsubscribed:
+      self._subscriptions.setdefault( filetype, filepath )
+
+
+  def Polling( self, filetype ):
+    return filetype in self._subscriptions
+
+
+  def _SendRequest( self ):
+    self._response_future = self.PostDataToHandlerAsync(
+      { 'subscriptions': [ { 'filetype': filetype, 'filepath': filepath }
+                           for filetype, filepath
+                           in sorted( self._subscriptions.items() ) ] },
+      'receive_messages',
+      timeout = TIMEOUT_SECONDS,
+      cancellation = self._NewCancellation( 'receive_messages' ) )
+
+
+  def _Unsubscribe( self, filetypes ):
+    for filetype in filetypes:
+      self._subscriptions.pop( filetype, None )
+      self._unsubscribed.add( filetype )
+
+
+  def Poll( self, diagnostics_handler ):
+    """This should be called regularly to check for new messages. Returns True
+    if Poll should be called again in a while, i.e. while some filetypes are
+    polled."""
+    if self._response_future is not None and self._response_future.done():
+      response = self.HandleFuture( self._response_future,
+                                    display_message = False )
+      self._response_future = None
+      if not isinstance( response, dict ):
+        # Server returned an exception or doesn't want to be polled anymore.
+        self._Unsubscribe( list( self._subscriptions ) )
+      else:
+        _HandlePollResponse( response.get( 'messages', True ),
+                             diagnostics_handler )
+        self._Unsubscribe( response.get( 'unsubscribed', [] ) )
+
+    if not self._subscriptions:
+      self.Cancel()
+      return False
+
+    if self._response_future is None:
+      self._SendRequest()
+    return True
+
+
 def _HandlePollResponse( response, diagnostics_handler ):
   if isinstance( response, list ):
     for notification in response:
@@ -15,12 +15,14 @@
 # You should have received a copy of the GNU General Public License
 # along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
 
+from ycm.client.base_request import NewRequestTimer
 from ycm.client.completion_request import CompletionRequest
 
 
 class OmniCompletionRequest( CompletionRequest ):
   def __init__( self, omni_completer, request_data ):
-    super( OmniCompletionRequest, self ).__init__( request_data )
+    super( OmniCompletionRequest, self ).__init__(
+      request_data, NewRequestTimer( 'omnifunc' ) )
     self._omni_completer = omni_completer
 
 
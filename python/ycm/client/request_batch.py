@@ -0,0 +1,206 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+from concurrent.futures import CancelledError, Future
+from http.client import HTTPMessage
+from urllib.error import HTTPError
+
+from ycm.client import json_codec
+from ycm.client.connection_pool import MakeResponse
+
+# Extension advertised by servers that accept several requests in a single POST
+# to the batch handler. The body of that request is
+#
+#   {
+#     "file_data": { ... },
+#     "requests": [
+#       { "method": "POST", "handler": "event_notification", "data": { ... },
+#         "request_id": 42 },
+#       { "method": "GET", "handler": "signature_help_available",
+#         "payload": { "subserver": "cpp" } },
+#       ...
+#     ]
+#   }
+#
+# where the optional top-level file_data is used for the POST requests whose
+# data has none. The response is a list with the status, headers and body of
+# each request, in the same order:
+#
+#   [ { "status": 200, "headers": { "x-ycm-hmac": "..." }, "body": "..." },
+#     ... ]
+#
+# The batch response is signed like any other and each body is signed like the
+# response of the request sent on its own would be.
+BATCH_EXTENSION = 'batch'
+BATCH_HANDLER = 'batch'
+
+
+class BatchedRequest:
+  """A request waiting in a batch. Its future is resolved with a response
+  object, or an exception, like the futures of the requests sent on their
+  own."""
+
+  def __init__( self,
+                method,
+                handler,
+                data,
+                payload,
+                timeout,
+                cancellation,
+                priority ):
+    self.method = method
+    self.handler = handler
+    self.data = data
+    self.payload = payload
+    self.timeout = timeout
+    self.cancellation = cancellation
+    self.priority = priority
+    self.future = Future()
+
+
+  def Start( self ):
+    """Returns False if the request shouldn't be sent because it was cancelled
+    in the meantime."""
+    if not self.future.set_running_or_notify_cancel():
+      return False
+    if self.cancellation is not None and self.cancellation.Cancelled():
+      self.SetException( CancelledError() )
+      return False
+    return True
+
+
+  def SetResponse( self, response ):
+    if self.cancellation is not None:
+      self.cancellation.Finish()
+      if self.cancellation.Cancelled():
+        self.future.set_exception( CancelledError() )
+        return
+    self.future.set_result( response )
+
+
+  def SetException( self, exception ):
+    if self.cancellation is not None:
+      self.cancellation.Finish()
+    self.future.set_exception( exception )
+
+
+class RequestBatch:
+  """Collects the requests issued while handling a single Vim event so that
+  they are sent together. The request data of each buffer is also built only
+  once for all of them. Batches can be nested; the requests are sent when the
+  outermost one is closed."""
+
+  def __init__( self ):
+    self._depth = 0
+    self._requests = []
+    self._request_data = {}
+
+
+  def Open( self ):
+    self._depth += 1
+
+
+  def Close( self ):
+    """Returns True if this closed the outermost batch."""
+    self._depth -= 1
+    return self._depth == 0
+
+
+  def RequestData( self, buffer_number, build ):
+    """Returns a copy of the request data for |buffer_number|, calling |build|
+    to create it the first time. The file_data of the copies is shared."""
+    if buffer_number not in self._request_data:
+      self._request_data[ buffer_number ] = build()
+    return dict( self._request_data[ buffer_number ] )
+
+
+  def Add( self, request ):
+    self._requests.append( request )
+    return request.future
+
+
+  def Contains( self, future ):
+    return any( request.future is future for request in self._requests )
+
+
+  def TakeRequests( self ):
+    requests = self._requests
+    self._requests = []
+    return requests
+
+
+def BatchBody( requests ):
+  """Returns the data to send to the batch handler for |requests|. The file_data
+  shared by several requests is only sent once."""
+  shared_file_data = None
+  for request in requests:
+    if request.method == 'POST' and request.data and request.data.get(
+        'file_data' ) is not None:
+      shared_file_data = request.data[ 'file_data' ]
+      break
+
+  body = {}
+  if shared_file_data is not None:
+    body[ 'file_data' ] = shared_file_data
+  body[ 'requests' ] = [ _BatchItem( request, shared_file_data )
+                         for request in requests ]
+  return body
+
+
+def SplitBatchResponse( url, response, count, validate ):
+  """Returns the response object of each of the |count| requests of a batch
+  from the |response| of the batch handler, or the HTTPError raised for it.
+  |validate| is called with the response and its text and raises if the
+  response doesn't come from the server; the statuses and headers of the items
+  are only trusted after that."""
+  response_text = response.read()
+  validate( response, response_text )
+  response.close()
+  items = json_codec.Loads( response_text )
+  if len( items ) != count:
+    raise RuntimeError( f'Received { len( items ) } responses '
+                        f'for a batch of { count } requests!' )
+  return [ _ItemResponse( url, item ) for item in items ]
+
+
+def _BatchItem( request, shared_file_data ):
+  item = { 'method': request.method, 'handler': request.handler }
+  if request.method == 'POST':
+    data = request.data
+    if data and data.get( 'file_data' ) is shared_file_data:
+      data = { key: value for key, value in data.items()
+               if key != 'file_data' }
+    item[ 'data' ] = data
+  elif request.payload:
+    item[ 'payload' ] = request.payload
+  if request.cancellation is not None:
+    item[ 'request_id' ] = request.cancellation.request_id
+  return item
+
+
+def _ItemResponse( url, item ):
+  headers = HTTPMessage()
+  for name, value in item.get( 'headers', {} ).items():
+    headers[ name ] = value
+  try:
+    return MakeResponse( url,
+                         item[ 'status' ],
+                         item.get( 'reason', '' ),
+                         headers,
+                         item.get( 'body', '' ).encode( 'utf-8' ) )
+  except HTTPError as error:
+    return error
@@ -0,0 +1,163 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+import threading
+from collections import deque
+from contextlib import contextmanager
+from time import monotonic
+from ycm import tracing
+
+# The phases of a request, in the order they happen:
+#  - build: building the request data from the Vim buffers;
+#  - queue: waiting for an executor thread;
+#  - encode: encoding the request data to JSON;
+#  - http: sending the request and reading the response, server time included;
+#  - server: computing the response, if the server reports it in the
+#    Server-Timing header;
+#  - decode: validating and decoding the response;
+#  - response: from the start of the request to its response being ready;
+#  - poll: waiting for Vim to pick up the response;
+#  - convert: converting the response for Vim;
+#  - complete: displaying the completion menu;
+#  - total: from the start of the request to the use of its response.
+PHASES = [ 'build', 'queue', 'encode', 'http', 'server', 'decode', 'response',
+           'poll', 'convert', 'complete', 'total' ]
+PERCENTILES = [ 50, 95, 99 ]
+# Number of samples kept for each handler, filetype and phase. Older samples
+# are dropped.
+MAX_SAMPLES = 1000
+
+
+class RequestTimings:
+  """Keeps the latest samples of the time taken by each phase of the requests,
+  by handler and filetype. Thread-safe: most phases are timed on the executor
+  threads."""
+
+  def __init__( self, max_samples = MAX_SAMPLES ):
+    self._max_samples = max_samples
+    self._lock = threading.Lock()
+    self._samples = {}
+
+
+  def Record( self, handler, filetype, phase, seconds ):
+    key = ( handler, filetype, phase )
+    with self._lock:
+      samples = self._samples.get( key )
+      if samples is None:
+        samples = self._samples[ key ] = deque( maxlen = self._max_samples )
+      samples.append( seconds )
+
+
+  def Percentiles( self ):
+    """Returns a list of dictionaries with the handler, filetype, phase, number
+    of samples and the percentiles of the samples in milliseconds, sorted by
+    handler, filetype and phase."""
+    rows = []
+    for ( handler, filetype, phase ), samples in self._SortedSamples():
+      samples = sorted( samples )
+      row = { 'handler': handler,
+              'filetype': filetype,
+              'phase': phase,
+              'count': len( samples ) }
+      for percentile in PERCENTILES:
+        row[ f'p{ percentile }' ] = _Percentile( samples, percentile ) * 1000
+      rows.append( row )
+    return rows
+
+
+  def Samples( self ):
+    """Returns all the samples, in milliseconds and from oldest to newest, in
+    a form that can be serialized to JSON."""
+    return [ { 'handler': handler,
+               'filetype': filetype,
+               'phase': phase,
+               'samples': [ sample * 1000 for sample in samples ] }
+             for ( handler, filetype, phase ), samples
+             in self._SortedSamples() ]
+
+
+  def _SortedSamples( self ):
+    with self._lock:
+      samples = [ ( key, list( values ) )
+                  for key, values in self._samples.items() ]
+    return sorted( samples,
+                   key = lambda item: ( item[ 0 ][ 0 ],
+                                        item[ 0 ][ 1 ],
+                                        PHASES.index( item[ 0 ][ 2 ] ) ) )
+
+
+class RequestTimer:
+  """Times the phases of a single request and records them in a RequestTimings
+  object."""
+
+  def __init__( self, timings, handler, filetype = '' ):
+    self.handler = handler
+    self.filetype = filetype
+    self.start_time = monotonic()
+    self.queued_time = None
+    self.response_time = None
+    self._timings = timings
+
+
+  def Record( self, phase, seconds ):
+    self._timings.Record( self.handler, self.filetype, phase, seconds )
+
+
+  def RecordSince( self, phase, start_time ):
+    self.Record( phase, monotonic() - start_time )
+
+
+  def OnResponse( self ):
+    self.response_time = monotonic()
+    self.Record( 'response', self.response_time - self.start_time )
+
+
+  @contextmanager
+  def Time( self, phase ):
+    start_time = monotonic()
+    try:
+      with tracing.Span( f'{ self.handler } { phase }', tracing.REQUEST ):
+        yield
+    finally:
+      self.RecordSince( phase, start_time )
+
+
+def ServerTime( headers ):
+  """Returns the time in seconds the server spent on a request according to
+  the Server-Timing header of its response, e.g. "app;dur=12.5, db;dur=3", or
+  None if it didn't say."""
+  header = headers.get( 'server-timing' )
+  if not header:
+    return None
+  milliseconds = 0
+  found = False
+  for metric in header.split( ',' ):
+    for parameter in metric.split( ';' )[ 1: ]:
+      name, _, value = parameter.strip().partition( '=' )
+      if name == 'dur':
+        try:
+          milliseconds += float( value )
+          found = True
+        except ValueError:
+          pass
+  return milliseconds / 1000 if found else None
+
+
+def _Percentile( sorted_samples, percentile ):
+  # Nearest-rank method.
+  rank = max( 1, -( -len( sorted_samples ) * percentile // 100 ) )
+  return sorted_samples[ rank - 1 ]
@@ -0,0 +1,125 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import os
+import socket
+import threading
+from hmac import compare_digest
+
+# Time given to a new connection to authenticate itself.
+_AUTHENTICATION_TIMEOUT_SEC = 5
+_logger = logging.getLogger( __name__ )
+
+
+class ResponseNotifier:
+  """Tells Vim when a response has arrived so that it doesn't have to poll for
+  it. Vim connects to a local socket with ch_open and authenticates itself by
+  sending a random token followed by a newline. Then, each time a response
+  arrives, the name of the poller waiting for it is written, followed by a
+  newline, which runs the channel callback in Vim's main loop.
+
+  Only one channel is notified at a time: a new authenticated connection
+  replaces the previous one."""
+
+  def __init__( self ):
+    self.token = os.urandom( 16 ).hex()
+    self._lock = threading.Lock()
+    self._server = None
+    self._client = None
+    self._sent = 0
+
+
+  def Start( self ):
+    """Starts listening and returns the address Vim should connect to."""
+    self._server = socket.socket( socket.AF_INET, socket.SOCK_STREAM )
+    self._server.bind( ( '127.0.0.1', 0 ) )
+    self._server.listen( 1 )
+    thread = threading.Thread( target = self._AcceptConnections )
+    thread.daemon = True
+    thread.start()
+    host, port = self._server.getsockname()
+    return f'{ host }:{ port }'
+
+
+  def Stop( self ):
+    with self._lock:
+      server, self._server = self._server, None
+      client, self._client = self._client, None
+    for sock in ( server, client ):
+      if sock is not None:
+        sock.close()
+
+
+  def Connected( self ):
+    with self._lock:
+      return self._client is not None
+
+
+  def Notify( self, poller ):
+    """Wakes up the Vim poller named |poller|. Can be called from any
+    thread."""
+    with self._lock:
+      if self._client is None:
+        return
+      try:
+        self._client.sendall( f'{ poller }\n'.encode() )
+        self._sent += 1
+      except OSError:
+        _logger.info( 'Lost the response notification channel' )
+        self._client.close()
+        self._client = None
+
+
+  def Stats( self ):
+    with self._lock:
+      return { 'connected': self._client is not None, 'sent': self._sent }
+
+
+  def _AcceptConnections( self ):
+    while True:
+      server = self._server
+      if server is None:
+        return
+      try:
+        connection, _ = server.accept()
+      except OSError:
+        # The notifier was stopped.
+        return
+      if not self._Authenticate( connection ):
+        connection.close()
+        continue
+      with self._lock:
+        previous_client, self._client = self._client, connection
+      if previous_client is not None:
+        previous_client.close()
+
+
+  def _Authenticate( self, connection ):
+    expected = f'{ self.token }\n'.encode()
+    received = b''
+    try:
+      connection.settimeout( _AUTHENTICATION_TIMEOUT_SEC )
+      while len( received ) < len( expected ) and b'\n' not in received:
+        data = connection.recv( len( expected ) - len( received ) )
+        if not data:
+          return False
+        received += data
+      connection.settimeout( None )
+    except OSError:
+      return False
+    return compare_digest( received, expected )
@@ -33,8 +33,10 @@ class SemanticTokensRequest( BaseRequest ):
 
 
   def Start( self ):
-    self._response_future = self.PostDataToHandlerAsync( self.request_data,
-                                                         'semantic_tokens' )
+    self._response_future = self.PostDataToHandlerAsync(
+      self.request_data,
+      'semantic_tokens',
+      cancellation = self._NewCancellation( 'semantic_tokens' ) )
 
   def Done( self ):
     return bool( self._response_future ) and self._response_future.done()
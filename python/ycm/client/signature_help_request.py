@@ -38,8 +38,10 @@ class SignatureHelpRequest( BaseRequest ):
 
 
   def Start( self ):
-    self._response_future = self.PostDataToHandlerAsync( self.request_data,
-                                                         'signature_help' )
+    self._response_future = self.PostDataToHandlerAsync(
+      self.request_data,
+      'signature_help',
+      cancellation = self._NewCancellation( 'signature_help' ) )
 
 
   def Done( self ):
@@ -15,27 +15,93 @@
 # You should have received a copy of the GNU General Public License
 # along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
 
+import threading
 import time
-from threading import Thread
-from ycm.client.base_request import BaseRequest
+from ycm.client.base_request import BaseRequest, PRIORITY_BACKGROUND
+
+# A ping taking longer than this means that the server is overloaded or stuck
+# on something.
+_SLOW_PING_SECONDS = 1
+# Don't wait for a wedged server as long as for a regular request.
+_PING_TIMEOUT_SECONDS = 10
 
 
 # This class can be used to keep the ycmd server alive for the duration of the
 # life of the client. By default, ycmd shuts down if it doesn't see a request in
-# a while.
+# a while. The server is only pinged when no response was received from it for
+# the whole ping interval: any other request already keeps it alive. The time
+# taken by the pings tells whether the server is responsive.
 class YcmdKeepalive:
   def __init__( self, ping_interval_seconds = 60 * 10 ):
-    self._keepalive_thread = Thread( target = self._ThreadMain )
+    self._keepalive_thread = threading.Thread( target = self._ThreadMain )
     self._keepalive_thread.daemon = True
     self._ping_interval_seconds = ping_interval_seconds
+    self._lock = threading.Lock()
+    self._last_ping = time.monotonic()
+    self._pings = 0
+    self._skipped = 0
+    self._failed = False
+    self._round_trip_time = None
 
 
   def Start( self ):
     self._keepalive_thread.start()
 
 
+  def Stats( self ):
+    """Returns the number of pings sent and skipped thanks to other requests,
+    the round-trip time in milliseconds of the last ping, and the status of the
+    server according to it: "unknown" (no ping yet), "healthy", "slow" or
+    "unresponsive"."""
+    with self._lock:
+      if self._failed:
+        status = 'unresponsive'
+      elif self._round_trip_time is None:
+        status = 'unknown'
+      elif self._round_trip_time > _SLOW_PING_SECONDS:
+        status = 'slow'
+      else:
+        status = 'healthy'
+      return {
+        'pings': self._pings,
+        'skipped': self._skipped,
+        'round_trip_time': ( None if self._round_trip_time is None else
+                             round( self._round_trip_time * 1000 ) ),
+        'status': status
+      }
+
+
+  def _TimeUntilPing( self ):
+    idle_since = self._last_ping
+    last_activity = BaseRequest.ConnectionPool().LastActivity()
+    if last_activity is not None:
+      idle_since = max( idle_since, last_activity )
+    return idle_since + self._ping_interval_seconds - time.monotonic()
+
+
+  def _Ping( self ):
+    start_time = time.monotonic()
+    # This thread must not touch the request batch of the main thread.
+    healthy = BaseRequest.GetDataFromHandlerInBackground(
+      'healthy',
+      timeout = _PING_TIMEOUT_SECONDS,
+      priority = PRIORITY_BACKGROUND )
+    end_time = time.monotonic()
+    with self._lock:
+      self._last_ping = end_time
+      self._pings += 1
+      self._failed = not healthy
+      self._round_trip_time = None if not healthy else end_time - start_time
+
+
   def _ThreadMain( self ):
     while True:
-      time.sleep( self._ping_interval_seconds )
+      time.sleep( max( 0, self._TimeUntilPing() ) )
+
+      if self._TimeUntilPing() > 0:
+        # The server responded to another request in the meantime.
+        with self._lock:
+          self._skipped += 1
+        continue
 
-      BaseRequest().GetDataFromHandler( 'healthy', display_message = False )
+      self._Ping()
@@ -21,6 +21,7 @@ from ycm.client.base_request import BuildRequestData
 from ycm import vimsupport
 from ycm import text_properties as tp
 from ycm import scrolling_range as sr
+from ycm import tracing
 
 
 HIGHLIGHT_GROUP = {
@@ -31,7 +32,14 @@ HIGHLIGHT_GROUP = {
 REPORTED_MISSING_TYPES = set()
 
 
+# The text property types are defined when the first response is drawn, rather
+# than when Vim starts.
+_initialised = False
+
+
 def Initialise():
+  global _initialised
+  _initialised = True
   if vimsupport.VimIsNeovim():
     return False
 
@@ -67,6 +75,8 @@ class InlayHints( sr.ScrollingBufferRange ):
 
 
   def Clear( self ):
+    if not _initialised:
+      Initialise()
     types = [ 'YCM_INLAY_UNKNOWN', 'YCM_INLAY_PADDING' ] + [
       f'YCM_INLAY_{ prop_type }' for prop_type in HIGHLIGHT_GROUP.keys()
     ]
@@ -74,6 +84,7 @@ class InlayHints( sr.ScrollingBufferRange ):
     tp.ClearTextProperties( self._bufnr, prop_types = types )
 
 
+  @tracing.Traced( tracing.UI )
   def _Draw( self ):
     self.Clear()
 
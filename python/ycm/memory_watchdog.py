@@ -0,0 +1,132 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Measures the memory used by the ycmd server and by the processes it
+started, like the language servers, from /proc. The memory isn't measured on
+systems without /proc."""
+
+import os
+from time import monotonic
+
+PROC_DIRECTORY = '/proc'
+# Scanning /proc takes a few milliseconds so it's not done on every check.
+SAMPLE_INTERVAL_SECONDS = 30
+# A server that exceeds the limit right after being recycled isn't recycled
+# again and again.
+RECYCLE_INTERVAL_SECONDS = 600
+MEBIBYTE = 1024 * 1024
+
+# Indexes of the fields of /proc/<pid>/stat that follow the name of the
+# process, see proc(5).
+_PARENT_PID_FIELD = 1
+_RSS_PAGES_FIELD = 21
+
+
+def _ReadProcessStat( pid ):
+  """Returns the parent PID and the resident set size in bytes of the process
+  |pid|, or None if it exited."""
+  try:
+    with open( os.path.join( PROC_DIRECTORY, str( pid ), 'stat' ) ) as stat:
+      content = stat.read()
+  except OSError:
+    return None
+  # The name of the process is in parentheses and may contain anything.
+  fields = content.rpartition( ')' )[ 2 ].split()
+  try:
+    return ( int( fields[ _PARENT_PID_FIELD ] ),
+             int( fields[ _RSS_PAGES_FIELD ] ) * os.sysconf( 'SC_PAGE_SIZE' ) )
+  except ( IndexError, ValueError ):
+    return None
+
+
+def ProcessTreeMemory( pid ):
+  """Returns a dictionary of the resident set size in bytes of the process
+  |pid| and of each of its descendants, by PID, or None if it can't be
+  measured."""
+  if pid <= 0 or not os.path.isdir( PROC_DIRECTORY ):
+    return None
+  children = {}
+  memory = {}
+  for entry in os.listdir( PROC_DIRECTORY ):
+    if not entry.isdigit():
+      continue
+    stat = _ReadProcessStat( entry )
+    if stat is not None:
+      children.setdefault( stat[ 0 ], [] ).append( int( entry ) )
+      memory[ int( entry ) ] = stat[ 1 ]
+  if pid not in memory:
+    return None
+
+  tree = {}
+  pids = [ pid ]
+  while pids:
+    process = pids.pop()
+    if process not in tree:
+      tree[ process ] = memory[ process ]
+      pids.extend( children.get( process, [] ) )
+  return tree
+
+
+class MemoryWatchdog:
+  """Samples the memory used by the server regularly and decides when it must
+  be recycled. The server itself is recycled by the caller."""
+
+  def __init__( self, clock = monotonic ):
+    self._clock = clock
+    self._sample = None
+    self._sample_pid = None
+    self._sample_time = None
+    self._recycle_time = None
+    self._recycles = 0
+
+
+  def Recycles( self ):
+    return self._recycles
+
+
+  def Sample( self, pid ):
+    """Returns the memory used by the server |pid|, as returned by
+    ProcessTreeMemory, measured at most SAMPLE_INTERVAL_SECONDS ago. A server
+    started since, e.g. after a restart, is measured right away."""
+    now = self._clock()
+    if ( pid != self._sample_pid or
+         now - self._sample_time >= SAMPLE_INTERVAL_SECONDS ):
+      self._sample = ProcessTreeMemory( pid )
+      self._sample_pid = pid
+      self._sample_time = now
+    return self._sample
+
+
+  def ShouldRecycle( self, pid, limit_mb ):
+    """Returns whether the server |pid| and its descendants use more than
+    |limit_mb| mebibytes. Never the case if |limit_mb| is 0."""
+    if limit_mb <= 0:
+      return False
+    if ( self._recycle_time is not None and
+         self._clock() - self._recycle_time < RECYCLE_INTERVAL_SECONDS ):
+      return False
+    sample = self.Sample( pid )
+    return sample is not None and sum( sample.values() ) > limit_mb * MEBIBYTE
+
+
+  def OnRecycled( self ):
+    self._recycles += 1
+    self._recycle_time = self._clock()
+    # The next sample is the one of the new server.
+    self._sample = None
+    self._sample_pid = None
+    self._sample_time = None
@@ -17,27 +17,51 @@
 
 import os
 import sys
-import vim
 import re
 
 # Can't import these from setup.py because it makes nosetests go crazy.
 DIR_OF_CURRENT_SCRIPT = os.path.dirname( os.path.abspath( __file__ ) )
 DIR_OF_YCMD = os.path.join( DIR_OF_CURRENT_SCRIPT, '..', '..', 'third_party',
                             'ycmd' )
+PATH_TO_PYTHON_USED_DURING_BUILD = os.path.join( DIR_OF_YCMD,
+                                                 'PYTHON_USED_DURING_BUILDING' )
 WIN_PYTHON_PATH = os.path.join( sys.exec_prefix, 'python.exe' )
 PYTHON_BINARY_REGEX = re.compile(
   r'python(3(\.[6-9])?)?(.exe)?$', re.IGNORECASE )
 
 
-# Not caching the result of this function; users shouldn't have to restart Vim
-# after running the install script or setting the
-# `g:ycm_server_python_interpreter` option.
-def PathToPythonInterpreter():
+# Users shouldn't have to restart Vim after running the install script or
+# setting the `g:ycm_server_python_interpreter` option, so the result of this
+# function is only cached on disk, with |use_cache|, until one of them changes.
+# The value of that option is given by the caller since this function may be
+# called outside of the main thread, where Vim can't be called.
+def PathToPythonInterpreter( python_interpreter, use_cache = False ):
+  if not use_cache:
+    return _FindPythonInterpreter( python_interpreter )
+
+  from ycmd import utils
+  from ycm.persistent_cache import FileStamp, PersistentCache
+
+  cache = PersistentCache( 'python_interpreter' )
+  cache_key = [ python_interpreter,
+                FileStamp( PATH_TO_PYTHON_USED_DURING_BUILD ),
+                os.environ.get( 'PATH' ),
+                sys.executable ]
+  cached_interpreter = cache.Get( cache_key )
+  # The interpreter may have been removed since.
+  if cached_interpreter and utils.GetExecutable( cached_interpreter ):
+    return cached_interpreter
+
+  python_interpreter = _FindPythonInterpreter( python_interpreter )
+  cache.Set( cache_key, python_interpreter )
+  return python_interpreter
+
+
+def _FindPythonInterpreter( python_interpreter ):
   # Not calling the Python interpreter to check its version as it significantly
   # impacts startup time.
   from ycmd import utils
 
-  python_interpreter = vim.eval( 'g:ycm_server_python_interpreter' )
   if python_interpreter:
     python_interpreter = utils.FindExecutable( python_interpreter )
     if python_interpreter:
@@ -73,8 +97,7 @@ def _PathToPythonUsedDuringBuild():
   from ycmd import utils
 
   try:
-    filepath = os.path.join( DIR_OF_YCMD, 'PYTHON_USED_DURING_BUILDING' )
-    return utils.ReadFile( filepath ).strip()
+    return utils.ReadFile( PATH_TO_PYTHON_USED_DURING_BUILD ).strip()
   except OSError:
     return None
 
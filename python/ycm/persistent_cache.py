@@ -0,0 +1,121 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Small caches kept on disk between Vim instances, for the results of the
+work done at each start that only depends on the configuration, like the
+options or the path to the Python interpreter (see g:ycm_startup_cache).
+
+Values are looked up by a key made of everything they depend on, like the
+modification times of the files they were read from, so that they are never
+used after a change to these. Each cache only keeps its most recent values."""
+
+import hashlib
+import json
+import logging
+import os
+from ycmd import utils
+
+# Changed when the cached values are computed differently.
+CACHE_VERSION = 1
+MAX_ENTRIES = 8
+
+_logger = logging.getLogger( __name__ )
+
+
+def FileStamp( filepath ):
+  """Returns what changes when the file |filepath| is modified, to use in
+  keys, or None if it doesn't exist."""
+  try:
+    status = os.stat( filepath )
+  except OSError:
+    return None
+  return [ status.st_mtime_ns, status.st_size ]
+
+
+def _CacheDirectory():
+  if utils.OnWindows():
+    base_directory = ( os.environ.get( 'LOCALAPPDATA' ) or
+                       os.path.expanduser( '~' ) )
+  else:
+    base_directory = ( os.environ.get( 'XDG_CACHE_HOME' ) or
+                       os.path.join( os.path.expanduser( '~' ), '.cache' ) )
+  return os.path.join( base_directory, 'ycm' )
+
+
+def _Digest( key ):
+  data = json.dumps( [ CACHE_VERSION, key ], sort_keys = True )
+  return hashlib.sha256( data.encode( 'utf-8' ) ).hexdigest()
+
+
+class PersistentCache:
+  """Cache stored in the file |name|.json of the cache directory of the user.
+  Keys and values must be serializable to JSON. Errors while reading or
+  writing the file are logged and the cache then behaves as if it was
+  empty."""
+
+  def __init__( self, name ):
+    self._name = name
+
+
+  def Get( self, key ):
+    """Returns the value cached for |key|, or None."""
+    digest = _Digest( key )
+    for entry_digest, value in self._Read():
+      if entry_digest == digest:
+        return value
+    return None
+
+
+  def Set( self, key, value ):
+    digest = _Digest( key )
+    entries = [ entry for entry in self._Read() if entry[ 0 ] != digest ]
+    entries.append( [ digest, value ] )
+    self._Write( entries[ -MAX_ENTRIES : ] )
+
+
+  def _Path( self ):
+    return os.path.join( _CacheDirectory(), self._name + '.json' )
+
+
+  def _Read( self ):
+    try:
+      with open( self._Path() ) as cache_file:
+        entries = json.load( cache_file )
+    except FileNotFoundError:
+      return []
+    except ( OSError, ValueError ):
+      _logger.exception( 'Unable to read the %s cache', self._name )
+      return []
+    return entries if isinstance( entries, list ) else []
+
+
+  def _Write( self, entries ):
+    path = self._Path()
+    # The cache is replaced at once so that other Vim instances never read it
+    # half-written.
+    temporary_path = f'{ path }.{ os.getpid() }'
+    try:
+      os.makedirs( os.path.dirname( path ), mode = 0o700, exist_ok = True )
+      descriptor = os.open( temporary_path,
+                            os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+                            0o600 )
+      with open( descriptor, 'w' ) as cache_file:
+        json.dump( entries, cache_file )
+      os.replace( temporary_path, path )
+    except OSError:
+      _logger.exception( 'Unable to write the %s cache', self._name )
+      utils.RemoveIfExists( temporary_path )
@@ -17,7 +17,7 @@
 
 import abc
 
-from ycm import vimsupport
+from ycm import tracing, vimsupport
 
 
 class ScrollingBufferRange( object ):
@@ -33,13 +33,19 @@ class ScrollingBufferRange( object ):
     self._last_requested_range = None
 
 
+  @tracing.Traced( tracing.POLL )
   def Ready( self ):
     return self._request is not None and self._request.Done()
 
 
   def Request( self, force=False ):
     if self._request and not self.Ready():
-      return True
+      if self._tick == vimsupport.GetBufferChangedTick( self._bufnr ):
+        return True
+      # The buffer changed since the request was sent, so its response would be
+      # discarded anyway. Replace it by a request for the current contents.
+      self._request.Cancel()
+      force = True
 
     # Check to see if the buffer ranges would actually change anything visible.
     # This avoids a round-trip for every single line scroll event
@@ -71,6 +77,7 @@ class ScrollingBufferRange( object ):
     return True
 
 
+  @tracing.Traced( tracing.UI )
   def Update( self ):
     if not self._request:
       # Nothing to update
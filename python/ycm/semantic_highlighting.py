@@ -21,6 +21,7 @@ from ycm.client.base_request import BuildRequestData
 from ycm import vimsupport
 from ycm import text_properties as tp
 from ycm import scrolling_range as sr
+from ycm import tracing
 
 import vim
 
@@ -62,7 +63,14 @@ HIGHLIGHT_GROUP = {
 REPORTED_MISSING_TYPES = set()
 
 
+# The text property types are defined when the first response is drawn, rather
+# than when Vim starts.
+_initialised = False
+
+
 def Initialise():
+  global _initialised
+  _initialised = True
   if vimsupport.VimIsNeovim():
     return
 
@@ -108,7 +116,11 @@ class SemanticHighlighting( sr.ScrollingBufferRange ):
     return SemanticTokensRequest( request )
 
 
+  @tracing.Traced( tracing.UI )
   def _Draw( self ):
+    if not _initialised:
+      Initialise()
+
     # We requested a snapshot
     tokens = self._latest_response.get( 'tokens', [] )
 
@@ -0,0 +1,94 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+from collections import deque
+from time import monotonic
+
+# The server is restarted 1, 2, 4, 8 then 16 seconds after crashing, then the
+# user is told that it crashed. A server that crashes again after running for
+# a while is restarted as if it crashed for the first time.
+RESTART_DELAY_SECONDS = 1
+MAX_RESTARTS = 5
+STABLE_SECONDS = 60
+
+
+class ServerSupervisor:
+  """Decides when to restart a crashed server and keeps the buffers whose
+  state must be sent again to a restarted server, the most important first.
+  The server itself is restarted by the caller."""
+
+  def __init__( self, clock = monotonic ):
+    self._clock = clock
+    # Number of restarts since the server last ran for STABLE_SECONDS.
+    self._restarts = 0
+    self._last_restart_time = None
+    # When the crashed server must be restarted.
+    self._restart_time = None
+    self._replayed_buffers = deque()
+
+
+  def Restarts( self ):
+    return self._restarts
+
+
+  def GaveUp( self ):
+    return self._restarts >= MAX_RESTARTS
+
+
+  def OnServerAlive( self ):
+    self._restart_time = None
+    if ( self._restarts and
+         self._clock() - self._last_restart_time >= STABLE_SECONDS ):
+      self._restarts = 0
+
+
+  def RestartDelay( self ):
+    """Returns the number of seconds to wait before restarting the crashed
+    server. Must only be called while the server is down and the supervisor
+    didn't give up."""
+    if self._restart_time is None:
+      self._restart_time = ( self._clock() +
+                             RESTART_DELAY_SECONDS * 2 ** self._restarts )
+    return max( 0, self._restart_time - self._clock() )
+
+
+  def OnServerRestarted( self ):
+    self._restarts += 1
+    self._last_restart_time = self._clock()
+    self._restart_time = None
+    self._replayed_buffers.clear()
+
+
+  def Reset( self ):
+    """Forgets the previous crashes, e.g. when the user restarts the
+    server."""
+    self._restarts = 0
+    self._restart_time = None
+    self._replayed_buffers.clear()
+
+
+  def StartReplay( self, buffer_numbers ):
+    """Replays the state of |buffer_numbers| to the server, in this order."""
+    self._replayed_buffers = deque( buffer_numbers )
+
+
+  def NextReplayedBuffer( self ):
+    """Returns the number of the next buffer whose state must be replayed, or
+    None once they all were."""
+    if not self._replayed_buffers:
+      return None
+    return self._replayed_buffers.popleft()
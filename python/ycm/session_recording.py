@@ -0,0 +1,140 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Recording of the events of an editing session, so that the same workload
+can be replayed later with ycm.benchmarks.replay_session.
+
+A session is a gzip-compressed file of JSON lines. The first line is a header
+with the format version and the options that change which requests are sent.
+Each following line is an event with:
+ - time: seconds since the start of the recording;
+ - event: the name of the Vim event, e.g. TextChangedInsertMode;
+ - args: the arguments of the event, as strings;
+ - buffer: the number of the current buffer;
+ - cursor: the 1-based line and 0-based column of the cursor;
+ - visible: the first and last lines visible in the current window;
+ - snapshot: only when the buffer changed since its last snapshot. The first
+   snapshot of a buffer has its name, filetype and lines. The following ones
+   have the replaced lines, from start to end excluded, and their new lines."""
+
+import gzip
+import json
+from time import monotonic
+
+import vim
+from ycm import vimsupport
+from ycmd.utils import ToUnicode
+
+FORMAT_VERSION = 1
+
+
+class SessionRecorder:
+  def __init__( self, filepath, options ):
+    self._file = gzip.open( filepath, 'wt', encoding = 'utf-8' )
+    self._start_time = monotonic()
+    # Map from buffer number to the changedtick and lines of its last
+    # snapshot.
+    self._snapshots = {}
+    self._events = 0
+    self._Write( { 'version': FORMAT_VERSION, 'options': options } )
+
+
+  def Record( self, event, args ):
+    buffer = vim.current.buffer
+    entry = {
+      'time': round( monotonic() - self._start_time, 6 ),
+      'event': event,
+      'args': args,
+      'buffer': buffer.number,
+      'cursor': list( vim.current.window.cursor ),
+      'visible': [ vimsupport.GetIntValue( 'line( "w0" )' ),
+                   vimsupport.GetIntValue( 'line( "w$" )' ) ]
+    }
+    snapshot = self._Snapshot( buffer )
+    if snapshot is not None:
+      entry[ 'snapshot' ] = snapshot
+    self._Write( entry )
+    self._events += 1
+
+
+  def Stop( self ):
+    """Closes the recording and returns the number of events recorded."""
+    self._file.close()
+    return self._events
+
+
+  def _Snapshot( self, buffer ):
+    changedtick = vimsupport.GetBufferChangedTick( buffer.number )
+    previous = self._snapshots.get( buffer.number )
+    if previous is not None and previous[ 0 ] == changedtick:
+      return None
+    lines = [ ToUnicode( line ) for line in buffer ]
+    self._snapshots[ buffer.number ] = ( changedtick, lines )
+    if previous is None:
+      return { 'name': vimsupport.GetBufferFilepath( buffer ),
+               'filetype': vim.eval( '&filetype' ),
+               'lines': lines }
+    return _Diff( previous[ 1 ], lines )
+
+
+  def _Write( self, entry ):
+    self._file.write( json.dumps( entry, separators = ( ',', ':' ) ) )
+    self._file.write( '\n' )
+
+
+def _Diff( old_lines, new_lines ):
+  """Returns the smallest range of |old_lines| to replace, and its replacement,
+  to get |new_lines|. Edits are usually on a single line so that's much smaller
+  than the whole buffer."""
+  start = 0
+  end = min( len( old_lines ), len( new_lines ) )
+  while start < end and old_lines[ start ] == new_lines[ start ]:
+    start += 1
+  suffix = 0
+  while ( suffix < end - start and
+          old_lines[ -suffix - 1 ] == new_lines[ -suffix - 1 ] ):
+    suffix += 1
+  return { 'start': start,
+           'end': len( old_lines ) - suffix,
+           'lines': new_lines[ start : len( new_lines ) - suffix ] }
+
+
+def ApplySnapshot( lines, snapshot ):
+  """Returns the lines of a buffer after the |snapshot| of an event, given its
+  |lines| before."""
+  if 'name' in snapshot:
+    return snapshot[ 'lines' ]
+  return ( lines[ : snapshot[ 'start' ] ] +
+           snapshot[ 'lines' ] +
+           lines[ snapshot[ 'end' ] : ] )
+
+
+def ReadSession( filepath ):
+  """Returns the header of the session recorded in |filepath| and an iterator
+  over its events."""
+  session_file = gzip.open( filepath, 'rt', encoding = 'utf-8' )
+  header = json.loads( session_file.readline() )
+  if header.get( 'version' ) != FORMAT_VERSION:
+    session_file.close()
+    raise RuntimeError( f'Unsupported session format in { filepath }.' )
+
+  def Events():
+    with session_file:
+      for line in session_file:
+        yield json.loads( line )
+
+  return header, Events()
@@ -0,0 +1,179 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Sharing of a ycmd server between the Vim instances of a user. The first Vim
+starts the server and writes how to reach it in a registry file. The next ones
+started with the same options attach to that server instead of starting their
+own, so that they don't wait for a new server nor index the same files again.
+
+The registry also counts the Vim instances attached to the server: the last one
+to detach shuts it down. Vim instances that exited without detaching, e.g.
+because they crashed, are no longer counted the next time the registry is
+updated.
+
+The registry is only accessible to the user since it contains the HMAC secret
+of the server. It is updated under an exclusive lock on a file next to it.
+Sharing is only supported on systems with fcntl, i.e. not on Windows."""
+
+import contextlib
+import hashlib
+import json
+import os
+import stat
+from tempfile import gettempdir
+
+REGISTRY_FORMAT = 'server_{key}.json'
+REGISTRY_VERSION = 1
+
+
+def Supported():
+  try:
+    import fcntl # noqa
+    return True
+  except ImportError:
+    return False
+
+
+def ServerKey( options, server_script ):
+  """Returns a key identifying the server started with the user |options| and
+  the |server_script|. Only Vim instances with the same key share a server."""
+  data = json.dumps( [ options, server_script ], sort_keys = True )
+  return hashlib.sha256( data.encode( 'utf-8' ) ).hexdigest()[ : 16 ]
+
+
+def ProcessIsRunning( pid ):
+  try:
+    os.kill( pid, 0 )
+  except ProcessLookupError:
+    return False
+  except PermissionError:
+    # The process exists but belongs to another user.
+    return True
+  return True
+
+
+def _RegistryDirectory():
+  directory = os.path.join(
+    os.environ.get( 'XDG_RUNTIME_DIR' ) or gettempdir(),
+    f'ycm_shared_{ os.getuid() }' )
+  os.makedirs( directory, mode = 0o700, exist_ok = True )
+  # The directory may have been created by someone else in the temporary
+  # directory, which is shared by all users.
+  status = os.lstat( directory )
+  if ( not stat.S_ISDIR( status.st_mode ) or
+       status.st_uid != os.getuid() or
+       status.st_mode & 0o077 ):
+    raise OSError( f'{ directory } is accessible to other users.' )
+  return directory
+
+
+class SharedServer:
+  """The registry of the server shared by the Vim instances with the given
+  key. A server is described by a dictionary with its process ID (pid), its
+  address (location), the Unix socket it listens on, if any (unix_socket), its
+  base64-encoded HMAC secret (hmac_secret) and its logfiles (stdout and
+  stderr)."""
+
+  def __init__( self, key ):
+    self._path = os.path.join( _RegistryDirectory(),
+                               REGISTRY_FORMAT.format( key = key ) )
+
+
+  @contextlib.contextmanager
+  def Lock( self ):
+    """Holds the lock of the registry in the body of the with statement. Vim
+    instances starting at the same time wait on this lock, so that only one of
+    them starts a server."""
+    import fcntl
+    lock_file = os.open( self._path + '.lock', os.O_RDWR | os.O_CREAT, 0o600 )
+    try:
+      fcntl.flock( lock_file, fcntl.LOCK_EX )
+      yield
+    finally:
+      os.close( lock_file )
+
+
+  def Attach( self ):
+    """Returns the registered server, after counting this Vim instance as one
+    of its clients, or None if no server is running. The lock must be held."""
+    registry = self._Read()
+    if ( registry is None or
+         not ProcessIsRunning( registry[ 'server' ][ 'pid' ] ) ):
+      return None
+    registry[ 'clients' ].append( os.getpid() )
+    self._Write( registry )
+    return registry[ 'server' ]
+
+
+  def Register( self, server ):
+    """Registers the |server| started by this Vim instance, its only client
+    until others attach to it. The lock must be held."""
+    self._Write( { 'version': REGISTRY_VERSION,
+                   'server': server,
+                   'clients': [ os.getpid() ] } )
+
+
+  def Detach( self, server_pid, shut_down = False ):
+    """Stops counting this Vim instance as a client of the server with process
+    ID |server_pid|. Returns True if the server must be shut down, i.e. it was
+    the last client or |shut_down| is True, in which case the server is
+    unregistered. Returns False if the server was already unregistered, e.g.
+    because another Vim restarted it."""
+    with self.Lock():
+      registry = self._Read()
+      if registry is None or registry[ 'server' ][ 'pid' ] != server_pid:
+        return False
+      clients = registry[ 'clients' ]
+      pid = os.getpid()
+      if pid in clients:
+        clients.remove( pid )
+      registry[ 'clients' ] = [ client for client in clients
+                                if ProcessIsRunning( client ) ]
+      if registry[ 'clients' ] and not shut_down:
+        self._Write( registry )
+        return False
+      os.remove( self._path )
+      return True
+
+
+  def Clients( self ):
+    """Returns the number of Vim instances attached to the registered
+    server."""
+    registry = self._Read()
+    return len( registry[ 'clients' ] ) if registry else 0
+
+
+  def _Read( self ):
+    try:
+      with open( self._path ) as registry_file:
+        registry = json.load( registry_file )
+    except ( OSError, ValueError ):
+      return None
+    if registry.get( 'version' ) != REGISTRY_VERSION:
+      return None
+    return registry
+
+
+  def _Write( self, registry ):
+    # The registry is replaced at once so that it's never read half-written.
+    temporary_path = f'{ self._path }.{ os.getpid() }'
+    descriptor = os.open( temporary_path,
+                          os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+                          0o600 )
+    with open( descriptor, 'w' ) as registry_file:
+      json.dump( registry, registry_file )
+    os.replace( temporary_path, self._path )
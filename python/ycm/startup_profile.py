@@ -0,0 +1,207 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Opt-in profiling of the startup of the plugin: the time taken to import
+each module and by each phase of the initialisation, from the setup of the
+Python side of the plugin to the end of youcompleteme#Enable. The phases are
+consecutive: each one lasts from the end of the previous one.
+
+The import of a module is timed from the search of its file to the end of the
+execution of its body. Its own time excludes the modules it imports. Only the
+imports done in the thread that started the profile are timed.
+
+This module only imports modules that are already loaded by the interpreter so
+that it doesn't slow down the startup when profiling is disabled."""
+
+import sys
+import threading
+from time import perf_counter
+
+# The profile being recorded, or the last one recorded. None if the startup
+# wasn't profiled.
+_profile = None
+
+
+class _Profile:
+  def __init__( self ):
+    self.start = perf_counter()
+    self.end = None
+    self.phase_end = self.start
+    self.thread = threading.get_ident()
+    # Map from module name to the time taken to import it and its own time,
+    # in seconds.
+    self.modules = {}
+    self.phases = []
+    # Total time of the imports that were not nested in other imports.
+    self.import_time = 0
+    # For each module being imported, the time taken by its nested imports.
+    self._nested_times = []
+
+
+  def BeginModule( self ):
+    self._nested_times.append( 0 )
+
+
+  def EndModule( self, name, duration ):
+    own_time = duration - self._nested_times.pop()
+    self.modules[ name ] = ( duration, own_time )
+    if self._nested_times:
+      self._nested_times[ -1 ] += duration
+    else:
+      self.import_time += duration
+
+
+class _TimedLoader:
+  """Wraps the loader of a module to time its creation and execution. The
+  module is given its real loader before being executed."""
+
+  def __init__( self, loader, profile, find_time ):
+    self._loader = loader
+    self._profile = profile
+    self._extra_time = find_time
+
+
+  def __getattr__( self, name ):
+    return getattr( self._loader, name )
+
+
+  def create_module( self, spec ):
+    create_module = getattr( self._loader, 'create_module', None )
+    if create_module is None:
+      return None
+    # Extension modules are loaded here.
+    start = perf_counter()
+    try:
+      return create_module( spec )
+    finally:
+      self._extra_time += perf_counter() - start
+
+
+  def exec_module( self, module ):
+    module.__loader__ = self._loader
+    if module.__spec__ is not None:
+      module.__spec__.loader = self._loader
+    self._profile.BeginModule()
+    start = perf_counter()
+    try:
+      self._loader.exec_module( module )
+    finally:
+      self._profile.EndModule(
+        module.__name__, perf_counter() - start + self._extra_time )
+
+
+class _TimingFinder:
+  """Meta path finder delegating the search of the modules to the next finders
+  and wrapping the loaders they find."""
+
+  def __init__( self, profile ):
+    self._profile = profile
+
+
+  def find_spec( self, fullname, path, target = None ):
+    if threading.get_ident() != self._profile.thread:
+      return None
+    start = perf_counter()
+    spec = self._FindSpec( fullname, path, target )
+    # Modules without a loader, like namespace packages, or with a legacy one
+    # are loaded as usual.
+    if spec is not None and hasattr( spec.loader, 'exec_module' ):
+      spec.loader = _TimedLoader( spec.loader,
+                                  self._profile,
+                                  perf_counter() - start )
+    return spec
+
+
+  def _FindSpec( self, fullname, path, target ):
+    for finder in sys.meta_path:
+      find_spec = getattr( finder, 'find_spec', None )
+      if finder is self or find_spec is None:
+        continue
+      spec = find_spec( fullname, path, target )
+      if spec is not None:
+        return spec
+    return None
+
+
+def Start():
+  """Starts timing the imports and the phases of the startup. Discards the
+  previous profile."""
+  global _profile
+  Stop()
+  _profile = _Profile()
+  sys.meta_path.insert( 0, _TimingFinder( _profile ) )
+
+
+def Stop():
+  """Stops timing the imports. The profile recorded until then is kept."""
+  if _profile is None or _profile.end is not None:
+    return
+  _profile.end = perf_counter()
+  sys.meta_path[ : ] = [ finder for finder in sys.meta_path
+                         if not isinstance( finder, _TimingFinder ) ]
+
+
+def EndPhase( name ):
+  """Records the time since the end of the previous phase, or the start of the
+  profile, as the phase |name| of the startup. Does nothing if the startup isn't
+  being profiled."""
+  profile = _profile
+  if profile is None or profile.end is not None:
+    return
+  now = perf_counter()
+  profile.phases.append( ( name, now - profile.phase_end ) )
+  profile.phase_end = now
+
+
+def Results():
+  """Returns the last profile, with times in milliseconds, or None if the
+  startup wasn't profiled."""
+  profile = _profile
+  if profile is None:
+    return None
+  end = profile.end if profile.end is not None else perf_counter()
+  return {
+    'total_ms': ( end - profile.start ) * 1000,
+    'import_ms': profile.import_time * 1000,
+    'phases': [ { 'name': name, 'ms': duration * 1000 }
+                for name, duration in profile.phases ],
+    'modules': { name: { 'total_ms': total * 1000, 'own_ms': own * 1000 }
+                 for name, ( total, own ) in profile.modules.items() }
+  }
+
+
+def Report( max_modules = 30 ):
+  """Returns a table of the time taken by the startup phases and by the
+  |max_modules| slowest imports."""
+  results = Results()
+  if results is None:
+    return ( 'Startup was not profiled. '
+             'Set g:ycm_profile_startup to 1 and restart Vim.' )
+  modules = sorted( results[ 'modules' ].items(),
+                    key = lambda item: item[ 1 ][ 'total_ms' ],
+                    reverse = True )
+  lines = [ f'Startup: { results[ "total_ms" ]:.2f} ms, imports: '
+            f'{ results[ "import_ms" ]:.2f} ms in { len( modules ) } modules',
+            '',
+            f'{ "Phase":<40} { "Time":>9}' ]
+  for phase in results[ 'phases' ]:
+    lines.append( f'{ phase[ "name" ]:<40} { phase[ "ms" ]:>9.2f}' )
+  lines += [ '', f'{ "Module":<40} { "Total":>9} { "Own":>9}' ]
+  for name, times in modules[ : max_modules ]:
+    lines.append( f'{ name:<40} { times[ "total_ms" ]:>9.2f} '
+                  f'{ times[ "own_ms" ]:>9.2f}' )
+  return '\n'.join( lines )
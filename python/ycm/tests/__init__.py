@@ -53,6 +53,12 @@ DEFAULT_CLIENT_OPTIONS = {
   'g:ycm_seed_identifiers_with_syntax': 0,
   'g:ycm_goto_buffer_command': 'same-buffer',
   'g:ycm_update_diagnostics_in_insert_mode': 1,
+  'g:ycm_server_use_unix_socket': 0,
+  'g:ycm_trace_events': 0,
+  'g:ycm_shared_server': 0,
+  'g:ycm_startup_cache': 0,
+  'g:ycm_auto_restart_server': 0,
+  'g:ycm_server_memory_limit_mb': 0,
   # ycmd options
   'g:ycm_auto_trigger': 1,
   'g:ycm_min_num_of_chars_for_completion': 2,
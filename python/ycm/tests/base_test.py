@@ -17,13 +17,16 @@
 # along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
 
 import contextlib
-from hamcrest import assert_that, equal_to
+import os
+import tempfile
+from hamcrest import assert_that, equal_to, has_entries
 from unittest import TestCase
 from unittest.mock import patch
 
 from ycm.tests.test_utils import MockVimModule
 vim_mock = MockVimModule()
 from ycm import base
+from ycm.tests import UserOptions
 
 
 @contextlib.contextmanager
@@ -307,3 +310,33 @@ class BaseTest( TestCase ):
 
       with MockCurrentColumnAndLineContents( 3, 'føo ' ):
         assert_that( not base.CurrentIdentifierFinished() )
+
+
+  def test_GetUserOptions_Cache( self ):
+    with tempfile.TemporaryDirectory() as cache_directory:
+      with patch.dict( os.environ, { 'XDG_CACHE_HOME': cache_directory,
+                                     'LOCALAPPDATA': cache_directory } ):
+        with UserOptions( { 'g:ycm_startup_cache': 1, 'g:ycm_foo': '42' } ):
+          options = base.GetUserOptions( { 'bar': 1 } )
+          assert_that( options, has_entries( { 'foo': 42, 'bar': 1 } ) )
+
+          with patch( 'ycm.vimsupport.GetVimGlobalsKeys' ) as keys:
+            assert_that( base.GetUserOptions( { 'bar': 1 } ),
+                         equal_to( options ) )
+            keys.assert_not_called()
+
+          # Other client defaults.
+          assert_that( base.GetUserOptions( { 'bar': 2 } ),
+                       has_entries( { 'foo': 42, 'bar': 2 } ) )
+
+        with UserOptions( { 'g:ycm_startup_cache': 1, 'g:ycm_foo': '43' } ):
+          assert_that( base.GetUserOptions( { 'bar': 1 } ),
+                       has_entries( { 'foo': 43, 'bar': 1 } ) )
+
+        # Nothing is cached when the cache is disabled.
+        with UserOptions( { 'g:ycm_startup_cache': 0 } ):
+          base.GetUserOptions()
+          with patch( 'ycm.vimsupport.GetVimGlobalsKeys',
+                      return_value = [] ) as keys:
+            base.GetUserOptions()
+            keys.assert_called_once_with()
@@ -0,0 +1,111 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+from hamcrest import assert_that, equal_to, has_entries, same_instance
+from unittest import TestCase
+from unittest.mock import MagicMock
+from ycm.buffer_data_cache import BufferDataCache
+
+
+def _Compute( contents ):
+  return MagicMock( side_effect = lambda: { 'contents': contents,
+                                            'filetypes': [ 'cpp' ] } )
+
+
+class BufferDataCacheTest( TestCase ):
+  def test_BufferDataCache_Hit( self ):
+    cache = BufferDataCache()
+    compute = _Compute( 'abc\n' )
+    data = cache.Get( 1, 10, [ 'cpp' ], compute )
+
+    assert_that( cache.Get( 1, 10, [ 'cpp' ], compute ), same_instance( data ) )
+    assert_that( compute.call_count, equal_to( 1 ) )
+    assert_that( cache.Stats(), has_entries( { 'hits': 1,
+                                               'misses': 1,
+                                               'entries': 1,
+                                               'size': 4 } ) )
+
+
+  def test_BufferDataCache_ChangedtickChanged( self ):
+    cache = BufferDataCache()
+    cache.Get( 1, 10, [ 'cpp' ], _Compute( 'abc\n' ) )
+    data = cache.Get( 1, 11, [ 'cpp' ], _Compute( 'abcd\n' ) )
+
+    assert_that( data[ 'contents' ], equal_to( 'abcd\n' ) )
+    assert_that( cache.Stats(), has_entries( { 'hits': 0,
+                                               'misses': 2,
+                                               'entries': 1,
+                                               'size': 5 } ) )
+
+
+  def test_BufferDataCache_FiletypesChanged( self ):
+    cache = BufferDataCache()
+    compute = _Compute( 'abc\n' )
+    cache.Get( 1, 10, [ 'c' ], compute )
+    cache.Get( 1, 10, [ 'cpp' ], compute )
+
+    assert_that( compute.call_count, equal_to( 2 ) )
+
+
+  def test_BufferDataCache_UnknownChangedtick( self ):
+    cache = BufferDataCache()
+    compute = _Compute( 'abc\n' )
+    cache.Get( 1, 0, [ 'cpp' ], compute )
+    cache.Get( 1, 0, [ 'cpp' ], compute )
+
+    assert_that( compute.call_count, equal_to( 2 ) )
+    assert_that( cache.Stats(), has_entries( { 'entries': 0, 'size': 0 } ) )
+
+
+  def test_BufferDataCache_EvictLeastRecentlyUsed_MaxEntries( self ):
+    cache = BufferDataCache( max_entries = 2 )
+    cache.Get( 1, 10, [ 'cpp' ], _Compute( 'a\n' ) )
+    cache.Get( 2, 10, [ 'cpp' ], _Compute( 'b\n' ) )
+    cache.Get( 1, 10, [ 'cpp' ], _Compute( 'a\n' ) )
+    cache.Get( 3, 10, [ 'cpp' ], _Compute( 'c\n' ) )
+
+    compute = _Compute( 'a\n' )
+    cache.Get( 1, 10, [ 'cpp' ], compute )
+    assert_that( compute.call_count, equal_to( 0 ) )
+    compute = _Compute( 'b\n' )
+    cache.Get( 2, 10, [ 'cpp' ], compute )
+    assert_that( compute.call_count, equal_to( 1 ) )
+
+
+  def test_BufferDataCache_EvictLeastRecentlyUsed_MaxSize( self ):
+    cache = BufferDataCache( max_size = 10 )
+    cache.Get( 1, 10, [ 'cpp' ], _Compute( 'aaaa\n' ) )
+    cache.Get( 2, 10, [ 'cpp' ], _Compute( 'bbbb\n' ) )
+    cache.Get( 3, 10, [ 'cpp' ], _Compute( 'cccc\n' ) )
+
+    assert_that( cache.Stats(), has_entries( { 'entries': 2, 'size': 10 } ) )
+
+    # A buffer larger than the cache is still kept until the next one.
+    cache.Get( 4, 10, [ 'cpp' ], _Compute( 'd' * 20 ) )
+    assert_that( cache.Stats(), has_entries( { 'entries': 1, 'size': 20 } ) )
+
+
+  def test_BufferDataCache_Invalidate( self ):
+    cache = BufferDataCache()
+    compute = _Compute( 'abc\n' )
+    cache.Get( 1, 10, [ 'cpp' ], compute )
+    cache.Invalidate( 1 )
+    cache.Invalidate( 2 )
+    cache.Get( 1, 10, [ 'cpp' ], compute )
+
+    assert_that( compute.call_count, equal_to( 2 ) )
+    assert_that( cache.Stats(), has_entries( { 'entries': 1, 'size': 4 } ) )
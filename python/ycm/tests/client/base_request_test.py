@@ -18,10 +18,23 @@
 from ycm.tests.test_utils import MockVimBuffers, MockVimModule, VimBuffer
 MockVimModule()
 
-from hamcrest import assert_that, has_entry
+import json
+from base64 import b64encode
+from collections import Counter
+from concurrent.futures import CancelledError, Future
+from io import BytesIO
+from urllib.error import HTTPError
+from urllib.response import addinfourl
+from hamcrest import ( assert_that, calling, contains_exactly, equal_to,
+                       has_entries, has_entry, has_key, is_not, none, raises,
+                       same_instance )
 from unittest import TestCase
-from unittest.mock import patch
-from ycm.client.base_request import BuildRequestData
+from unittest.mock import ANY, MagicMock, patch
+from ycm.client.base_request import ( _MakeProcessedRequest, _SendBatch,
+                                      BaseRequest, BuildRequestData )
+from ycm.client.request_batch import BatchedRequest
+from ycm.tests.mock_utils import FakeFuture, FakeResponse
+from ycmd.responses import ServerError
 
 
 class BaseRequestTest( TestCase ):
@@ -40,3 +53,245 @@ class BaseRequestTest( TestCase ):
     with MockVimBuffers( [ current_buffer ], [ current_buffer ] ):
       assert_that( BuildRequestData( current_buffer.number ),
                    has_entry( 'working_dir', '/some/dir' ) )
+
+
+  @patch( 'ycm.client.base_request.BaseRequest.dropped_requests', Counter() )
+  @patch( 'ycm.client.base_request.BaseRequest.PostDataToHandlerAsync' )
+  def test_BaseRequest_Cancel( self, post_data_to_handler_async ):
+    request = BaseRequest()
+    request.Cancel()
+    assert_that( BaseRequest.dropped_requests, equal_to( {} ) )
+
+    cancellation = request._NewCancellation( 'completions' )
+    request.Cancel()
+    request.Cancel()
+    assert_that( cancellation.Cancelled(), equal_to( True ) )
+    assert_that( BaseRequest.dropped_requests,
+                 equal_to( { 'completions': 1 } ) )
+    # The request was never sent so there is nothing to tell the server.
+    post_data_to_handler_async.assert_not_called()
+
+
+  @patch( 'ycm.client.base_request.BaseRequest.dropped_requests', Counter() )
+  @patch( 'ycm.client.base_request.BaseRequest.server_extensions',
+          { 'cancel-request' } )
+  @patch( 'ycm.client.base_request.BaseRequest.PostDataToHandlerAsync' )
+  def test_BaseRequest_Cancel_TellServer( self, post_data_to_handler_async ):
+    request = BaseRequest()
+    cancellation = request._NewCancellation( 'completions' )
+    cancellation._Attach( None )
+    request.Cancel()
+
+    post_data_to_handler_async.assert_called_once_with(
+      { 'request_id': cancellation.request_id }, 'cancel_request' )
+
+
+  @patch( 'ycm.vimsupport.PostVimMessage' )
+  def test_BaseRequest_HandleFuture_Cancelled( self, post_vim_message ):
+    assert_that(
+      BaseRequest().HandleFuture( FakeFuture( True,
+                                              exception = CancelledError() ) ),
+      none() )
+    post_vim_message.assert_not_called()
+
+
+  @patch( 'ycm.client.base_request.BaseRequest.server_extensions', set() )
+  @patch( 'ycm.client.base_request.BaseRequest.Executor' )
+  def test_BaseRequest_RequestBatch_NotSupported( self, executor ):
+    BaseRequest.StartRequestBatch()
+    try:
+      BaseRequest.PostDataToHandlerAsync( {}, 'event_notification' )
+      # The server doesn't support batches; the request is sent straight away.
+      executor.return_value.submit_with_priority.assert_called_once()
+    finally:
+      BaseRequest.FlushRequestBatch()
+    executor.return_value.submit_with_priority.assert_called_once()
+
+
+  @patch( 'ycm.client.base_request.BaseRequest.server_extensions',
+          { 'batch' } )
+  @patch( 'ycm.client.base_request.BaseRequest.Executor' )
+  def test_BaseRequest_RequestBatch( self, executor ):
+    submit = executor.return_value.submit_with_priority
+    BaseRequest.StartRequestBatch()
+    BaseRequest.StartRequestBatch()
+    try:
+      first = BaseRequest.PostDataToHandlerAsync( {}, 'event_notification' )
+      second = BaseRequest().GetDataFromHandlerAsync( 'ready' )
+      BaseRequest.FlushRequestBatch()
+      submit.assert_not_called()
+    finally:
+      BaseRequest.FlushRequestBatch()
+
+    # Both requests are sent together, with the most urgent priority.
+    submit.assert_called_once()
+    priority, send, requests = submit.call_args[ 0 ]
+    assert_that( priority, equal_to( 2 ) )
+    assert_that( send, same_instance( _SendBatch ) )
+    assert_that( [ request.future for request in requests ],
+                 contains_exactly( same_instance( first ),
+                                   same_instance( second ) ) )
+    assert_that( BaseRequest.request_batch, none() )
+
+
+  @patch( 'ycm.client.base_request.GetCurrentDirectory',
+          return_value = '/some/dir' )
+  @patch( 'ycm.vimsupport.GetUnsavedAndSpecifiedBufferData',
+          return_value = {} )
+  def test_BuildRequestData_RequestBatch( self,
+                                          get_buffer_data,
+                                          *args ):
+    current_buffer = VimBuffer( 'foo' )
+    with MockVimBuffers( [ current_buffer ], [ current_buffer ] ):
+      BaseRequest.StartRequestBatch()
+      try:
+        first = BuildRequestData()
+        first[ 'event_name' ] = 'BufferVisit'
+        second = BuildRequestData()
+      finally:
+        BaseRequest.FlushRequestBatch()
+      BuildRequestData()
+
+    assert_that( second, has_entries( { 'working_dir': '/some/dir',
+                                        'file_data': same_instance(
+                                          first[ 'file_data' ] ) } ) )
+    assert_that( second, is_not( has_key( 'event_name' ) ) )
+    assert_that( get_buffer_data.call_count, equal_to( 2 ) )
+
+
+  @patch( 'ycm.client.base_request.BaseRequest.server_extensions',
+          { 'batch' } )
+  @patch( 'ycm.client.base_request._JsonFromFuture', return_value = True )
+  @patch( 'ycm.client.base_request.BaseRequest.Executor' )
+  def test_BaseRequest_GetDataFromHandlerInBackground( self, executor, *args ):
+    submit = executor.return_value.submit_with_priority
+    BaseRequest.StartRequestBatch()
+    try:
+      batch = BaseRequest.request_batch
+      batched = BaseRequest.PostDataToHandlerAsync( {}, 'event_notification' )
+      assert_that( BaseRequest.GetDataFromHandlerInBackground( 'healthy' ),
+                   equal_to( True ) )
+      # The request is sent on its own and the batch is left untouched.
+      submit.assert_called_once()
+      assert_that( submit.call_args[ 0 ][ 1 ],
+                   same_instance( _MakeProcessedRequest ) )
+      assert_that( BaseRequest.request_batch, same_instance( batch ) )
+      assert_that( batch.Contains( batched ), equal_to( True ) )
+    finally:
+      BaseRequest.FlushRequestBatch()
+
+
+  @patch( 'ycm.client.base_request._JsonFromFuture',
+          side_effect = RuntimeError( 'boom' ) )
+  @patch( 'ycm.client.base_request.BaseRequest.Executor' )
+  def test_BaseRequest_GetDataFromHandlerInBackground_Error( self, *args ):
+    assert_that( BaseRequest.GetDataFromHandlerInBackground( 'healthy' ),
+                 none() )
+
+
+  @patch( 'ycm.client.base_request._MakeProcessedRequest' )
+  def test_BaseRequest_SendBatch_SingleRequest( self, make_request ):
+    request = MagicMock()
+    request.Start.return_value = True
+    _SendBatch( [ request ] )
+
+    make_request.assert_called_once_with( request.data,
+                                          request.handler,
+                                          request.method,
+                                          request.timeout,
+                                          request.payload,
+                                          request.cancellation )
+    request.SetResponse.assert_called_once_with( make_request.return_value )
+
+
+  @patch( 'ycm.client.base_request._MakeRequest' )
+  def test_BaseRequest_SendBatch_InvalidHmac( self, make_request ):
+    # A forged batch response isn't split, even if its items look valid.
+    items = [ { 'status': 200, 'headers': {}, 'body': '' } ] * 2
+    make_request.return_value = addinfourl(
+      BytesIO( json.dumps( items ).encode() ),
+      { 'x-ycm-hmac': b64encode( b'forged' ).decode() },
+      '',
+      200 )
+    requests = [ BatchedRequest( 'GET', 'healthy', None, None, 30, None, 2 )
+                 for _ in range( 2 ) ]
+    with patch.object( BaseRequest, 'hmac_secret', b'secret' ):
+      _SendBatch( requests )
+
+    for request in requests:
+      assert_that( calling( request.future.result ).with_args( timeout = 0 ),
+                   raises( RuntimeError, 'Received invalid HMAC' ) )
+
+
+  @patch( 'ycm.client.base_request._ValidateResponseObject' )
+  @patch( 'ycm.client.base_request._MakeRequest',
+          return_value = FakeResponse( { 'ok': True }, None ) )
+  def test_BaseRequest_ProcessResponseInExecutor( self,
+                                                  make_request,
+                                                  validate ):
+    future = Future()
+    future.set_result( _MakeProcessedRequest( {}, 'ready', 'GET', 1, None,
+                                              None ) )
+    validate.assert_called_once()
+    validate.reset_mock()
+
+    assert_that( BaseRequest().HandleFuture( future ),
+                 equal_to( { 'ok': True } ) )
+    # Nothing is left to do on the main thread.
+    validate.assert_not_called()
+
+
+  @patch( 'ycm.vimsupport.PostVimMessage' )
+  @patch( 'ycm.client.base_request._MakeRequest',
+          side_effect = HTTPError( '', 500, 'Error', {}, BytesIO(
+            b'{ "exception": { "TYPE": "RuntimeError" }, '
+            b'"message": "boom" }' ) ) )
+  def test_BaseRequest_ProcessServerErrorInExecutor( self,
+                                                     make_request,
+                                                     post_vim_message ):
+    with self.assertRaises( ServerError ) as context:
+      _MakeProcessedRequest( {}, 'ready', 'GET', 1, None, None )
+    future = Future()
+    future.set_exception( context.exception )
+
+    assert_that( BaseRequest().HandleFuture( future ), none() )
+    post_vim_message.assert_called_once_with( 'RuntimeError: boom',
+                                              truncate = False )
+
+
+  @patch( 'ycm.client.base_request.BaseRequest.server_extensions', set() )
+  @patch( 'ycm.client.base_request.BaseRequest.Executor' )
+  def test_BaseRequest_NotifyResponse( self, executor ):
+    future = Future()
+    executor.return_value.submit_with_priority.return_value = future
+    notifier = MagicMock()
+    with patch( 'ycm.client.base_request.BaseRequest.response_notifier',
+                notifier ):
+      BaseRequest.PostDataToHandlerAsync( {}, 'completions' )
+      # Nobody polls for the response of that request.
+      BaseRequest.PostDataToHandlerAsync( {}, 'debug_info' )
+      notifier.Notify.assert_not_called()
+
+      future.set_result( None )
+      notifier.Notify.assert_called_once_with( 'completion' )
+
+
+  @patch( 'ycm.client.base_request.BaseRequest.server_extensions', set() )
+  @patch( 'ycm.client.base_request.BaseRequest.Executor' )
+  def test_BaseRequest_RecordLatency( self, executor ):
+    estimates = MagicMock()
+    with patch( 'ycm.client.base_request.BaseRequest.latency_estimates',
+                estimates ):
+      for outcome in [ 'result', 'exception', 'cancel' ]:
+        future = Future()
+        executor.return_value.submit_with_priority.return_value = future
+        BaseRequest.PostDataToHandlerAsync( {}, 'semantic_tokens' )
+        if outcome == 'result':
+          future.set_result( None )
+        elif outcome == 'exception':
+          future.set_exception( RuntimeError( 'boom' ) )
+        else:
+          future.cancel()
+
+    # Only the responses are timed.
+    estimates.Record.assert_called_once_with( 'semantic_highlighting', ANY )
@@ -0,0 +1,312 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+import itertools
+import os
+import socketserver
+from hamcrest import ( assert_that, calling, contains_exactly, equal_to,
+                       greater_than_or_equal_to, has_entries, has_length, none,
+                       raises )
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from tempfile import TemporaryDirectory
+from threading import Event, Thread
+from time import monotonic
+from unittest import TestCase, skipUnless
+from unittest.mock import MagicMock
+from urllib.error import HTTPError, URLError
+
+from ycm.client.connection_pool import Cancellation, ConnectionPool
+
+
+class _Handler( BaseHTTPRequestHandler ):
+  protocol_version = 'HTTP/1.1'
+
+  def do_GET( self ):
+    self.server.connections.add( self.client_address )
+    if self.path == '/slow':
+      self.server.slow_request_received.set()
+      self.server.finish_slow_request.wait( 10 )
+    status = 500 if self.path == '/error' else 200
+    body = self.path.encode()
+    self.send_response( status )
+    self.send_header( 'Content-Length', str( len( body ) ) )
+    if self.path == '/close':
+      self.send_header( 'Connection', 'close' )
+    self.end_headers()
+    self.wfile.write( body )
+
+
+  def do_POST( self ):
+    self.server.connections.add( self.client_address )
+    body = self.rfile.read( int( self.headers[ 'Content-Length' ] ) )
+    self.send_response( 200 )
+    self.send_header( 'Content-Length', str( len( body ) ) )
+    self.end_headers()
+    self.wfile.write( body )
+
+
+  def log_message( self, *args ):
+    pass
+
+
+if hasattr( socketserver, 'UnixStreamServer' ):
+  class _UnixHTTPServer( socketserver.ThreadingMixIn,
+                         socketserver.UnixStreamServer ):
+    daemon_threads = True
+    client_ids = itertools.count()
+
+
+    def get_request( self ):
+      request, _ = super().get_request()
+      # BaseHTTPRequestHandler expects a ( host, port ) client address.
+      return request, ( 'unix', next( self.client_ids ) )
+
+
+def _StartServer( server ):
+  server.connections = set()
+  server.slow_request_received = Event()
+  server.finish_slow_request = Event()
+  thread = Thread( target = server.serve_forever )
+  thread.daemon = True
+  thread.start()
+
+
+def _StopServer( server ):
+  server.finish_slow_request.set()
+  server.shutdown()
+  server.server_close()
+
+
+class ConnectionPoolTest( TestCase ):
+  def setUp( self ):
+    self._server = ThreadingHTTPServer( ( '127.0.0.1', 0 ), _Handler )
+    self._server.daemon_threads = True
+    _StartServer( self._server )
+    host, port = self._server.server_address
+    self._location = f'http://{ host }:{ port }'
+    self._pool = ConnectionPool()
+
+
+  def tearDown( self ):
+    self._pool.Reset()
+    _StopServer( self._server )
+
+
+  def test_ConnectionPool_ReusesConnection( self ):
+    for _ in range( 3 ):
+      response = self._pool.Request( 'GET', self._location + '/ready' )
+      assert_that( response.read(), equal_to( b'/ready' ) )
+
+    assert_that( self._server.connections, has_length( 1 ) )
+    assert_that( self._pool.Stats(), has_entries( { 'opened': 1,
+                                                    'reused': 2,
+                                                    'reconnected': 0,
+                                                    'idle': 1 } ) )
+
+
+  def test_ConnectionPool_PostBody( self ):
+    response = self._pool.Request( 'POST',
+                                   self._location + '/completions',
+                                   body = b'{"line_num": 1}',
+                                   headers = { 'content-type':
+                                               'application/json' } )
+    assert_that( response.code, equal_to( 200 ) )
+    assert_that( response.read(), equal_to( b'{"line_num": 1}' ) )
+
+
+  def test_ConnectionPool_QueryString( self ):
+    response = self._pool.Request( 'GET',
+                                   self._location + '/ready?subserver=cpp' )
+    assert_that( response.read(), equal_to( b'/ready?subserver=cpp' ) )
+
+
+  def test_ConnectionPool_ServerError( self ):
+    try:
+      self._pool.Request( 'GET', self._location + '/error' )
+    except HTTPError as error:
+      assert_that( error.code, equal_to( 500 ) )
+      assert_that( error.read(), equal_to( b'/error' ) )
+    else:
+      raise AssertionError( 'HTTPError not raised' )
+
+    # The connection is still usable after an error response.
+    self._pool.Request( 'GET', self._location + '/ready' )
+    assert_that( self._pool.Stats(), has_entries( { 'opened': 1,
+                                                    'reused': 1 } ) )
+
+
+  def test_ConnectionPool_ServerClosesConnection( self ):
+    self._pool.Request( 'GET', self._location + '/close' )
+    assert_that( self._pool.Stats(), has_entries( { 'idle': 0 } ) )
+
+    self._pool.Request( 'GET', self._location + '/ready' )
+    assert_that( self._pool.Stats(), has_entries( { 'opened': 2,
+                                                    'reused': 0 } ) )
+
+
+  def test_ConnectionPool_Reset( self ):
+    self._pool.Request( 'GET', self._location + '/ready' )
+    self._pool.Reset()
+    assert_that( self._pool.Stats(), has_entries( { 'idle': 0 } ) )
+
+    self._pool.Request( 'GET', self._location + '/ready' )
+    assert_that( self._pool.Stats(), has_entries( { 'opened': 2,
+                                                    'reused': 0 } ) )
+
+
+  def test_ConnectionPool_LastActivity( self ):
+    assert_that( self._pool.LastActivity(), none() )
+
+    before = monotonic()
+    self._pool.Request( 'GET', self._location + '/ready' )
+    first_activity = self._pool.LastActivity()
+    assert_that( first_activity, greater_than_or_equal_to( before ) )
+
+    # Error responses are activity too.
+    self._pool.Request( 'GET', self._location + '/ready' )
+    with self.assertRaises( HTTPError ):
+      self._pool.Request( 'GET', self._location + '/error' )
+    assert_that( self._pool.LastActivity(),
+                 greater_than_or_equal_to( first_activity ) )
+
+
+  def test_ConnectionPool_ServerUnreachable( self ):
+    self._server.shutdown()
+    self._server.server_close()
+
+    assert_that(
+      calling( self._pool.Request ).with_args( 'GET',
+                                               self._location + '/ready' ),
+      raises( URLError ) )
+
+
+  def test_ConnectionPool_CancelledBeforeSending( self ):
+    cancellation = Cancellation()
+    assert_that( cancellation.Cancel(), equal_to( True ) )
+    assert_that( cancellation.Cancel(), equal_to( False ) )
+
+    assert_that(
+      calling( self._pool.Request ).with_args( 'GET',
+                                               self._location + '/ready',
+                                               cancellation = cancellation ),
+      raises( CancelledError ) )
+    assert_that( self._server.connections, has_length( 0 ) )
+    assert_that( cancellation.Sent(), equal_to( False ) )
+
+
+  def test_ConnectionPool_CancelledInFlight( self ):
+    cancellation = Cancellation()
+    with ThreadPoolExecutor( max_workers = 1 ) as executor:
+      future = executor.submit( self._pool.Request,
+                                'GET',
+                                self._location + '/slow',
+                                timeout = 10,
+                                cancellation = cancellation )
+      self._server.slow_request_received.wait( 10 )
+      assert_that( cancellation.Cancel(), equal_to( True ) )
+
+      assert_that( calling( future.result ).with_args( timeout = 5 ),
+                   raises( CancelledError ) )
+
+    assert_that( cancellation.Sent(), equal_to( True ) )
+    assert_that( self._pool.Stats(), has_entries( { 'idle': 0 } ) )
+
+
+  def test_ConnectionPool_CancelAfterFinish( self ):
+    cancellation = Cancellation()
+    self._pool.Request( 'GET',
+                        self._location + '/ready',
+                        cancellation = cancellation )
+    cancellation.Finish()
+
+    assert_that( cancellation.Cancel(), equal_to( False ) )
+    assert_that( self._pool.Stats(), has_entries( { 'idle': 1 } ) )
+
+
+  def test_Cancellation_ShutdownBeforeDetach( self ):
+    # A request detaches its connection before giving it back to the pool.
+    # Cancelling it must not shut the connection down once it's back in the
+    # pool, maybe in use by another request.
+    cancellation = Cancellation()
+    detached = Event()
+    detached_during_shutdown = []
+
+    def Detach():
+      cancellation._Detach()
+      detached.set()
+
+    def Shutdown( how ):
+      Thread( target = Detach ).start()
+      detached_during_shutdown.append( detached.wait( 0.1 ) )
+
+    connection = MagicMock()
+    connection.sock.shutdown.side_effect = Shutdown
+    cancellation._Attach( connection )
+    assert_that( cancellation.Cancel(), equal_to( True ) )
+
+    assert_that( detached.wait( 5 ), equal_to( True ) )
+    assert_that( detached_during_shutdown, contains_exactly( False ) )
+
+
+  @skipUnless( hasattr( socketserver, 'UnixStreamServer' ),
+               'Unix domain sockets are not supported' )
+  def test_ConnectionPool_UnixSocket( self ):
+    with TemporaryDirectory() as directory:
+      path = os.path.join( directory, 'ycmd.sock' )
+      server = _UnixHTTPServer( path, _Handler )
+      _StartServer( server )
+      try:
+        # Stop the TCP server so that requests can only go through the socket.
+        _StopServer( self._server )
+        self._pool.SetUnixSocket( path )
+        for _ in range( 2 ):
+          response = self._pool.Request( 'GET', self._location + '/ready' )
+          assert_that( response.read(), equal_to( b'/ready' ) )
+      finally:
+        self._pool.Reset()
+        _StopServer( server )
+
+    assert_that( server.connections, has_length( 1 ) )
+    assert_that( self._pool.Stats(), has_entries( { 'transport': 'unix',
+                                                    'opened': 1,
+                                                    'reused': 1 } ) )
+
+
+  def test_ConnectionPool_UnixSocket_FallBackToTcp( self ):
+    with TemporaryDirectory() as directory:
+      self._pool.SetUnixSocket( os.path.join( directory, 'ycmd.sock' ) )
+      response = self._pool.Request( 'GET', self._location + '/ready' )
+
+    assert_that( response.read(), equal_to( b'/ready' ) )
+    assert_that( self._pool.Stats(), has_entries( { 'transport': 'tcp',
+                                                    'opened': 1 } ) )
+    assert_that( self._pool.UnixSocketUnsupported(), equal_to( True ) )
+
+
+  def test_ConnectionPool_UnixSocket_ServerNotStarted( self ):
+    _StopServer( self._server )
+    with TemporaryDirectory() as directory:
+      self._pool.SetUnixSocket( os.path.join( directory, 'ycmd.sock' ) )
+      assert_that(
+        calling( self._pool.Request ).with_args( 'GET',
+                                                 self._location + '/ready' ),
+        raises( URLError ) )
+
+    # The socket may just not be created yet.
+    assert_that( self._pool.Stats(), has_entries( { 'transport': 'unix' } ) )
+    assert_that( self._pool.UnixSocketUnsupported(), equal_to( False ) )
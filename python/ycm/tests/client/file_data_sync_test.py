@@ -0,0 +1,206 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+from hamcrest import ( assert_that, calling, contains_exactly, equal_to,
+                       has_entries, has_entry, has_key, is_not, raises )
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from unittest import TestCase
+from urllib.error import HTTPError
+
+from ycm.client.connection_pool import ConnectionPool
+from ycm.client.file_data_sync import FileDataSync
+
+
+class _Handler( BaseHTTPRequestHandler ):
+  """Stand-in for a server supporting the file-data-versions extension. It
+  stores the contents of the files it receives and answers with the contents
+  it used for each file."""
+  protocol_version = 'HTTP/1.1'
+
+  def do_POST( self ):
+    request = json.loads(
+      self.rfile.read( int( self.headers[ 'Content-Length' ] ) ) )
+    self.server.requests.append( request )
+
+    if self.path == '/error':
+      return self._Reply( 500, { 'message': 'error' } )
+
+    contents = {}
+    for filepath, file_data in request[ 'file_data' ].items():
+      if 'contents' in file_data:
+        self.server.files[ filepath ] = ( file_data.get( 'version' ),
+                                          file_data[ 'contents' ] )
+      else:
+        version, _ = self.server.files.get( filepath, ( None, None ) )
+        if version != file_data[ 'version' ]:
+          return self._Reply( 409, { 'filepath': filepath } )
+      contents[ filepath ] = self.server.files[ filepath ][ 1 ]
+    self._Reply( 200, contents )
+
+
+  def _Reply( self, status, data ):
+    body = json.dumps( data ).encode()
+    self.send_response( status )
+    self.send_header( 'Content-Length', str( len( body ) ) )
+    if self.server.extensions:
+      self.send_header( 'X-YCM-Extensions', self.server.extensions )
+    self.end_headers()
+    self.wfile.write( body )
+
+
+  def log_message( self, *args ):
+    pass
+
+
+def _FileData( **contents ):
+  return { 'file_data': {
+    f'/{ name }': { 'contents': text, 'filetypes': [ 'cpp' ] }
+    for name, text in contents.items() } }
+
+
+class FileDataSyncTest( TestCase ):
+  def setUp( self ):
+    self._server = ThreadingHTTPServer( ( '127.0.0.1', 0 ), _Handler )
+    self._server.daemon_threads = True
+    self._server.requests = []
+    self._server.files = {}
+    self._server.extensions = 'file-data-versions'
+    self._thread = Thread( target = self._server.serve_forever )
+    self._thread.daemon = True
+    self._thread.start()
+    host, port = self._server.server_address
+    self._location = f'http://{ host }:{ port }'
+    self._pool = ConnectionPool()
+    self._sync = FileDataSync()
+
+
+  def tearDown( self ):
+    self._pool.Reset()
+    self._server.shutdown()
+    self._server.server_close()
+
+
+  def _Post( self, data, handler = 'event_notification' ):
+    def Send( data ):
+      return self._pool.Request( 'POST',
+                                 f'{ self._location }/{ handler }',
+                                 body = json.dumps( data ).encode() )
+    return json.loads( self._sync.Send( data, Send ).read() )
+
+
+  def test_FileDataSync_DisabledUntilAdvertised( self ):
+    self._server.extensions = None
+    self._Post( _FileData( a = 'a\n' ) )
+    self._Post( _FileData( a = 'a\n' ) )
+
+    assert_that( self._server.requests, contains_exactly(
+      _FileData( a = 'a\n' ),
+      _FileData( a = 'a\n' )
+    ) )
+    assert_that( self._sync.Stats(), has_entries( { 'enabled': False,
+                                                    'skipped': 0 } ) )
+
+
+  def test_FileDataSync_SkipsUnchangedContents( self ):
+    # The first response tells the client that the extension is supported.
+    self._Post( _FileData( a = 'a\n', b = 'b\n' ) )
+    self._Post( _FileData( a = 'a\n', b = 'b\n' ) )
+    response = self._Post( _FileData( a = 'a\n', b = 'b2\n' ) )
+
+    assert_that( response, equal_to( { '/a': 'a\n', '/b': 'b2\n' } ) )
+    requests = self._server.requests
+    assert_that( requests[ 1 ][ 'file_data' ], has_entries( {
+      '/a': has_entry( 'contents', 'a\n' ),
+      '/b': has_entry( 'contents', 'b\n' )
+    } ) )
+    assert_that( requests[ 2 ][ 'file_data' ], has_entries( {
+      '/a': is_not( has_key( 'contents' ) ),
+      '/b': has_entry( 'contents', 'b2\n' )
+    } ) )
+    assert_that( requests[ 2 ][ 'file_data' ][ '/a' ],
+                 has_entries( { 'filetypes': [ 'cpp' ],
+                                'version': requests[ 1 ][ 'file_data' ][ '/a' ][
+                                  'version' ] } ) )
+    assert_that( self._sync.Stats(), has_entries( { 'enabled': True,
+                                                    'sent': 3,
+                                                    'skipped': 1,
+                                                    'resynced': 0 } ) )
+
+
+  def test_FileDataSync_HashesChangedBuffersOnly( self ):
+    # The cache of buffer contents returns the same file data until the
+    # changedtick of the buffer changes.
+    unchanged = _FileData( a = 'a\n' )
+    self._Post( unchanged )
+    self._Post( unchanged )
+    self._Post( unchanged )
+    assert_that( self._sync.Stats(), has_entries( { 'hashed': 1,
+                                                    'skipped': 1 } ) )
+
+    # The buffer was modified then undone: its contents are hashed again but
+    # still known by the server.
+    self._Post( _FileData( a = 'a\n' ) )
+    assert_that( self._sync.Stats(), has_entries( { 'hashed': 2,
+                                                    'skipped': 2 } ) )
+
+
+  def test_FileDataSync_ResyncsOnVersionMismatch( self ):
+    self._Post( _FileData( a = 'a\n' ) )
+    self._Post( _FileData( a = 'a\n' ) )
+    # The server lost track of the file, e.g. it evicted it from its cache.
+    self._server.files.clear()
+    response = self._Post( _FileData( a = 'a\n' ) )
+
+    assert_that( response, equal_to( { '/a': 'a\n' } ) )
+    assert_that( self._server.requests[ -1 ][ 'file_data' ][ '/a' ],
+                 has_entry( 'contents', 'a\n' ) )
+    assert_that( self._sync.Stats(), has_entries( { 'resynced': 1 } ) )
+
+
+  def test_FileDataSync_ErrorNotAcknowledged( self ):
+    self._Post( _FileData( a = 'a\n' ) )
+    assert_that( calling( self._Post ).with_args( _FileData( a = 'a2\n' ),
+                                                  'error' ),
+                 raises( HTTPError ) )
+    self._Post( _FileData( a = 'a2\n' ) )
+
+    assert_that( self._server.requests[ -1 ][ 'file_data' ][ '/a' ],
+                 has_entry( 'contents', 'a2\n' ) )
+
+
+  def test_FileDataSync_Reset( self ):
+    self._Post( _FileData( a = 'a\n' ) )
+    self._Post( _FileData( a = 'a\n' ) )
+    self._sync.Reset()
+    self._Post( _FileData( a = 'a\n' ) )
+
+    assert_that( self._server.requests[ -1 ],
+                 equal_to( _FileData( a = 'a\n' ) ) )
+    assert_that( self._sync.Stats(), has_entries( { 'enabled': True } ) )
+
+
+  def test_FileDataSync_RequestWithoutFileData( self ):
+    self._Post( _FileData( a = 'a\n' ) )
+
+    def Send( data ):
+      return self._pool.Request( 'POST',
+                                 f'{ self._location }/error',
+                                 body = json.dumps( data ).encode() )
+    assert_that( calling( self._sync.Send ).with_args( {}, Send ),
+                 raises( HTTPError ) )
@@ -0,0 +1,61 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+from hamcrest import ( assert_that, calling, equal_to, instance_of, is_in,
+                       raises )
+from unittest import TestCase
+from unittest.mock import patch
+from ycm.client import json_codec
+
+
+class JsonCodecTest( TestCase ):
+  def test_JsonCodec_RoundTrip( self ):
+    data = { 'contents': 'foö \U0001f600\n', 'line_num': 1, 'ok': True,
+             'items': [ None, 1.5, [] ] }
+    encoded = json_codec.Dumps( data )
+
+    assert_that( encoded, instance_of( bytes ) )
+    assert_that( json.loads( encoded ), equal_to( data ) )
+    assert_that( json_codec.Loads( encoded ), equal_to( data ) )
+    assert_that( json_codec.Loads( encoded.decode( 'utf-8' ) ),
+                 equal_to( data ) )
+
+
+  def test_JsonCodec_LikeStandardLibrary( self ):
+    # Integer keys are converted to strings and large integers are supported.
+    data = { 1: 2 ** 70 }
+    assert_that( json.loads( json_codec.Dumps( data ) ),
+                 equal_to( { '1': 2 ** 70 } ) )
+
+
+  def test_JsonCodec_InvalidJson( self ):
+    assert_that( calling( json_codec.Loads ).with_args( b'{"a":' ),
+                 raises( ValueError ) )
+
+
+  def test_JsonCodec_Name( self ):
+    assert_that( json_codec.Name(), is_in( [ 'orjson', 'ujson', 'json' ] ) )
+
+
+  def test_JsonCodec_StandardLibraryFallback( self ):
+    with patch.dict( 'sys.modules', { 'orjson': None, 'ujson': None } ):
+      codec = json_codec._FindCodec()
+
+    assert_that( codec.name, equal_to( 'json' ) )
+    assert_that( codec.Loads( codec.Dumps( { 'a': [ 1 ] } ) ),
+                 equal_to( { 'a': [ 1 ] } ) )
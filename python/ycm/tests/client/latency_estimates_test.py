@@ -0,0 +1,66 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+from hamcrest import assert_that, close_to, equal_to, has_entries, none
+from unittest import TestCase
+from ycm.client.latency_estimates import LatencyEstimates
+
+
+class LatencyEstimatesTest( TestCase ):
+  def test_LatencyEstimates_Unknown( self ):
+    estimates = LatencyEstimates()
+    assert_that( estimates.FirstPollDelay( 'completion' ), none() )
+    assert_that( estimates.Stats(), equal_to( {} ) )
+
+
+  def test_LatencyEstimates_FirstSample( self ):
+    estimates = LatencyEstimates()
+    estimates.Record( 'completion', 0.2 )
+
+    assert_that( estimates.FirstPollDelay( 'completion' ),
+                 close_to( 0.1, 1e-9 ) )
+    assert_that( estimates.FirstPollDelay( 'inlay_hints' ), none() )
+    assert_that( estimates.Stats(), equal_to( {
+      'completion': { 'mean': 200, 'deviation': 100, 'samples': 1 }
+    } ) )
+
+
+  def test_LatencyEstimates_Converge( self ):
+    estimates = LatencyEstimates()
+    estimates.Record( 'completion', 1.0 )
+    for _ in range( 100 ):
+      estimates.Record( 'completion', 0.05 )
+
+    # The first poll is a bit early as long as the latency varies, and right on
+    # time once it is steady.
+    assert_that( estimates.FirstPollDelay( 'completion' ),
+                 close_to( 0.05, 1e-3 ) )
+    assert_that( estimates.Stats()[ 'completion' ],
+                 has_entries( { 'mean': 50, 'deviation': 0, 'samples': 101 } ) )
+
+
+  def test_LatencyEstimates_Variable( self ):
+    estimates = LatencyEstimates()
+    for _ in range( 50 ):
+      estimates.Record( 'semantic_highlighting', 0.1 )
+      estimates.Record( 'semantic_highlighting', 0.3 )
+
+    stats = estimates.Stats()[ 'semantic_highlighting' ]
+    assert_that( stats[ 'mean' ], close_to( 200, 20 ) )
+    assert_that( stats[ 'deviation' ], close_to( 100, 10 ) )
+    assert_that( estimates.FirstPollDelay( 'semantic_highlighting' ),
+                 close_to( 0.1, 0.03 ) )
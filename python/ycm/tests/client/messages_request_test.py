@@ -22,10 +22,19 @@ from hamcrest import assert_that, equal_to
 from unittest import TestCase
 from unittest.mock import patch, call
 
-from ycm.client.messages_request import _HandlePollResponse
+from ycm.client.messages_request import ( MultiplexedMessagesPoll,
+                                          _HandlePollResponse )
+from ycm.tests.mock_utils import ( MockAsyncServerResponseDone,
+                                   MockAsyncServerResponseInProgress )
 from ycm.tests.test_utils import ExtendedMock
 
 
+def _Subscriptions( *filetypes ):
+  return { 'subscriptions': [ { 'filetype': filetype,
+                                'filepath': f'/foo.{ filetype }' }
+                              for filetype in filetypes ] }
+
+
 class MessagesRequestTest( TestCase ):
   def test_HandlePollResponse_NoMessages( self ):
     assert_that( _HandlePollResponse( True, None ), equal_to( True ) )
@@ -138,3 +147,94 @@ class MessagesRequestTest( TestCase ):
             warning=False,
             truncate=True ),
     ] )
+
+
+  @patch( 'ycm.client.base_request._ValidateResponseObject',
+          return_value = True )
+  @patch( 'ycm.client.messages_request.PostVimMessage',
+          new_callable = ExtendedMock )
+  @patch( 'ycm.client.base_request.BaseRequest.PostDataToHandlerAsync' )
+  def test_MultiplexedMessagesPoll( self, post_data, post_vim_message, *args ):
+    diagnostics_handler = ExtendedMock()
+    poll = MultiplexedMessagesPoll()
+    poll.Subscribe( 'java', '/foo.java' )
+    poll.Subscribe( 'python', '/foo.python' )
+    poll.Subscribe( 'java', '/bar.java' )
+
+    post_data.return_value = MockAsyncServerResponseInProgress()
+    assert_that( poll.Poll( diagnostics_handler ), equal_to( True ) )
+    assert_that( poll.Poll( diagnostics_handler ), equal_to( True ) )
+    # A single request is sent for all the filetypes.
+    post_data.assert_called_once()
+    assert_that( post_data.call_args[ 0 ][ 0 ],
+                 equal_to( _Subscriptions( 'java', 'python' ) ) )
+
+    post_data.reset_mock()
+    post_data.return_value = MockAsyncServerResponseDone( {
+      'messages': [
+        { 'message': 'Indexing' },
+        { 'filepath': '/foo.java', 'diagnostics': [ 'PLACEHOLDER' ] },
+      ],
+      'unsubscribed': [ 'python' ]
+    } )
+    poll._response_future = post_data.return_value
+    assert_that( poll.Poll( diagnostics_handler ), equal_to( True ) )
+
+    post_vim_message.assert_has_exact_calls( [
+      call( 'Indexing', warning = False, truncate = True )
+    ] )
+    diagnostics_handler.UpdateWithNewDiagnosticsForFile.assert_has_exact_calls(
+      [ call( '/foo.java', [ 'PLACEHOLDER' ] ) ] )
+    assert_that( poll.Polling( 'java' ), equal_to( True ) )
+    assert_that( poll.Polling( 'python' ), equal_to( False ) )
+    # The next poll only subscribes to the remaining filetypes.
+    assert_that( post_data.call_args[ 0 ][ 0 ],
+                 equal_to( _Subscriptions( 'java' ) ) )
+
+    # Unsubscribed filetypes are not polled again.
+    poll.Subscribe( 'python', '/foo.python' )
+    assert_that( poll.Polling( 'python' ), equal_to( False ) )
+
+
+  @patch( 'ycm.client.base_request._ValidateResponseObject',
+          return_value = True )
+  @patch( 'ycm.client.base_request.BaseRequest.PostDataToHandlerAsync',
+          return_value = MockAsyncServerResponseInProgress() )
+  def test_MultiplexedMessagesPoll_NewSubscription( self, post_data, *args ):
+    diagnostics_handler = ExtendedMock()
+    poll = MultiplexedMessagesPoll()
+    poll.Subscribe( 'java', '/foo.java' )
+    poll.Poll( diagnostics_handler )
+
+    # The poll in progress isn't cancelled: the messages the server took off
+    # its queue for it would be lost.
+    with patch.object( poll, 'Cancel' ) as cancel:
+      poll.Subscribe( 'python', '/foo.python' )
+      assert_that( poll.Poll( diagnostics_handler ), equal_to( True ) )
+      cancel.assert_not_called()
+    post_data.assert_called_once()
+
+    # A message arrives for the poll in progress. The next poll has all the
+    # subscriptions.
+    poll._response_future = MockAsyncServerResponseDone( {
+      'messages': [
+        { 'filepath': '/foo.java', 'diagnostics': [ 'PLACEHOLDER' ] } ] } )
+    assert_that( poll.Poll( diagnostics_handler ), equal_to( True ) )
+    diagnostics_handler.UpdateWithNewDiagnosticsForFile.assert_has_exact_calls(
+      [ call( '/foo.java', [ 'PLACEHOLDER' ] ) ] )
+    assert_that( post_data.call_count, equal_to( 2 ) )
+    assert_that( post_data.call_args[ 0 ][ 0 ],
+                 equal_to( _Subscriptions( 'java', 'python' ) ) )
+
+
+  @patch( 'ycm.client.base_request._ValidateResponseObject',
+          return_value = True )
+  @patch( 'ycm.client.base_request.BaseRequest.PostDataToHandlerAsync' )
+  def test_MultiplexedMessagesPoll_StopPolling( self, post_data, *args ):
+    poll = MultiplexedMessagesPoll()
+    poll.Subscribe( 'java', '/foo.java' )
+    poll._response_future = MockAsyncServerResponseDone( False )
+
+    assert_that( poll.Poll( None ), equal_to( False ) )
+    assert_that( poll.Polling( 'java' ), equal_to( False ) )
+    post_data.assert_not_called()
@@ -0,0 +1,166 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+from concurrent.futures import CancelledError
+from hamcrest import ( assert_that, calling, contains_exactly, equal_to,
+                       has_entries, instance_of, is_not, raises,
+                       same_instance )
+from io import BytesIO
+from unittest import TestCase
+from unittest.mock import MagicMock
+from urllib.error import HTTPError
+from urllib.response import addinfourl
+
+from ycm.client.connection_pool import Cancellation
+from ycm.client.request_batch import ( BatchBody, BatchedRequest,
+                                       RequestBatch, SplitBatchResponse )
+
+
+def _Request( method, handler, data = None, payload = None ):
+  return BatchedRequest( method, handler, data, payload, 30, None, 2 )
+
+
+def _Response( items ):
+  return addinfourl( BytesIO( json.dumps( items ).encode() ), {}, '', 200 )
+
+
+class RequestBatchTest( TestCase ):
+  def test_RequestBatch_RequestData( self ):
+    batch = RequestBatch()
+    build = MagicMock( side_effect = lambda: { 'filepath': '/foo',
+                                               'file_data': {} } )
+    first = batch.RequestData( None, build )
+    first[ 'event_name' ] = 'BufferVisit'
+    second = batch.RequestData( None, build )
+
+    assert_that( build.call_count, equal_to( 1 ) )
+    assert_that( second, equal_to( { 'filepath': '/foo', 'file_data': {} } ) )
+    assert_that( second[ 'file_data' ], same_instance( first[ 'file_data' ] ) )
+
+    batch.RequestData( 2, build )
+    assert_that( build.call_count, equal_to( 2 ) )
+
+
+  def test_RequestBatch_Nested( self ):
+    batch = RequestBatch()
+    batch.Open()
+    batch.Open()
+    assert_that( batch.Close(), equal_to( False ) )
+    assert_that( batch.Close(), equal_to( True ) )
+
+
+  def test_RequestBatch_TakeRequests( self ):
+    batch = RequestBatch()
+    request = _Request( 'POST', 'event_notification', {} )
+    future = batch.Add( request )
+
+    assert_that( batch.Contains( future ), equal_to( True ) )
+    assert_that( batch.TakeRequests(), contains_exactly( request ) )
+    assert_that( batch.Contains( future ), equal_to( False ) )
+
+
+  def test_BatchBody_SharedFileData( self ):
+    file_data = { '/foo': { 'contents': 'foo', 'filetypes': [ 'cpp' ] } }
+    other_file_data = { '/bar': { 'contents': 'bar', 'filetypes': [ 'c' ] } }
+    cancellation = Cancellation()
+    requests = [
+      _Request( 'POST', 'event_notification', { 'event_name': 'BufferVisit',
+                                                'file_data': file_data } ),
+      _Request( 'GET', 'signature_help_available', '',
+                { 'subserver': 'cpp' } ),
+      BatchedRequest( 'POST', 'semantic_tokens', { 'file_data': file_data },
+                      None, 30, cancellation, 3 ),
+      _Request( 'POST', 'inlay_hints', { 'file_data': other_file_data } ),
+    ]
+
+    assert_that( BatchBody( requests ), equal_to( {
+      'file_data': file_data,
+      'requests': [
+        { 'method': 'POST',
+          'handler': 'event_notification',
+          'data': { 'event_name': 'BufferVisit' } },
+        { 'method': 'GET',
+          'handler': 'signature_help_available',
+          'payload': { 'subserver': 'cpp' } },
+        { 'method': 'POST',
+          'handler': 'semantic_tokens',
+          'data': {},
+          'request_id': cancellation.request_id },
+        { 'method': 'POST',
+          'handler': 'inlay_hints',
+          'data': { 'file_data': other_file_data } },
+      ]
+    } ) )
+    # The request data is left untouched.
+    assert_that( requests[ 0 ].data, has_entries( { 'file_data': file_data } ) )
+
+
+  def test_SplitBatchResponse( self ):
+    validate = MagicMock()
+    responses = SplitBatchResponse( 'http://127.0.0.1:1234/batch', _Response( [
+      { 'status': 200, 'headers': { 'X-Ycm-Hmac': 'abc' }, 'body': '[]' },
+      { 'status': 500, 'reason': 'Error', 'body': '{"message": "boom"}' },
+    ] ), 2, validate )
+
+    validate.assert_called_once()
+    assert_that( responses[ 0 ], is_not( instance_of( HTTPError ) ) )
+    assert_that( responses[ 0 ].read(), equal_to( b'[]' ) )
+    assert_that( responses[ 0 ].headers[ 'x-ycm-hmac' ], equal_to( 'abc' ) )
+    assert_that( responses[ 1 ], instance_of( HTTPError ) )
+    assert_that( responses[ 1 ].code, equal_to( 500 ) )
+    assert_that( responses[ 1 ].read(), equal_to( b'{"message": "boom"}' ) )
+
+
+  def test_SplitBatchResponse_WrongCount( self ):
+    assert_that(
+      calling( SplitBatchResponse ).with_args( '', _Response( [] ), 1,
+                                               MagicMock() ),
+      raises( RuntimeError, 'Received 0 responses for a batch of 1' ) )
+
+
+  def test_SplitBatchResponse_InvalidHmac( self ):
+    validate = MagicMock( side_effect = RuntimeError( 'Invalid HMAC' ) )
+    assert_that(
+      calling( SplitBatchResponse ).with_args( '', _Response( [
+        { 'status': 200, 'headers': { 'X-Ycm-Hmac': 'abc' }, 'body': '[]' }
+      ] ), 1, validate ),
+      raises( RuntimeError, 'Invalid HMAC' ) )
+
+
+  def test_BatchedRequest_Cancelled( self ):
+    cancellation = Cancellation()
+    request = BatchedRequest( 'POST', 'semantic_tokens', {}, None, 30,
+                              cancellation, 3 )
+    cancellation.Cancel()
+
+    assert_that( request.Start(), equal_to( False ) )
+    assert_that( calling( request.future.result ).with_args( timeout = 0 ),
+                 raises( CancelledError ) )
+
+
+  def test_BatchedRequest_CancelledInFlight( self ):
+    cancellation = Cancellation()
+    request = BatchedRequest( 'POST', 'semantic_tokens', {}, None, 30,
+                              cancellation, 3 )
+    assert_that( request.Start(), equal_to( True ) )
+    cancellation.Cancel()
+    request.SetResponse( _Response( [] ) )
+
+    assert_that( calling( request.future.result ).with_args( timeout = 0 ),
+                 raises( CancelledError ) )
+    assert_that( cancellation.Cancel(), equal_to( False ) )
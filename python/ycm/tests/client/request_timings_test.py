@@ -0,0 +1,89 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+from hamcrest import ( assert_that, close_to, contains_exactly, equal_to,
+                       has_entries, none )
+from unittest import TestCase
+from unittest.mock import patch
+from ycm.client.request_timings import ( RequestTimer, RequestTimings,
+                                         ServerTime )
+
+
+class RequestTimingsTest( TestCase ):
+  def test_RequestTimings_Percentiles( self ):
+    timings = RequestTimings()
+    for sample in range( 1, 101 ):
+      timings.Record( 'completions', 'cpp', 'http', sample / 1000 )
+    timings.Record( 'completions', 'cpp', 'build', 0.002 )
+    timings.Record( 'completions', 'c', 'http', 0.004 )
+
+    assert_that( timings.Percentiles(), contains_exactly(
+      has_entries( { 'handler': 'completions', 'filetype': 'c',
+                     'phase': 'http', 'count': 1,
+                     'p50': close_to( 4, 1e-6 ), 'p99': close_to( 4, 1e-6 ) } ),
+      # Phases are sorted in the order they happen.
+      has_entries( { 'filetype': 'cpp', 'phase': 'build', 'count': 1 } ),
+      has_entries( { 'filetype': 'cpp', 'phase': 'http', 'count': 100,
+                     'p50': close_to( 50, 1e-6 ),
+                     'p95': close_to( 95, 1e-6 ),
+                     'p99': close_to( 99, 1e-6 ) } ),
+    ) )
+
+
+  def test_RequestTimings_Bounded( self ):
+    timings = RequestTimings( max_samples = 3 )
+    for sample in range( 5 ):
+      timings.Record( 'semantic_tokens', 'java', 'decode', sample )
+
+    samples = timings.Samples()
+    assert_that( samples, equal_to( [ {
+      'handler': 'semantic_tokens',
+      'filetype': 'java',
+      'phase': 'decode',
+      'samples': [ 2000, 3000, 4000 ]
+    } ] ) )
+    # The samples can be dumped as is.
+    assert_that( json.loads( json.dumps( samples ) ), equal_to( samples ) )
+
+
+  @patch( 'ycm.client.request_timings.monotonic',
+          side_effect = [ 10, 10.5, 10.75, 11, 12 ] )
+  def test_RequestTimer( self, *args ):
+    timings = RequestTimings()
+    timer = RequestTimer( timings, 'completions', 'cpp' )
+    with timer.Time( 'encode' ):
+      pass
+    timer.OnResponse()
+    timer.RecordSince( 'total', timer.start_time )
+
+    assert_that( timings.Samples(), contains_exactly(
+      has_entries( { 'phase': 'encode', 'samples': [ 250 ] } ),
+      has_entries( { 'phase': 'response', 'samples': [ 1000 ] } ),
+      has_entries( { 'phase': 'total', 'samples': [ 2000 ] } ),
+    ) )
+
+
+  def test_ServerTime( self ):
+    assert_that( ServerTime( {} ), none() )
+    assert_that( ServerTime( { 'server-timing': 'miss' } ), none() )
+    assert_that( ServerTime( { 'server-timing': 'app;dur=bad' } ), none() )
+    assert_that( ServerTime( { 'server-timing': 'app;dur=12.5' } ),
+                 close_to( 0.0125, 1e-9 ) )
+    assert_that( ServerTime( {
+      'server-timing': 'app;desc="Completer";dur=10, parse; dur=5, cache' } ),
+      close_to( 0.015, 1e-9 ) )
@@ -0,0 +1,98 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+import socket
+from hamcrest import assert_that, equal_to, has_entries
+from time import sleep, time
+from unittest import TestCase
+from ycm.client.response_notifier import ResponseNotifier
+
+
+def _WaitFor( predicate, timeout = 5 ):
+  deadline = time() + timeout
+  while not predicate() and time() < deadline:
+    sleep( 0.01 )
+
+
+def _Connect( address, token ):
+  host, port = address.split( ':' )
+  channel = socket.create_connection( ( host, int( port ) ), timeout = 5 )
+  channel.sendall( f'{ token }\n'.encode() )
+  return channel
+
+
+def _ReadLine( channel ):
+  line = b''
+  while not line.endswith( b'\n' ):
+    line += channel.recv( 1 )
+  return line
+
+
+class ResponseNotifierTest( TestCase ):
+  def setUp( self ):
+    self._notifier = ResponseNotifier()
+    self._address = self._notifier.Start()
+
+
+  def tearDown( self ):
+    self._notifier.Stop()
+
+
+  def test_ResponseNotifier_Notify( self ):
+    # Nothing to notify yet.
+    self._notifier.Notify( 'completion' )
+
+    with _Connect( self._address, self._notifier.token ) as channel:
+      _WaitFor( self._notifier.Connected )
+      self._notifier.Notify( 'completion' )
+      self._notifier.Notify( 'inlay_hints' )
+
+      assert_that( _ReadLine( channel ), equal_to( b'completion\n' ) )
+      assert_that( _ReadLine( channel ), equal_to( b'inlay_hints\n' ) )
+    assert_that( self._notifier.Stats(), has_entries( { 'connected': True,
+                                                        'sent': 2 } ) )
+
+
+  def test_ResponseNotifier_WrongToken( self ):
+    with _Connect( self._address, 'not the token' ) as channel:
+      # The connection is closed without being notified.
+      assert_that( channel.recv( 1 ), equal_to( b'' ) )
+    assert_that( self._notifier.Connected(), equal_to( False ) )
+
+    # The right client can still connect.
+    with _Connect( self._address, self._notifier.token ):
+      _WaitFor( self._notifier.Connected )
+      assert_that( self._notifier.Connected(), equal_to( True ) )
+
+
+  def test_ResponseNotifier_NewClientReplacesPrevious( self ):
+    with _Connect( self._address, self._notifier.token ) as first:
+      _WaitFor( self._notifier.Connected )
+      with _Connect( self._address, self._notifier.token ) as second:
+        assert_that( first.recv( 1 ), equal_to( b'' ) )
+        self._notifier.Notify( 'completion' )
+        assert_that( _ReadLine( second ), equal_to( b'completion\n' ) )
+
+
+  def test_ResponseNotifier_ClientGone( self ):
+    with _Connect( self._address, self._notifier.token ):
+      _WaitFor( self._notifier.Connected )
+
+    # Writing to a closed connection may only fail on the second attempt.
+    _WaitFor( lambda: ( self._notifier.Notify( 'completion' ) or
+                        not self._notifier.Connected() ) )
+    assert_that( self._notifier.Connected(), equal_to( False ) )
@@ -0,0 +1,211 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+from ycm.tests.test_utils import MockVimBuffers, MockVimModule, VimBuffer
+MockVimModule()
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from base64 import b64encode
+from concurrent.futures import wait
+from hamcrest import assert_that, contains_exactly, equal_to, has_entries
+from unittest import TestCase
+from unittest.mock import patch
+
+import ycm
+import ycmd
+from ycm.benchmarks.fake_ycmd import EXTENSIONS
+from ycm.client.base_request import BaseRequest, BuildRequestData, Server
+from ycm.client.completion_request import CompletionRequest
+from ycm.client.event_notification import EventNotification
+from ycm.client.messages_request import MultiplexedMessagesPoll
+from ycm.tests import WaitUntilReady
+from ycmd import utils
+
+# The cursor is at the end of the first line of the buffer.
+_CURSOR = ( 1, 9 )
+
+
+def _StartFakeServer():
+  """Starts the fake ycmd of the benchmarks with all the protocol extensions
+  and returns its process, location and HMAC secret."""
+  hmac_secret = os.urandom( 16 )
+  with tempfile.NamedTemporaryFile( delete = False,
+                                    mode = 'w+' ) as options_file:
+    json.dump( { 'hmac_secret': utils.ToUnicode( b64encode( hmac_secret ) ) },
+               options_file )
+  port = utils.GetUnusedLocalhostPort()
+  python_path = [ os.path.dirname( os.path.dirname( package.__file__ ) )
+                  for package in ( ycm, ycmd ) ]
+  server = subprocess.Popen(
+    [ sys.executable, '-m', 'ycm.benchmarks.fake_ycmd',
+      f'--port={ port }',
+      f'--options_file={ options_file.name }',
+      '--completions=2',
+      '--diagnostics=1' ],
+    env = dict( os.environ, PYTHONPATH = os.pathsep.join( python_path ) ) )
+  return server, f'http://127.0.0.1:{ port }', hmac_secret
+
+
+def _Stats():
+  return BaseRequest().GetDataFromHandler( 'stats' )
+
+
+def _WaitForStats( matcher, timeout = 5 ):
+  expiration = time.monotonic() + timeout
+  while True:
+    stats = _Stats()
+    if matcher.matches( stats ) or time.monotonic() > expiration:
+      return stats
+    time.sleep( 0.01 )
+
+
+class ServerExtensionsTest( TestCase ):
+  """Checks that the client negotiates the protocol extensions with a server
+  that supports them."""
+
+  @classmethod
+  def setUpClass( cls ):
+    cls._server, cls._location, cls._hmac_secret = _StartFakeServer()
+
+
+  @classmethod
+  def tearDownClass( cls ):
+    cls._server.terminate()
+    cls._server.wait()
+
+
+  def setUp( self ):
+    self._buffer = VimBuffer( os.path.realpath( 'extensions.cpp' ),
+                              contents = [ 'candidate', 'int candidates;' ],
+                              filetype = 'cpp' )
+    self._patches = [
+      MockVimBuffers( [ self._buffer ], [ self._buffer ], _CURSOR ),
+      patch.object( BaseRequest, 'server_location', self._location ),
+      patch.object( BaseRequest, 'hmac_secret', self._hmac_secret ),
+      patch.object( BaseRequest, 'server_extensions', set() ) ]
+    for context in self._patches:
+      context.__enter__()
+    BaseRequest.ConnectionPool().Reset()
+    BaseRequest.FileDataSync().Reset()
+    WaitUntilReady()
+
+
+  def tearDown( self ):
+    BaseRequest.ConnectionPool().Reset()
+    BaseRequest.FileDataSync().Reset()
+    for context in reversed( self._patches ):
+      context.__exit__( None, None, None )
+
+
+  def test_ServerExtensions_Advertised( self ):
+    assert_that( BaseRequest.server_extensions, equal_to( set( EXTENSIONS ) ) )
+
+
+  def test_ServerExtensions_Batch( self ):
+    received = _Stats()[ 'received' ]
+    BaseRequest.StartRequestBatch()
+    try:
+      visit = EventNotification( 'BufferVisit', self._buffer.number )
+      visit.Start()
+      parse = EventNotification( 'FileReadyToParse', self._buffer.number )
+      parse.Start()
+    finally:
+      BaseRequest.FlushRequestBatch()
+    wait( [ visit._response_future, parse._response_future ] )
+
+    assert_that( visit.Done(), equal_to( True ) )
+    assert_that( parse.Response(), contains_exactly(
+      has_entries( { 'text': 'diagnostic 0' } ) ) )
+    assert_that( _Stats()[ 'received' ], has_entries( {
+      'batch': received.get( 'batch', 0 ) + 1,
+      'event_notification': received.get( 'event_notification', 0 ) + 2 } ) )
+
+
+  def test_ServerExtensions_Server( self ):
+    # Requests to a server other than the current one, like a server replacing
+    # it, aren't batched and always send the contents of the buffers.
+    server = Server( self._location, self._hmac_secret )
+    received = _Stats()[ 'received' ]
+    stats = BaseRequest.FileDataSync().Stats()
+    BaseRequest.StartRequestBatch()
+    try:
+      parse = EventNotification( 'FileReadyToParse',
+                                 self._buffer.number,
+                                 server = server )
+      parse.Start()
+      wait( [ parse._response_future ] )
+    finally:
+      BaseRequest.FlushRequestBatch()
+
+    assert_that( parse.Response(), contains_exactly(
+      has_entries( { 'text': 'diagnostic 0' } ) ) )
+    assert_that( _Stats()[ 'received' ], has_entries( {
+      'batch': received.get( 'batch', 0 ),
+      'event_notification': received.get( 'event_notification', 0 ) + 1 } ) )
+    assert_that( BaseRequest.FileDataSync().Stats(), equal_to( stats ) )
+    server.connection_pool.Reset()
+
+
+  def test_ServerExtensions_FileDataVersions( self ):
+    stats = BaseRequest.FileDataSync().Stats()
+    for _ in range( 2 ):
+      request = CompletionRequest( BuildRequestData() )
+      request.Start()
+      wait( [ request._response_future ] )
+      assert_that( request.Response()[ 'completions' ], contains_exactly(
+        has_entries( { 'word': 'candidate_0' } ),
+        has_entries( { 'word': 'candidate_1' } ) ) )
+
+    # The second request didn't send the contents of the unchanged buffer.
+    assert_that( BaseRequest.FileDataSync().Stats(), has_entries( {
+      'enabled': True,
+      'sent': stats[ 'sent' ] + 1,
+      'skipped': stats[ 'skipped' ] + 1,
+      'resynced': stats[ 'resynced' ] } ) )
+
+
+  def test_ServerExtensions_MultiplexedMessagesAndCancelRequest( self ):
+    stats = _Stats()
+    received = stats[ 'received' ].get( 'receive_messages', 0 )
+    cancelled = stats[ 'cancelled' ]
+    dropped = BaseRequest.dropped_requests[ 'receive_messages' ]
+    poll = MultiplexedMessagesPoll()
+    poll.Subscribe( 'cpp', self._buffer.name )
+    assert_that( poll.Poll( None ), equal_to( True ) )
+    _WaitForStats( has_entries( {
+      'received': has_entries( { 'receive_messages': received + 1 } ) } ) )
+
+    # The poll in progress isn't replaced for a new subscription.
+    poll.Subscribe( 'python', '/extensions.py' )
+    assert_that( poll.Poll( None ), equal_to( True ) )
+    assert_that( _Stats(), has_entries( {
+      'received': has_entries( { 'receive_messages': received + 1 } ),
+      'cancelled': cancelled } ) )
+    assert_that( BaseRequest.dropped_requests[ 'receive_messages' ],
+                 equal_to( dropped ) )
+
+    # The server is asked to stop working on a poll that isn't needed anymore.
+    poll.Cancel()
+    expected_stats = has_entries( { 'cancelled': cancelled + 1 } )
+    assert_that( _WaitForStats( expected_stats ), expected_stats )
+    assert_that( BaseRequest.dropped_requests[ 'receive_messages' ],
+                 equal_to( dropped + 1 ) )
@@ -0,0 +1,80 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+from ycm.tests.test_utils import MockVimModule
+MockVimModule()
+
+from hamcrest import assert_that, close_to, equal_to, has_entries
+from unittest import TestCase
+from unittest.mock import patch
+
+from ycm.client.ycmd_keepalive import YcmdKeepalive
+
+
+class YcmdKeepaliveTest( TestCase ):
+  @patch( 'ycm.client.ycmd_keepalive.time.monotonic', return_value = 100 )
+  def test_YcmdKeepalive_TimeUntilPing( self, *args ):
+    keepalive = YcmdKeepalive( ping_interval_seconds = 60 )
+
+    with patch( 'ycm.client.base_request.BaseRequest.ConnectionPool' ) as pool:
+      connection_pool = pool.return_value
+      connection_pool.LastActivity.return_value = None
+      assert_that( keepalive._TimeUntilPing(), equal_to( 60 ) )
+
+      # Responses to other requests delay the ping.
+      connection_pool.LastActivity.return_value = 130
+      assert_that( keepalive._TimeUntilPing(), equal_to( 90 ) )
+
+
+  @patch( 'ycm.client.ycmd_keepalive.time.monotonic',
+          side_effect = [ 0, 10, 10.05 ] )
+  @patch( 'ycm.client.base_request.BaseRequest.'
+          'GetDataFromHandlerInBackground', return_value = True )
+  def test_YcmdKeepalive_Ping_Healthy( self, *args ):
+    keepalive = YcmdKeepalive()
+    assert_that( keepalive.Stats(), has_entries( { 'pings': 0,
+                                                   'status': 'unknown' } ) )
+
+    keepalive._Ping()
+    assert_that( keepalive.Stats(), has_entries( {
+      'pings': 1,
+      'round_trip_time': close_to( 50, 1 ),
+      'status': 'healthy'
+    } ) )
+
+
+  @patch( 'ycm.client.ycmd_keepalive.time.monotonic',
+          side_effect = [ 0, 10, 13 ] )
+  @patch( 'ycm.client.base_request.BaseRequest.'
+          'GetDataFromHandlerInBackground', return_value = True )
+  def test_YcmdKeepalive_Ping_Slow( self, *args ):
+    keepalive = YcmdKeepalive()
+    keepalive._Ping()
+    assert_that( keepalive.Stats(), has_entries( { 'round_trip_time': 3000,
+                                                   'status': 'slow' } ) )
+
+
+  @patch( 'ycm.client.base_request.BaseRequest.'
+          'GetDataFromHandlerInBackground', return_value = None )
+  def test_YcmdKeepalive_Ping_Unresponsive( self, *args ):
+    keepalive = YcmdKeepalive()
+    keepalive._Ping()
+    assert_that( keepalive.Stats(), has_entries( {
+      'pings': 1,
+      'round_trip_time': None,
+      'status': 'unresponsive'
+    } ) )
@@ -24,10 +24,13 @@ from hamcrest import ( assert_that,
                        contains_exactly,
                        empty,
                        equal_to,
-                       has_entries )
+                       has_entries,
+                       has_item,
+                       only_contains )
 from unittest import TestCase
 from unittest.mock import call, MagicMock, patch
 
+from ycm.client.request_timings import RequestTimings
 from ycm.tests import PathToTestFile, YouCompleteMeInstance
 from ycmd.responses import ServerError
 
@@ -482,3 +485,30 @@ class CompletionTest( TestCase ):
         post_vim_message.assert_has_exact_calls( [
           call( 'Server error', truncate = True )
         ] )
+
+
+  @YouCompleteMeInstance()
+  @patch( 'ycm.client.base_request.BaseRequest.request_timings',
+          new_callable = RequestTimings )
+  def test_SendCompletionRequest_TimingsUnderRequestFiletype( self,
+                                                              ycm,
+                                                              timings ):
+    current_buffer = VimBuffer( 'buffer', filetype = 'cpp' )
+
+    def ServerResponse( *args ):
+      return { 'completions': [], 'completion_start_column': 1 }
+
+    with MockVimBuffers( [ current_buffer ], [ current_buffer ] ):
+      with MockCompletionRequest( ServerResponse ):
+        ycm.SendCompletionRequest()
+        assert_that( ycm.CompletionRequestReady() )
+        ycm.GetCompletionResponse()
+        ycm.OnCompletionDisplayed( 0.001 )
+
+    # Every phase of the request, including the building of its data before
+    # it's sent, is recorded under the filetype of the request.
+    assert_that( timings.Samples(),
+                 has_item( has_entries( { 'phase': 'build' } ) ) )
+    assert_that( timings.Samples(),
+                 only_contains( has_entries( { 'handler': 'completions',
+                                               'filetype': 'cpp' } ) ) )
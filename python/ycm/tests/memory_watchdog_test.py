@@ -0,0 +1,125 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+from ycm.tests.test_utils import FakeClock, MockVimModule
+MockVimModule()
+
+import os
+import tempfile
+from hamcrest import assert_that, equal_to, has_key, none
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+from ycm.memory_watchdog import ( MEBIBYTE, MemoryWatchdog, ProcessTreeMemory,
+                                  RECYCLE_INTERVAL_SECONDS,
+                                  SAMPLE_INTERVAL_SECONDS )
+
+
+@skipUnless( hasattr( os, 'sysconf' ), 'Needs the page size' )
+class MemoryWatchdogTest( TestCase ):
+  def setUp( self ):
+    self._directory = tempfile.TemporaryDirectory()
+    self._proc = patch( 'ycm.memory_watchdog.PROC_DIRECTORY',
+                        self._directory.name )
+    self._proc.start()
+
+
+  def tearDown( self ):
+    self._proc.stop()
+    self._directory.cleanup()
+
+
+  def _AddProcess( self, pid, name, parent_pid, rss_mb ):
+    directory = os.path.join( self._directory.name, str( pid ) )
+    os.makedirs( directory, exist_ok = True )
+    rss_pages = rss_mb * MEBIBYTE // os.sysconf( 'SC_PAGE_SIZE' )
+    fields = [ 'S', str( parent_pid ) ] + [ '0' ] * 19 + [
+      str( rss_pages ), '0', '0' ]
+    with open( os.path.join( directory, 'stat' ), 'w' ) as stat:
+      stat.write( f'{ pid } ({ name }) { " ".join( fields ) }\n' )
+
+
+  def test_ProcessTreeMemory( self ):
+    self._AddProcess( 1, 'init', 0, 10 )
+    self._AddProcess( 100, 'python3', 1, 300 )
+    self._AddProcess( 101, 'clangd', 100, 2000 )
+    self._AddProcess( 102, 'weird ) (name', 101, 50 )
+    self._AddProcess( 200, 'vim', 1, 100 )
+    os.makedirs( os.path.join( self._directory.name, 'self' ) )
+    assert_that( ProcessTreeMemory( 100 ), equal_to( {
+      100: 300 * MEBIBYTE,
+      101: 2000 * MEBIBYTE,
+      102: 50 * MEBIBYTE } ) )
+    assert_that( ProcessTreeMemory( 300 ), none() )
+    assert_that( ProcessTreeMemory( -1 ), none() )
+
+
+  def test_ProcessTreeMemory_NoProc( self ):
+    with patch( 'ycm.memory_watchdog.PROC_DIRECTORY',
+                os.path.join( self._directory.name, 'missing' ) ):
+      assert_that( ProcessTreeMemory( 1 ), none() )
+
+
+  def test_MemoryWatchdog_SampleInterval( self ):
+    clock = FakeClock()
+    watchdog = MemoryWatchdog( clock )
+    self._AddProcess( 100, 'python3', 1, 300 )
+    assert_that( watchdog.Sample( 100 ), equal_to( { 100: 300 * MEBIBYTE } ) )
+    self._AddProcess( 100, 'python3', 1, 400 )
+    clock.time += SAMPLE_INTERVAL_SECONDS - 1
+    assert_that( watchdog.Sample( 100 ), equal_to( { 100: 300 * MEBIBYTE } ) )
+    clock.time += 1
+    assert_that( watchdog.Sample( 100 ), equal_to( { 100: 400 * MEBIBYTE } ) )
+
+
+  def test_MemoryWatchdog_SampleNewServer( self ):
+    clock = FakeClock()
+    watchdog = MemoryWatchdog( clock )
+    self._AddProcess( 100, 'python3', 1, 1100 )
+    assert_that( watchdog.ShouldRecycle( 100, 1000 ), equal_to( True ) )
+
+    # The server crashed or was restarted with :YcmRestartServer. The new one
+    # isn't judged on the memory of the previous one.
+    self._AddProcess( 200, 'python3', 1, 300 )
+    clock.time += 1
+    assert_that( watchdog.Sample( 200 ), equal_to( { 200: 300 * MEBIBYTE } ) )
+    assert_that( watchdog.ShouldRecycle( 200, 1000 ), equal_to( False ) )
+
+
+  def test_MemoryWatchdog_ShouldRecycle( self ):
+    clock = FakeClock()
+    watchdog = MemoryWatchdog( clock )
+    self._AddProcess( 100, 'python3', 1, 300 )
+    self._AddProcess( 101, 'clangd', 100, 800 )
+    assert_that( watchdog.ShouldRecycle( 100, 0 ), equal_to( False ) )
+    assert_that( watchdog.ShouldRecycle( 100, 2000 ), equal_to( False ) )
+    assert_that( watchdog.ShouldRecycle( 100, 1000 ), equal_to( True ) )
+
+    watchdog.OnRecycled()
+    assert_that( watchdog.Recycles(), equal_to( 1 ) )
+    # The new server is as big but isn't replaced right away.
+    self._AddProcess( 200, 'python3', 1, 1100 )
+    assert_that( watchdog.ShouldRecycle( 200, 1000 ), equal_to( False ) )
+    clock.time += RECYCLE_INTERVAL_SECONDS
+    assert_that( watchdog.ShouldRecycle( 200, 1000 ), equal_to( True ) )
+
+
+@skipUnless( os.path.isdir( '/proc' ), 'Needs /proc' )
+class ProcessTreeMemoryTest( TestCase ):
+  def test_ProcessTreeMemory_CurrentProcess( self ):
+    memory = ProcessTreeMemory( os.getpid() )
+    assert_that( memory, has_key( os.getpid() ) )
+    assert_that( memory[ os.getpid() ] > 0, equal_to( True ) )
@@ -18,9 +18,13 @@
 from ycm.tests.test_utils import MockVimModule
 MockVimModule()
 
-from hamcrest import assert_that
+import os
+import sys
+import tempfile
+from hamcrest import assert_that, equal_to
 from unittest import TestCase
-from ycm.paths import _EndsWithPython
+from unittest.mock import patch
+from ycm.paths import _EndsWithPython, PathToPythonInterpreter
 
 
 def EndsWithPython_Good( path ):
@@ -56,3 +60,28 @@ class PathTest( TestCase ):
     ]:
       with self.subTest( path = path ):
         EndsWithPython_Bad( path )
+
+
+  def test_PathToPythonInterpreter_Cache( self ):
+    with tempfile.TemporaryDirectory() as cache_directory:
+      with patch.dict( os.environ, { 'XDG_CACHE_HOME': cache_directory,
+                                     'LOCALAPPDATA': cache_directory } ):
+        with patch( 'ycm.paths._FindPythonInterpreter',
+                    return_value = sys.executable ) as find:
+          for _ in range( 2 ):
+            assert_that( PathToPythonInterpreter( '', use_cache = True ),
+                         equal_to( sys.executable ) )
+          find.assert_called_once_with( '' )
+
+          # The interpreter is found again when the option changes.
+          PathToPythonInterpreter( 'python3', use_cache = True )
+          find.assert_called_with( 'python3' )
+          assert_that( find.call_count, equal_to( 2 ) )
+
+          # And when the cached interpreter no longer exists.
+          with patch( 'ycmd.utils.GetExecutable', return_value = None ):
+            PathToPythonInterpreter( '', use_cache = True )
+          assert_that( find.call_count, equal_to( 3 ) )
+
+          PathToPythonInterpreter( '' )
+          assert_that( find.call_count, equal_to( 4 ) )
@@ -0,0 +1,85 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+from ycm.tests.test_utils import MockVimModule
+MockVimModule()
+
+import os
+import tempfile
+from hamcrest import assert_that, equal_to, is_not, none
+from unittest import TestCase
+from unittest.mock import patch
+from ycm.persistent_cache import FileStamp, MAX_ENTRIES, PersistentCache
+
+
+class PersistentCacheTest( TestCase ):
+  def setUp( self ):
+    self._directory = tempfile.TemporaryDirectory()
+    self._environ = patch.dict( os.environ, {
+      'XDG_CACHE_HOME': self._directory.name,
+      'LOCALAPPDATA': self._directory.name } )
+    self._environ.start()
+
+
+  def tearDown( self ):
+    self._environ.stop()
+    self._directory.cleanup()
+
+
+  def test_PersistentCache_GetAndSet( self ):
+    cache = PersistentCache( 'test' )
+    assert_that( cache.Get( [ 'key', 1 ] ), none() )
+    cache.Set( [ 'key', 1 ], { 'value': [ 1, 'a' ] } )
+    cache.Set( [ 'key', 2 ], 'other' )
+    # Another Vim instance.
+    cache = PersistentCache( 'test' )
+    assert_that( cache.Get( [ 'key', 1 ] ),
+                 equal_to( { 'value': [ 1, 'a' ] } ) )
+    assert_that( cache.Get( [ 'key', 2 ] ), equal_to( 'other' ) )
+    cache.Set( [ 'key', 2 ], 'updated' )
+    assert_that( cache.Get( [ 'key', 2 ] ), equal_to( 'updated' ) )
+    assert_that( PersistentCache( 'other' ).Get( [ 'key', 1 ] ), none() )
+
+
+  def test_PersistentCache_KeepsMostRecentEntries( self ):
+    cache = PersistentCache( 'test' )
+    for key in range( MAX_ENTRIES + 1 ):
+      cache.Set( key, key )
+    assert_that( cache.Get( 0 ), none() )
+    assert_that( cache.Get( MAX_ENTRIES ), equal_to( MAX_ENTRIES ) )
+
+
+  def test_PersistentCache_CorruptFile( self ):
+    cache = PersistentCache( 'test' )
+    cache.Set( 'key', 'value' )
+    with open( os.path.join( self._directory.name, 'ycm', 'test.json' ),
+               'w' ) as cache_file:
+      cache_file.write( '[ [ "truncated' )
+    assert_that( cache.Get( 'key' ), none() )
+    cache.Set( 'key', 'value' )
+    assert_that( cache.Get( 'key' ), equal_to( 'value' ) )
+
+
+  def test_FileStamp( self ):
+    filepath = os.path.join( self._directory.name, 'file' )
+    assert_that( FileStamp( filepath ), none() )
+    with open( filepath, 'w' ) as test_file:
+      test_file.write( 'a' )
+    stamp = FileStamp( filepath )
+    with open( filepath, 'w' ) as test_file:
+      test_file.write( 'ab' )
+    assert_that( FileStamp( filepath ), is_not( equal_to( stamp ) ) )
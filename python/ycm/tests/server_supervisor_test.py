@@ -0,0 +1,89 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+from ycm.tests.test_utils import FakeClock, MockVimModule
+MockVimModule()
+
+from hamcrest import assert_that, contains_exactly, equal_to, none
+from unittest import TestCase
+from ycm.server_supervisor import MAX_RESTARTS, ServerSupervisor, STABLE_SECONDS
+
+
+def Crash( supervisor, clock ):
+  """Waits for the restart of the crashed server and returns the delay."""
+  delay = supervisor.RestartDelay()
+  clock.time += delay
+  assert_that( supervisor.RestartDelay(), equal_to( 0 ) )
+  supervisor.OnServerRestarted()
+  return delay
+
+
+class ServerSupervisorTest( TestCase ):
+  def test_ServerSupervisor_Backoff( self ):
+    clock = FakeClock()
+    supervisor = ServerSupervisor( clock )
+    delays = []
+    while not supervisor.GaveUp():
+      delays.append( Crash( supervisor, clock ) )
+      supervisor.OnServerAlive()
+    assert_that( delays, contains_exactly( 1, 2, 4, 8, 16 ) )
+    assert_that( supervisor.Restarts(), equal_to( MAX_RESTARTS ) )
+
+
+  def test_ServerSupervisor_DelayIsKeptWhilePolling( self ):
+    clock = FakeClock()
+    supervisor = ServerSupervisor( clock )
+    Crash( supervisor, clock )
+    assert_that( supervisor.RestartDelay(), equal_to( 2 ) )
+    clock.time += 1.5
+    assert_that( supervisor.RestartDelay(), equal_to( 0.5 ) )
+
+
+  def test_ServerSupervisor_ResetAfterStablePeriod( self ):
+    clock = FakeClock()
+    supervisor = ServerSupervisor( clock )
+    Crash( supervisor, clock )
+    Crash( supervisor, clock )
+    clock.time += STABLE_SECONDS - 1
+    supervisor.OnServerAlive()
+    assert_that( supervisor.Restarts(), equal_to( 2 ) )
+    clock.time += 1
+    supervisor.OnServerAlive()
+    assert_that( supervisor.Restarts(), equal_to( 0 ) )
+    assert_that( Crash( supervisor, clock ), equal_to( 1 ) )
+
+
+  def test_ServerSupervisor_Reset( self ):
+    clock = FakeClock()
+    supervisor = ServerSupervisor( clock )
+    for _ in range( MAX_RESTARTS ):
+      Crash( supervisor, clock )
+    assert_that( supervisor.GaveUp(), equal_to( True ) )
+    supervisor.Reset()
+    assert_that( supervisor.GaveUp(), equal_to( False ) )
+    assert_that( Crash( supervisor, clock ), equal_to( 1 ) )
+
+
+  def test_ServerSupervisor_Replay( self ):
+    supervisor = ServerSupervisor( FakeClock() )
+    assert_that( supervisor.NextReplayedBuffer(), none() )
+    supervisor.StartReplay( [ 3, 1, 2 ] )
+    assert_that( supervisor.NextReplayedBuffer(), equal_to( 3 ) )
+    assert_that( supervisor.NextReplayedBuffer(), equal_to( 1 ) )
+    # The replay to a crashed server is abandoned.
+    supervisor.OnServerRestarted()
+    assert_that( supervisor.NextReplayedBuffer(), none() )
@@ -0,0 +1,114 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+from ycm.tests.test_utils import ( MockVimBuffers, MockVimModule, VimBuffer,
+                                   _MockVimEval )
+MockVimModule()
+
+import os
+import tempfile
+from hamcrest import ( assert_that, contains_exactly, equal_to, has_entries,
+                       has_item, is_not, has_key )
+from unittest import TestCase
+from unittest.mock import patch
+from ycm.session_recording import ApplySnapshot, ReadSession, SessionRecorder
+
+
+def _MockVimEvalWithVisibleLines( value ):
+  if value == 'line( "w0" )':
+    return '3'
+  if value == 'line( "w$" )':
+    return '42'
+  return _MockVimEval( value )
+
+
+class SessionRecordingTest( TestCase ):
+  def setUp( self ):
+    self._directory = tempfile.TemporaryDirectory()
+    self._filepath = os.path.join( self._directory.name, 'session.gz' )
+
+
+  def tearDown( self ):
+    self._directory.cleanup()
+
+
+  @patch( 'vim.eval', side_effect = _MockVimEvalWithVisibleLines )
+  def test_SessionRecorder_RecordAndRead( self, *args ):
+    current_buffer = VimBuffer( 'foo.cpp',
+                                contents = [ 'int a;', 'int b;', 'int c;' ],
+                                filetype = 'cpp' )
+    recorder = SessionRecorder( self._filepath, { 'inlay_hints': '1' } )
+    with MockVimBuffers( [ current_buffer ], [ current_buffer ], ( 1, 2 ) ):
+      recorder.Record( 'BufferEnter', [] )
+      recorder.Record( 'CursorMovedNormalMode', [] )
+    current_buffer[ 1 ] = 'int bar;'
+    with MockVimBuffers( [ current_buffer ], [ current_buffer ], ( 2, 7 ) ):
+      recorder.Record( 'TextChangedInsertMode', [] )
+      recorder.Record( 'Command', [ [ 'GoTo' ], '', '-1', '2', '2' ] )
+    assert_that( recorder.Stop(), equal_to( 4 ) )
+
+    header, events = ReadSession( self._filepath )
+    assert_that( header, has_entries( {
+      'options': { 'inlay_hints': '1' } } ) )
+    events = list( events )
+    assert_that( events, contains_exactly(
+      has_entries( {
+        'event': 'BufferEnter',
+        'buffer': 1,
+        'cursor': [ 1, 2 ],
+        'visible': [ 3, 42 ],
+        'snapshot': { 'name': os.path.realpath( 'foo.cpp' ),
+                      'filetype': 'cpp',
+                      'lines': [ 'int a;', 'int b;', 'int c;' ] }
+      } ),
+      # The buffer didn't change.
+      is_not( has_key( 'snapshot' ) ),
+      has_entries( {
+        'event': 'TextChangedInsertMode',
+        'cursor': [ 2, 7 ],
+        'snapshot': { 'start': 1, 'end': 2, 'lines': [ 'int bar;' ] }
+      } ),
+      has_entries( {
+        'event': 'Command',
+        'args': [ [ 'GoTo' ], '', '-1', '2', '2' ]
+      } )
+    ) )
+
+    lines = []
+    for event in events:
+      if 'snapshot' in event:
+        lines = ApplySnapshot( lines, event[ 'snapshot' ] )
+    assert_that( lines, equal_to( [ 'int a;', 'int bar;', 'int c;' ] ) )
+
+
+  def test_ApplySnapshot( self ):
+    lines = [ 'a', 'b', 'c', 'd' ]
+    # Lines inserted.
+    assert_that( ApplySnapshot( lines, { 'start': 2,
+                                         'end': 2,
+                                         'lines': [ 'x', 'y' ] } ),
+                 equal_to( [ 'a', 'b', 'x', 'y', 'c', 'd' ] ) )
+    # Lines deleted.
+    assert_that( ApplySnapshot( lines, { 'start': 0,
+                                         'end': 3,
+                                         'lines': [] } ),
+                 equal_to( [ 'd' ] ) )
+    # Whole buffer.
+    assert_that( ApplySnapshot( lines, { 'name': 'foo',
+                                         'filetype': '',
+                                         'lines': [ 'z' ] } ),
+                 has_item( 'z' ) )
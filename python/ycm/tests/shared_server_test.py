@@ -0,0 +1,104 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+from ycm.tests.test_utils import MockVimModule
+MockVimModule()
+
+import os
+import tempfile
+from hamcrest import assert_that, calling, equal_to, is_not, none, raises
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+from ycm import shared_server
+from ycm.shared_server import ServerKey, SharedServer
+
+SERVER = { 'pid': os.getpid(),
+           'location': 'http://127.0.0.1:1234',
+           'unix_socket': None,
+           'hmac_secret': 'c2VjcmV0',
+           'stdout': 'stdout.log',
+           'stderr': 'stderr.log' }
+
+
+@skipUnless( shared_server.Supported(), 'Sharing the server needs fcntl' )
+class SharedServerTest( TestCase ):
+  def setUp( self ):
+    self._directory = tempfile.TemporaryDirectory()
+    self._environ = patch.dict( os.environ,
+                                { 'XDG_RUNTIME_DIR': self._directory.name } )
+    self._environ.start()
+
+
+  def tearDown( self ):
+    self._environ.stop()
+    self._directory.cleanup()
+
+
+  def test_ServerKey( self ):
+    key = ServerKey( { 'a': 1, 'b': 2 }, 'ycmd' )
+    assert_that( ServerKey( { 'b': 2, 'a': 1 }, 'ycmd' ), equal_to( key ) )
+    assert_that( ServerKey( { 'a': 1, 'b': 3 }, 'ycmd' ), is_not( key ) )
+    assert_that( ServerKey( { 'a': 1, 'b': 2 }, 'other' ), is_not( key ) )
+
+
+  def test_SharedServer_AttachAndDetach( self ):
+    shared = SharedServer( 'key' )
+    with shared.Lock():
+      assert_that( shared.Attach(), none() )
+      shared.Register( SERVER )
+    # Another Vim instance, in the same process for the test.
+    with shared.Lock():
+      assert_that( shared.Attach(), equal_to( SERVER ) )
+    assert_that( shared.Clients(), equal_to( 2 ) )
+
+    assert_that( shared.Detach( SERVER[ 'pid' ] ), equal_to( False ) )
+    assert_that( shared.Clients(), equal_to( 1 ) )
+    # The last client shuts the server down.
+    assert_that( shared.Detach( SERVER[ 'pid' ] ), equal_to( True ) )
+    assert_that( shared.Clients(), equal_to( 0 ) )
+    assert_that( shared.Detach( SERVER[ 'pid' ] ), equal_to( False ) )
+
+
+  def test_SharedServer_Restart( self ):
+    shared = SharedServer( 'key' )
+    with shared.Lock():
+      shared.Register( SERVER )
+      shared.Attach()
+    # A restart shuts the server down even if other clients remain.
+    assert_that( shared.Detach( SERVER[ 'pid' ], shut_down = True ),
+                 equal_to( True ) )
+    with shared.Lock():
+      assert_that( shared.Attach(), none() )
+
+
+  def test_SharedServer_DeadServerOrClients( self ):
+    shared = SharedServer( 'key' )
+    with patch( 'ycm.shared_server.ProcessIsRunning', return_value = False ):
+      with shared.Lock():
+        shared.Register( SERVER )
+        assert_that( shared.Attach(), none() )
+      # Clients that exited without detaching aren't counted.
+      assert_that( shared.Detach( SERVER[ 'pid' ] ), equal_to( True ) )
+
+
+  def test_SharedServer_UnsafeDirectory( self ):
+    os.chmod( self._directory.name, 0o755 )
+    os.makedirs( os.path.join( self._directory.name,
+                               f'ycm_shared_{ os.getuid() }' ),
+                 mode = 0o755 )
+    assert_that( calling( SharedServer ).with_args( 'key' ),
+                 raises( OSError, 'accessible to other users' ) )
@@ -0,0 +1,105 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+from ycm.tests.test_utils import MockVimModule
+MockVimModule()
+
+import os
+import sys
+import tempfile
+from hamcrest import ( assert_that, close_to, contains_exactly,
+                       contains_string, equal_to, greater_than_or_equal_to,
+                       has_entries, has_item, has_key, is_not, none )
+from unittest import TestCase
+from ycm import startup_profile
+
+
+def _WriteModule( directory, name, contents ):
+  with open( os.path.join( directory, name + '.py' ), 'w' ) as module_file:
+    module_file.write( contents )
+
+
+class StartupProfileTest( TestCase ):
+  def setUp( self ):
+    self._directory = tempfile.TemporaryDirectory()
+    sys.path.insert( 0, self._directory.name )
+
+
+  def tearDown( self ):
+    startup_profile.Stop()
+    startup_profile._profile = None
+    sys.path.remove( self._directory.name )
+    for name in [ 'ycm_profiled_outer', 'ycm_profiled_inner' ]:
+      sys.modules.pop( name, None )
+    self._directory.cleanup()
+
+
+  def test_StartupProfile_NotStarted( self ):
+    startup_profile.EndPhase( 'phase' )
+    assert_that( startup_profile.Results(), none() )
+    assert_that( startup_profile.Report(),
+                 contains_string( 'g:ycm_profile_startup' ) )
+
+
+  def test_StartupProfile_ImportsAndPhases( self ):
+    _WriteModule( self._directory.name,
+                  'ycm_profiled_inner',
+                  'import time\n'
+                  'time.sleep( 0.01 )\n' )
+    _WriteModule( self._directory.name,
+                  'ycm_profiled_outer',
+                  'import ycm_profiled_inner\n'
+                  'LOADER = __loader__\n' )
+
+    startup_profile.Start()
+    import ycm_profiled_outer
+    startup_profile.EndPhase( 'Import' )
+    startup_profile.EndPhase( 'Nothing' )
+    startup_profile.Stop()
+    startup_profile.EndPhase( 'After stop' )
+
+    # The modules see their real loader.
+    assert_that( type( ycm_profiled_outer.LOADER ).__name__,
+                 equal_to( 'SourceFileLoader' ) )
+    assert_that( ycm_profiled_outer.__spec__.loader,
+                 equal_to( ycm_profiled_outer.LOADER ) )
+    assert_that( [ type( finder ).__name__ for finder in sys.meta_path ],
+                 is_not( has_item( '_TimingFinder' ) ) )
+
+    results = startup_profile.Results()
+    modules = results[ 'modules' ]
+    assert_that( modules, has_key( 'ycm_profiled_inner' ) )
+    inner = modules[ 'ycm_profiled_inner' ]
+    outer = modules[ 'ycm_profiled_outer' ]
+    assert_that( inner[ 'own_ms' ], greater_than_or_equal_to( 10 ) )
+    # The import of the inner module is only counted in the total time of the
+    # outer one.
+    assert_that( outer[ 'total_ms' ],
+                 greater_than_or_equal_to( inner[ 'total_ms' ] ) )
+    assert_that( outer[ 'own_ms' ] + inner[ 'total_ms' ],
+                 close_to( outer[ 'total_ms' ], 1e-6 ) )
+    assert_that( results[ 'import_ms' ],
+                 greater_than_or_equal_to( outer[ 'total_ms' ] ) )
+    assert_that( results[ 'phases' ], contains_exactly(
+      has_entries( { 'name': 'Import',
+                     'ms': greater_than_or_equal_to( outer[ 'total_ms' ] ) } ),
+      has_entries( { 'name': 'Nothing' } )
+    ) )
+
+    report = startup_profile.Report()
+    assert_that( report, contains_string( 'ycm_profiled_outer' ) )
+    assert_that( report, contains_string( 'Import' ) )
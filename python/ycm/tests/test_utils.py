@@ -24,6 +24,7 @@ from hamcrest import ( assert_that,
                        equal_to )
 import contextlib
 import functools
+import itertools
 import json
 import os
 import re
@@ -34,9 +35,12 @@ from unittest import skipIf
 from ycmd.utils import GetCurrentDirectory, OnMac, OnWindows, ToUnicode
 
 
+CHANGEDTICKS = itertools.count( 1 )
 BUFNR_REGEX = re.compile(
   '^bufnr\\( \'(?P<buffer_filename>.+)\'(, ([01]))? \\)$' )
 BUFWINNR_REGEX = re.compile( '^bufwinnr\\( (?P<buffer_number>[0-9]+) \\)$' )
+BUFLOADED_REGEX = re.compile(
+  '^bufloaded\\( (?P<buffer_number>[0-9]+) \\)$' )
 BWIPEOUT_REGEX = re.compile(
   '^(?:silent! )bwipeout!? (?P<buffer_number>[0-9]+)$' )
 GETBUFVAR_REGEX = re.compile(
@@ -168,6 +172,12 @@ def _MockVimBufferEval( value ):
     buffer_number = int( match.group( 'buffer_number' ) )
     return _MockGetBufferWindowNumber( buffer_number )
 
+  match = BUFLOADED_REGEX.search( value )
+  if match:
+    buffer_number = int( match.group( 'buffer_number' ) )
+    return int( any( vim_buffer.number == buffer_number
+                     for vim_buffer in VIM_MOCK.buffers ) )
+
   match = GETBUFVAR_REGEX.search( value )
   if match:
     buffer_number = int( match.group( 'buffer_number' ) )
@@ -206,6 +216,11 @@ def _MockVimOptionsEval( value ):
         global_options[ key[ 2: ] ] = value
     return global_options
 
+  if value.startswith( 'string( map( sort( filter( keys( g: )' ):
+    return str( sorted( [ key[ 2: ], option ]
+                        for key, option in VIM_OPTIONS.items()
+                        if key.startswith( 'g:' ) ) )
+
   match = EXISTS_REGEX.search( value )
   if match:
     option = match.group( 'option' )
@@ -432,7 +447,9 @@ class VimBuffer:
     self.bufhidden = bufhidden
     self.omnifunc = omnifunc
     self.omnifunc_name = omnifunc.__name__ if omnifunc else ''
-    self.changedtick = 1
+    # Buffer numbers are reused between tests so changedticks must not be. See
+    # the buffer data cache in vimsupport.
+    self.changedtick = next( CHANGEDTICKS )
     self.options = {
      'mod': modified,
      'bh': bufhidden
@@ -452,6 +469,7 @@ class VimBuffer:
 
 
   def __setitem__( self, key, value ):
+    self.changedtick = next( CHANGEDTICKS )
     return self.contents.__setitem__( key, value )
 
 
@@ -722,6 +740,18 @@ class VimError( Exception ):
     return repr( self.code )
 
 
+class FakeClock:
+  """A clock for the objects taking one, like ServerSupervisor and
+  MemoryWatchdog, that only moves when |time| is changed."""
+
+  def __init__( self ):
+    self.time = 1000
+
+
+  def __call__( self ):
+    return self.time
+
+
 class ExtendedMock( MagicMock ):
   """An extension to the MagicMock class which adds the ability to check that a
   callable is called with a precise set of calls in a precise order.
@@ -0,0 +1,101 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+from hamcrest import ( assert_that, contains_exactly, equal_to, has_entries,
+                       has_item, none )
+from tempfile import TemporaryDirectory
+from threading import Thread
+from unittest import TestCase
+from ycm import tracing
+
+
+@tracing.Traced( tracing.UI )
+def _Draw( value ):
+  return value
+
+
+def _ReadTrace( directory ):
+  filepath = os.path.join( directory, 'trace.json' )
+  tracing.Dump( filepath )
+  with open( filepath ) as trace_file:
+    return json.load( trace_file )
+
+
+class TracingTest( TestCase ):
+  def tearDown( self ):
+    tracing.Disable()
+
+
+  def test_Tracing_Disabled( self ):
+    assert_that( _Draw( 1 ), equal_to( 1 ) )
+    with tracing.Span( 'parse', tracing.REQUEST ):
+      pass
+    assert_that( tracing.BeginAsync( 'completions', tracing.REQUEST ), none() )
+
+    with TemporaryDirectory() as directory:
+      trace = _ReadTrace( directory )
+    assert_that( [ event for event in trace[ 'traceEvents' ]
+                   if event[ 'ph' ] != 'M' ],
+                 equal_to( [] ) )
+
+
+  def test_Tracing_Events( self ):
+    tracing.Enable( 100 )
+    assert_that( _Draw( 2 ), equal_to( 2 ) )
+    with tracing.Span( 'completions encode', tracing.REQUEST ):
+      pass
+    request_id = tracing.BeginAsync( 'completions',
+                                     tracing.REQUEST,
+                                     { 'filetype': 'cpp' } )
+    thread = Thread( target = tracing.EndAsync,
+                     args = ( 'completions', tracing.REQUEST, request_id ) )
+    thread.start()
+    thread.join()
+
+    with TemporaryDirectory() as directory:
+      trace = _ReadTrace( directory )
+
+    events = [ event for event in trace[ 'traceEvents' ]
+               if event[ 'ph' ] != 'M' ]
+    assert_that( events, contains_exactly(
+      has_entries( { 'name': '_Draw', 'cat': 'ui', 'ph': 'X' } ),
+      has_entries( { 'name': 'completions encode', 'ph': 'X' } ),
+      has_entries( { 'name': 'completions', 'ph': 'b', 'id': request_id,
+                     'args': { 'filetype': 'cpp' } } ),
+      has_entries( { 'name': 'completions', 'ph': 'e', 'id': request_id,
+                     'tid': thread.ident } ),
+    ) )
+    assert_that( events[ 0 ][ 'dur' ] >= 0 )
+    # Threads are named.
+    assert_that( trace[ 'traceEvents' ], has_item(
+      has_entries( { 'ph': 'M', 'name': 'thread_name' } ) ) )
+
+
+  def test_Tracing_RingBuffer( self ):
+    tracing.Enable( 2 )
+    for value in range( 5 ):
+      _Draw( value )
+    tracing.Enable( 2 )
+    _Draw( 0 )
+
+    with TemporaryDirectory() as directory:
+      trace = _ReadTrace( directory )
+    assert_that( [ event for event in trace[ 'traceEvents' ]
+                   if event[ 'ph' ] != 'M' ],
+                 contains_exactly( has_entries( { 'name': '_Draw' } ) ) )
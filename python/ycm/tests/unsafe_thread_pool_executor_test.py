@@ -0,0 +1,148 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+from hamcrest import ( assert_that, calling, contains_exactly, equal_to,
+                       has_entries, raises )
+from threading import Event
+from time import sleep, time
+from unittest import TestCase
+from ycm.unsafe_thread_pool_executor import UnsafeThreadPoolExecutor
+
+
+def _WaitFor( predicate, timeout = 5 ):
+  deadline = time() + timeout
+  while not predicate() and time() < deadline:
+    sleep( 0.01 )
+
+
+class UnsafeThreadPoolExecutorTest( TestCase ):
+  def test_UnsafeThreadPoolExecutor_Submit( self ):
+    executor = UnsafeThreadPoolExecutor( max_workers = 2 )
+    future = executor.submit( pow, 2, 5 )
+    assert_that( future.result( timeout = 5 ), equal_to( 32 ) )
+
+    future = executor.submit( int, 'x' )
+    assert_that( calling( future.result ).with_args( timeout = 5 ),
+                 raises( ValueError ) )
+    executor.shutdown()
+
+
+  def test_UnsafeThreadPoolExecutor_Priorities( self ):
+    executor = UnsafeThreadPoolExecutor( max_workers = 1 )
+    started = Event()
+    release = Event()
+
+    def Block():
+      started.set()
+      release.wait( 5 )
+
+    order = []
+    executor.submit( Block )
+    started.wait( 5 )
+    futures = [
+      executor.submit_with_priority( 3, order.append, 'background' ),
+      executor.submit_with_priority( 2, order.append, 'parse 1' ),
+      executor.submit_with_priority( 0, order.append, 'completion' ),
+      executor.submit_with_priority( 2, order.append, 'parse 2' ),
+    ]
+    release.set()
+    for future in futures:
+      future.result( timeout = 5 )
+
+    assert_that( order, contains_exactly( 'completion',
+                                          'parse 1',
+                                          'parse 2',
+                                          'background' ) )
+    executor.shutdown()
+
+
+  def test_UnsafeThreadPoolExecutor_Limits( self ):
+    executor = UnsafeThreadPoolExecutor( max_workers = 4, limits = { 4: 1 } )
+    started = Event()
+    release = Event()
+
+    def LongPoll():
+      started.set()
+      release.wait( 5 )
+      return 'messages'
+
+    long_polls = [ executor.submit_with_priority( 4, LongPoll )
+                   for _ in range( 3 ) ]
+    started.wait( 5 )
+
+    # Long-polls are limited to one at a time, so other requests still run.
+    assert_that( executor.submit( pow, 2, 5 ).result( timeout = 5 ),
+                 equal_to( 32 ) )
+    assert_that( [ future.running() for future in long_polls ],
+                 contains_exactly( True, False, False ) )
+
+    release.set()
+    for future in long_polls:
+      assert_that( future.result( timeout = 5 ), equal_to( 'messages' ) )
+    executor.shutdown()
+
+
+  def test_UnsafeThreadPoolExecutor_ReuseIdleWorkers( self ):
+    executor = UnsafeThreadPoolExecutor( max_workers = 4 )
+    for _ in range( 10 ):
+      executor.submit( pow, 2, 5 ).result( timeout = 5 )
+
+    assert_that( executor.stats(), has_entries( { 'workers': 1,
+                                                  'busy_workers': 0,
+                                                  'queued': 0 } ) )
+    executor.shutdown()
+
+
+  def test_UnsafeThreadPoolExecutor_StartWorkersOnBacklog( self ):
+    executor = UnsafeThreadPoolExecutor( max_workers = 2 )
+    release = Event()
+    futures = [ executor.submit( release.wait, 5 ) for _ in range( 3 ) ]
+
+    _WaitFor( lambda: executor.stats()[ 'busy_workers' ] == 2 )
+    assert_that( executor.stats(), has_entries( { 'workers': 2,
+                                                  'queued': 1 } ) )
+    release.set()
+    for future in futures:
+      future.result( timeout = 5 )
+    executor.shutdown()
+
+
+  def test_UnsafeThreadPoolExecutor_StopIdleWorkers( self ):
+    executor = UnsafeThreadPoolExecutor( max_workers = 2, idle_timeout = 0.05 )
+    release = Event()
+    futures = [ executor.submit( release.wait, 5 ) for _ in range( 2 ) ]
+    release.set()
+    for future in futures:
+      future.result( timeout = 5 )
+
+    _WaitFor( lambda: executor.stats()[ 'workers' ] == 0 )
+    assert_that( executor.stats(), has_entries( { 'workers': 0 } ) )
+
+    # New workers are started as needed.
+    assert_that( executor.submit( pow, 2, 5 ).result( timeout = 5 ),
+                 equal_to( 32 ) )
+    executor.shutdown()
+
+
+  def test_UnsafeThreadPoolExecutor_Shutdown( self ):
+    executor = UnsafeThreadPoolExecutor( max_workers = 2 )
+    future = executor.submit( pow, 2, 5 )
+    executor.shutdown()
+
+    assert_that( future.result( timeout = 5 ), equal_to( 32 ) )
+    assert_that( calling( executor.submit ).with_args( pow, 2, 5 ),
+                 raises( RuntimeError ) )
@@ -22,7 +22,8 @@ MockVimModule()
 
 from ycm import vimsupport
 from hamcrest import ( assert_that, calling, contains_exactly, empty, equal_to,
-                       has_entry, raises )
+                       has_entries, has_entry, has_key, is_not, raises,
+                       same_instance )
 from unittest import TestCase
 from unittest.mock import MagicMock, call, patch
 from ycmd.utils import ToBytes
@@ -1544,6 +1545,84 @@ class VimsupportTest( TestCase ):
                               has_entry( 'contents', 'abc\nfДa\n' ) ) )
 
 
+  @patch( 'ycm.vimsupport.MODIFIED_BUFFERS', None )
+  def test_GetUnsavedAndSpecifiedBufferData_ModifiedBuffersIndex( self ):
+    current_buffer = VimBuffer( 'current', number = 1 )
+    modified_buffer = VimBuffer( 'modified',
+                                 number = 2,
+                                 contents = [ 'modified' ],
+                                 modified = True )
+    saved_buffer = VimBuffer( 'saved', number = 3, contents = [ 'saved' ] )
+
+    with MockVimBuffers( [ current_buffer, modified_buffer, saved_buffer ],
+                         [ current_buffer ] ):
+      vimsupport.IndexModifiedBuffers()
+      assert_that( vimsupport.MODIFIED_BUFFERS, equal_to( { 2 } ) )
+
+      # Modified buffers not in the index are ignored.
+      saved_buffer.options[ 'mod' ] = True
+      assert_that(
+        vimsupport.GetUnsavedAndSpecifiedBufferData( current_buffer,
+                                                     current_buffer.name ),
+        has_entries( { current_buffer.name: has_entry( 'contents', '\n' ),
+                       modified_buffer.name: has_entry( 'contents',
+                                                        'modified\n' ) } ) )
+      assert_that(
+        vimsupport.GetUnsavedAndSpecifiedBufferData( current_buffer,
+                                                     current_buffer.name ),
+        is_not( has_key( saved_buffer.name ) ) )
+
+      vimsupport.SetBufferModified( 3, True )
+      vimsupport.SetBufferModified( 2, False )
+      modified_buffer.options[ 'mod' ] = False
+      assert_that(
+        vimsupport.GetUnsavedAndSpecifiedBufferData( current_buffer,
+                                                     current_buffer.name ),
+        has_entries( { current_buffer.name: has_entry( 'contents', '\n' ),
+                       saved_buffer.name: has_entry( 'contents',
+                                                     'saved\n' ) } ) )
+      assert_that(
+        vimsupport.GetUnsavedAndSpecifiedBufferData( current_buffer,
+                                                     current_buffer.name ),
+        is_not( has_key( modified_buffer.name ) ) )
+
+      vimsupport.ForgetBuffer( 3 )
+      assert_that( vimsupport.MODIFIED_BUFFERS, empty() )
+
+
+  @patch( 'ycm.vimsupport.MODIFIED_BUFFERS', None )
+  def test_GetUnsavedAndSpecifiedBufferData_ModifiedBuffersIndex_Stale(
+      self ):
+    current_buffer = VimBuffer( 'current', number = 1 )
+    saved_buffer = VimBuffer( 'saved', number = 3 )
+
+    with MockVimBuffers( [ current_buffer, saved_buffer ],
+                         [ current_buffer ] ):
+      vimsupport.IndexModifiedBuffers()
+      # Buffer 2 was wiped out and buffer 3 saved without notifying the index.
+      vimsupport.SetBufferModified( 2, True )
+      vimsupport.SetBufferModified( 3, True )
+
+      assert_that(
+        vimsupport.GetUnsavedAndSpecifiedBufferData( current_buffer,
+                                                     current_buffer.name ),
+        contains_exactly( current_buffer.name ) )
+      assert_that( vimsupport.MODIFIED_BUFFERS, empty() )
+
+
+  def test_GetBufferData_CachedUntilBufferChanges( self ):
+    vim_buffer = VimBuffer( 'filename', contents = [ 'abc' ] )
+
+    with patch( 'vim.buffers', [ vim_buffer ] ):
+      data = vimsupport.GetBufferData( vim_buffer )
+      assert_that( vimsupport.GetBufferData( vim_buffer ),
+                   same_instance( data ) )
+
+      vim_buffer[ 0 ] = 'abcd'
+      assert_that( vimsupport.GetBufferData( vim_buffer ),
+                   has_entry( 'contents', 'abcd\n' ) )
+
+
   def test_GetBufferFilepath_NoBufferName_UnicodeWorkingDirectory( self ):
     vim_buffer = VimBuffer( '', number = 42 )
     unicode_dir = PathToTestFile( 'uni¢od€' )
@@ -28,9 +28,12 @@ MockVimModule()
 import vim
 
 import os
+import subprocess
 import sys
+import time
 from hamcrest import ( assert_that, contains_exactly, empty, equal_to,
-                       has_entries, is_in, is_not, matches_regexp )
+                       has_entries, has_item, is_in, is_not, matches_regexp,
+                       none, same_instance )
 from unittest.mock import call, MagicMock, patch
 from unittest import TestCase
 
@@ -41,14 +44,51 @@ from ycm.tests import ( StopServer,
                         UserOptions,
                         WaitUntilReady,
                         YouCompleteMeInstance )
-from ycm.client.base_request import _LoadExtraConfFile
+from ycm.client.base_request import BaseRequest, _LoadExtraConfFile
 from ycm.youcompleteme import YouCompleteMe
 from ycmd.responses import ServerError
+from ycmd.utils import CloseStandardStreams, WaitUntilProcessIsTerminated
 from ycm.tests.mock_utils import ( MockAsyncServerResponseDone,
                                    MockAsyncServerResponseInProgress,
                                    MockAsyncServerResponseException )
 
 
+# Prints the modules imported by autoload/youcompleteme.vim when Vim starts.
+_IMPORTED_AT_STARTUP_SCRIPT = '''
+import sys
+import types
+
+vim = types.ModuleType( 'vim' )
+vim.error = Exception
+vim.eval = lambda expression: '-1'
+sys.modules[ 'vim' ] = vim
+
+from ycm import base, vimsupport, youcompleteme
+print( '\\n'.join( sys.modules ) )
+'''
+
+
+def Supervision( restarted = 0,
+                 replay = 0,
+                 replaced = 0,
+                 wait_milliseconds = 1000 ):
+  return { 'restarted': restarted,
+           'replay': replay,
+           'replaced': replaced,
+           'wait_milliseconds': wait_milliseconds }
+
+
+def SuperviseServerUntil( ycm, matcher, timeout = 30 ):
+  """Calls SuperviseServer until its result matches |matcher| and returns
+  it."""
+  expiration = time.monotonic() + timeout
+  while True:
+    supervision = ycm.SuperviseServer()
+    if matcher.matches( supervision ) or time.monotonic() > expiration:
+      return supervision
+    time.sleep( supervision[ 'wait_milliseconds' ] / 1000 )
+
+
 def RunNotifyUserIfServerCrashed( ycm, post_vim_message, test ):
   StopServer( ycm )
 
@@ -226,14 +266,31 @@ class YouCompleteMeTest( TestCase ):
     assert_that( 'ycm_core', is_not( is_in( sys.modules ) ) )
 
 
+  def test_YouCompleteMe_OptInModulesNotImportedAtStartup( self ):
+    # In a new interpreter since the other tests import them.
+    modules = subprocess.check_output(
+      [ sys.executable, '-c', _IMPORTED_AT_STARTUP_SCRIPT ],
+      env = dict( os.environ, PYTHONPATH = os.pathsep.join( sys.path ) ) )
+    modules = modules.decode( 'utf-8' ).split()
+    assert_that( modules, has_item( 'ycm.youcompleteme' ) )
+    for module in [ 'ycm.client.response_notifier',
+                    'ycm.memory_watchdog',
+                    'ycm.server_supervisor',
+                    'ycm.shared_server' ]:
+      assert_that( module, is_not( is_in( modules ) ) )
+
+
   @patch( 'ycm.vimsupport.PostVimMessage' )
   def test_YouCompleteMe_InvalidPythonInterpreterPath( self, post_vim_message ):
     with UserOptions( {
       'g:ycm_server_python_interpreter': '/invalid/python/path' } ):
       try:
         ycm = YouCompleteMe()
+        # The server is considered alive until its launch fails.
+        ycm._WaitForServerLaunch()
 
         assert_that( ycm.IsServerAlive(), equal_to( False ) )
+        ycm.NotifyUserIfServerCrashed()
         post_vim_message.assert_called_once_with(
           "Unable to start the ycmd server. "
           "Path in 'g:ycm_server_python_interpreter' option does not point "
@@ -263,8 +320,10 @@ class YouCompleteMeTest( TestCase ):
       try:
         with patch( 'ycmd.utils.ReadFile', side_effect = IOError ):
           ycm = YouCompleteMe()
+          ycm._WaitForServerLaunch()
 
         assert_that( ycm.IsServerAlive(), equal_to( False ) )
+        ycm.NotifyUserIfServerCrashed()
         post_vim_message.assert_called_once_with(
           "Unable to start the ycmd server. Cannot find Python 3.6+. "
           "Set the 'g:ycm_server_python_interpreter' option to a Python "
@@ -339,6 +398,100 @@ class YouCompleteMeTest( TestCase ):
     } )
 
 
+  @YouCompleteMeInstance( { 'g:ycm_auto_restart_server': 1 } )
+  @patch( 'ycm.vimsupport.PostVimMessage', new_callable = ExtendedMock )
+  def test_YouCompleteMe_SuperviseServer_RestartsAfterDelay(
+      self, ycm, post_vim_message ):
+    StopServer( ycm )
+    ycm._server_popen = MagicMock( autospec = True )
+    ycm._server_popen.poll.return_value = 1
+
+    # The crash isn't reported since the server is restarted after 1 second.
+    ycm.OnFileReadyToParse()
+    assert_that( ycm.SuperviseServer(), equal_to( Supervision() ) )
+    post_vim_message.assert_not_called()
+
+
+  @YouCompleteMeInstance( { 'g:ycm_auto_restart_server': 1 } )
+  @patch( 'ycm.vimsupport.PostVimMessage', new_callable = ExtendedMock )
+  def test_YouCompleteMe_SuperviseServer_UnrecoverableCrash(
+      self, ycm, post_vim_message ):
+    message = ( "The ycmd server SHUT DOWN (restart with ':YcmRestartServer'). "
+                "YCM core library not detected; you need to compile YCM before "
+                "using it. Follow the instructions in the documentation." )
+    StopServer( ycm )
+    ycm._server_popen = MagicMock( autospec = True )
+    ycm._server_popen.poll.return_value = 4
+
+    assert_that( ycm.SuperviseServer(), equal_to( Supervision() ) )
+    post_vim_message.assert_has_exact_calls( [ call( message ) ] )
+
+
+  @YouCompleteMeInstance( { 'g:ycm_server_memory_limit_mb': 100 } )
+  @patch( 'ycm.vimsupport.InInsertMode', return_value = False )
+  @patch( 'ycm.vimsupport.PostVimMessage', new_callable = ExtendedMock )
+  @patch( 'ycm.memory_watchdog.ProcessTreeMemory',
+          return_value = { 1: 100 * 1024 * 1024, 2: 50 * 1024 * 1024 } )
+  def test_YouCompleteMe_SuperviseServer_RecyclesServer(
+      self, ycm, process_tree_memory, post_vim_message, in_insert_mode ):
+    old_server = ycm._server_popen
+    old_location = BaseRequest.server_location
+    assert_that( ycm.SuperviseServer(),
+                 equal_to( Supervision( wait_milliseconds = 100 ) ) )
+    post_vim_message.assert_has_exact_calls( [
+      call( 'The ycmd server uses 150 MiB, more than 100 MiB. Replacing it...' )
+    ] )
+
+    # The previous server answers the requests until the new one is ready and
+    # the state of the buffers was replayed to it.
+    supervision = SuperviseServerUntil( ycm, has_entries( { 'replay': 1 } ) )
+    assert_that( supervision, equal_to(
+      Supervision( replay = 1, wait_milliseconds = 100 ) ) )
+    assert_that( BaseRequest.server_location, equal_to( old_location ) )
+    assert_that( ycm.ServerPid(), equal_to( old_server.pid ) )
+    assert_that( ycm.IsServerReady(), equal_to( True ) )
+    ycm.ReplayServerState( [] )
+
+    # Nor does YCM switch to the new server in insert mode.
+    in_insert_mode.return_value = True
+    assert_that( ycm.SuperviseServer(),
+                 equal_to( Supervision( wait_milliseconds = 100 ) ) )
+    assert_that( old_server.poll(), none() )
+
+    in_insert_mode.return_value = False
+    assert_that( ycm.SuperviseServer(),
+                 equal_to( Supervision( replaced = 1 ) ) )
+    WaitUntilProcessIsTerminated( old_server )
+    CloseStandardStreams( old_server )
+    assert_that( BaseRequest.server_location, is_not( old_location ) )
+    assert_that( ycm.ServerPid(), is_not( old_server.pid ) )
+    assert_that( ycm.IsServerAlive(), equal_to( True ) )
+    WaitUntilReady()
+
+
+  @YouCompleteMeInstance( { 'g:ycm_server_memory_limit_mb': 100 } )
+  @patch( 'ycm.vimsupport.InInsertMode', return_value = True )
+  @patch( 'ycm.vimsupport.PostVimMessage', new_callable = ExtendedMock )
+  @patch( 'ycm.memory_watchdog.ProcessTreeMemory',
+          return_value = { 1: 150 * 1024 * 1024 } )
+  def test_YouCompleteMe_SuperviseServer_DoesNotRecycleInInsertMode(
+      self, ycm, process_tree_memory, post_vim_message, *args ):
+    server = ycm._server_popen
+    assert_that( ycm.SuperviseServer(), equal_to( Supervision() ) )
+    post_vim_message.assert_not_called()
+    assert_that( ycm._replacement_server, none() )
+    assert_that( ycm.ServerPid(), equal_to( server.pid ) )
+
+
+  @YouCompleteMeInstance( { 'g:ycm_server_use_unix_socket': 1 } )
+  def test_YouCompleteMe_UnixSocketUnsupported( self, ycm ):
+    # A server ignoring its socket was reached over TCP before. The next ones
+    # aren't given a socket.
+    with patch( 'ycm.client.connection_pool.ConnectionPool.'
+                'UnixSocketUnsupported', return_value = True ):
+      assert_that( ycm._ChooseServerUnixSocket(), none() )
+
+
   @YouCompleteMeInstance( { 'g:ycm_extra_conf_vim_data': [ 'tempname()' ] } )
   @patch( 'ycm.vimsupport.VimSupportsPopupWindows', return_value=True )
   def test_YouCompleteMe_DebugInfo_ServerRunning( self, ycm, *args ):
@@ -362,6 +515,8 @@ class YouCompleteMeTest( TestCase ):
           '[\\w\\W]*'
           'Server running at: .+\n'
           'Server process ID: \\d+\n'
+          # The memory used is only known on systems with /proc.
+          '(Server memory: \\d+ MiB in \\d+ processes\n)?'
           'Server logfiles:\n'
           '  .+\n'
           '  .+' )
@@ -1259,6 +1414,36 @@ class YouCompleteMeTest( TestCase ):
 
 
 
+  @YouCompleteMeInstance()
+  @patch( 'ycm.client.base_request.BaseRequest.server_extensions',
+          { 'multiplexed-messages' } )
+  @patch( 'ycm.client.base_request.BaseRequest.PostDataToHandlerAsync',
+          return_value = MockAsyncServerResponseInProgress() )
+  def test_YouCompleteMe_OnPeriodicTick_Multiplexed(
+      self,
+      ycm,
+      post_data_to_handler_async ):
+
+    java_buffer = VimBuffer( '/foo.java', filetype = 'java', number = 1 )
+    python_buffer = VimBuffer( '/foo.py', filetype = 'python', number = 2 )
+
+    with MockVimBuffers( [ java_buffer, python_buffer ],
+                         [ java_buffer, python_buffer ] ):
+      assert_that( ycm.OnPeriodicTick(), equal_to( True ) )
+      assert_that( ycm.OnPeriodicTick(), equal_to( True ) )
+
+    # A single request polls for the messages of both filetypes.
+    post_data_to_handler_async.assert_called_once()
+    assert_that( post_data_to_handler_async.call_args[ 0 ][ 0 ], equal_to( {
+      'subscriptions': [
+        { 'filetype': 'java', 'filepath': '/foo.java' },
+        { 'filetype': 'python', 'filepath': '/foo.py' },
+      ]
+    } ) )
+    assert_that( ycm._message_poll_requests[ 'java' ],
+                 same_instance( ycm._message_poll_requests[ 'python' ] ) )
+
+
   @YouCompleteMeInstance()
   @patch( 'ycm.youcompleteme.YouCompleteMe.FiletypeCompleterExistsForFiletype',
           return_value = True )
@@ -0,0 +1,175 @@
+# Copyright (C) 2026 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Opt-in tracing of the client: the lifetime of the requests, the work done in
+each of their phases, the poller ticks and the updates of the UI are recorded
+in a ring buffer, which can be written to a file in the Chrome trace event
+format. The file can be opened in chrome://tracing or https://ui.perfetto.dev
+to see what runs at the same time and what blocks Vim.
+
+Tracing is disabled by default and costs a single check per traced call when
+disabled."""
+
+import functools
+import itertools
+import json
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
+from time import perf_counter
+
+# Categories of the events.
+REQUEST = 'request'
+POLL = 'poll'
+UI = 'ui'
+
+_lock = threading.Lock()
+# The ring buffer of events; None when tracing is disabled.
+_events = None
+_async_ids = itertools.count( 1 )
+
+
+def Enable( max_events ):
+  """Starts recording the last |max_events| events."""
+  global _events
+  with _lock:
+    _events = deque( maxlen = max_events )
+
+
+def Disable():
+  global _events
+  with _lock:
+    _events = None
+
+
+def Enabled():
+  return _events is not None
+
+
+def _Timestamp():
+  # In microseconds, as expected by the trace viewers.
+  return perf_counter() * 1e6
+
+
+def _Append( event ):
+  events = _events
+  if events is not None:
+    event[ 'pid' ] = os.getpid()
+    event[ 'tid' ] = threading.get_ident()
+    # Not only to append, but also so that Dump doesn't see the buffer change
+    # while copying it.
+    with _lock:
+      events.append( event )
+
+
+def Complete( name, category, start, args = None ):
+  """Records an event named |name| that started at |start|, as returned by
+  Now, and ends now."""
+  event = { 'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': start,
+            'dur': _Timestamp() - start }
+  if args:
+    event[ 'args' ] = args
+  _Append( event )
+
+
+def Now():
+  return _Timestamp()
+
+
+@contextmanager
+def Span( name, category, args = None ):
+  """Records the time spent in the body of the with statement."""
+  if _events is None:
+    yield
+    return
+  start = _Timestamp()
+  try:
+    yield
+  finally:
+    Complete( name, category, start, args )
+
+
+def Traced( category, name = None ):
+  """Decorator recording the calls of a function."""
+  def Decorator( function ):
+    event_name = name or function.__qualname__
+
+    @functools.wraps( function )
+    def Wrapper( *args, **kwargs ):
+      if _events is None:
+        return function( *args, **kwargs )
+      start = _Timestamp()
+      try:
+        return function( *args, **kwargs )
+      finally:
+        Complete( event_name, category, start )
+
+    return Wrapper
+  return Decorator
+
+
+def BeginAsync( name, category, args = None ):
+  """Records the start of an operation that may end on another thread. Returns
+  the identifier to pass to EndAsync, or None if tracing is disabled."""
+  if _events is None:
+    return None
+  async_id = next( _async_ids )
+  event = { 'name': name,
+            'cat': category,
+            'ph': 'b',
+            'id': async_id,
+            'ts': _Timestamp() }
+  if args:
+    event[ 'args' ] = args
+  _Append( event )
+  return async_id
+
+
+def EndAsync( name, category, async_id, args = None ):
+  if async_id is None:
+    return
+  event = { 'name': name,
+            'cat': category,
+            'ph': 'e',
+            'id': async_id,
+            'ts': _Timestamp() }
+  if args:
+    event[ 'args' ] = args
+  _Append( event )
+
+
+def Dump( filepath ):
+  """Writes the recorded events to |filepath| in the Chrome trace event format.
+  Returns the number of events written."""
+  with _lock:
+    events = list( _events or [] )
+  pid = os.getpid()
+  thread_names = [ { 'name': 'thread_name',
+                     'ph': 'M',
+                     'pid': pid,
+                     'tid': thread.ident,
+                     'args': { 'name': thread.name } }
+                   for thread in threading.enumerate() ]
+  with open( filepath, 'w' ) as trace_file:
+    json.dump( { 'traceEvents': thread_names + events,
+                 'displayTimeUnit': 'ms' },
+               trace_file )
+  return len( events )
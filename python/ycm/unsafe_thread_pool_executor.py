@@ -10,13 +10,9 @@ import threading
 import weakref
 import sys
 
+from collections import deque
 from concurrent.futures import _base
 
-try:
-  import queue
-except ImportError:
-  import Queue as queue
-
 
 # This file provides an UnsafeThreadPoolExecutor, which operates exactly like
 # the upstream Python version of ThreadPoolExecutor with one exception: it
@@ -26,6 +22,17 @@ except ImportError:
 # This is dangerous for many workloads, but fine for some (like when threads
 # only send network requests). The YCM workload is one of those workloads where
 # it's safe (the aforementioned network requests case).
+#
+# Unlike upstream, work items can be given a priority: a worker always picks the
+# oldest item of the most urgent priority (the lowest number). The number of
+# items of a given priority running at the same time can be limited so that
+# slow items (e.g. long-polls) can't occupy all the workers.
+
+DEFAULT_PRIORITY = 0
+# Threads are started when calls are waiting and all the threads are busy. They
+# are stopped after having had nothing to do for this number of seconds.
+DEFAULT_IDLE_TIMEOUT = 60
+
 
 class _WorkItem:
   def __init__( self, future, fn, args, kwargs ):
@@ -47,45 +54,152 @@ class _WorkItem:
       self.future.set_result( result )
 
 
+class _WorkQueue:
+  """Queue of work items by priority. Items of a priority whose concurrency
+  limit is reached are left in the queue until an item of the same priority
+  completes. Also keeps track of the worker threads consuming the queue, so that
+  threads are only started when there is a backlog and stopped once they have
+  been idle for a while."""
+
+  def __init__( self, limits, idle_timeout ):
+    self._limits = limits
+    self._idle_timeout = idle_timeout
+    self._condition = threading.Condition( threading.Lock() )
+    self._items = {}
+    self._running = {}
+    self._closed = False
+    self._workers = 0
+
+
+  def put( self, priority, work_item, max_workers ):
+    """Queues |work_item| and returns whether a new worker should be started to
+    run it, in which case the caller must start it."""
+    with self._condition:
+      self._items.setdefault( priority, deque() ).append( work_item )
+      self._condition.notify()
+      # Workers that are not running an item are either waiting for one or about
+      # to ask for one.
+      available_workers = self._workers - sum( self._running.values() )
+      if ( self._workers < max_workers and
+           self._runnable_count() > available_workers ):
+        self._workers += 1
+        return True
+      return False
+
+
+  def get( self ):
+    """Blocks until a work item can be run and returns it with its priority.
+    Returns None once the queue is closed and empty or if no work item came for
+    too long; the worker must then stop."""
+    with self._condition:
+      timed_out = False
+      while True:
+        priority = self._next_priority()
+        if priority is not None:
+          self._running[ priority ] = self._running.get( priority, 0 ) + 1
+          return priority, self._items[ priority ].popleft()
+        if timed_out or ( self._closed and not any( self._items.values() ) ):
+          self._workers -= 1
+          return None
+        timed_out = not self._condition.wait( self._idle_timeout )
+
+
+  def task_done( self, priority ):
+    with self._condition:
+      self._running[ priority ] -= 1
+      # An item of this priority may have been waiting for this one to finish.
+      if self._items.get( priority ):
+        self._condition.notify()
+
+
+  def close( self ):
+    with self._condition:
+      self._closed = True
+      self._condition.notify_all()
+
+
+  def stats( self ):
+    with self._condition:
+      return {
+        'workers': self._workers,
+        'busy_workers': sum( self._running.values() ),
+        'queued': sum( len( items ) for items in self._items.values() )
+      }
+
+
+  def _next_priority( self ):
+    for priority in sorted( self._items ):
+      if not self._items[ priority ]:
+        continue
+      limit = self._limits.get( priority )
+      if limit is None or self._running.get( priority, 0 ) < limit:
+        return priority
+    return None
+
+
+  def _runnable_count( self ):
+    """Number of queued items that could be run right now."""
+    count = 0
+    for priority, items in self._items.items():
+      limit = self._limits.get( priority )
+      if limit is None:
+        count += len( items )
+      else:
+        count += max( 0, min( len( items ),
+                              limit - self._running.get( priority, 0 ) ) )
+    return count
+
+
 def _worker( executor_reference, work_queue ):
   try:
     while True:
-      work_item = work_queue.get( block=True )
-      if work_item is not None:
-        work_item.run()
-        # Delete references to object,
-        # whis allow remove object by GC without stuck on work_queue.get()
-        # on next cycle iteration. See GH-60488
-        del work_item
-        continue
-      executor = executor_reference()
-      # Exit if:
-      #   - The executor that owns the worker has been collected OR
-      #   - The executor that owns the worker has been shutdown.
-      if executor is None or executor._shutdown:
-        # Notice other workers
-        work_queue.put( None )
+      entry = work_queue.get()
+      if entry is None:
+        # The executor has been shut down or collected, or this worker has been
+        # idle for too long.
         return
-      del executor
+      priority, work_item = entry
+      try:
+        work_item.run()
+      finally:
+        work_queue.task_done( priority )
+      # Delete references to object,
+      # whis allow remove object by GC without stuck on work_queue.get()
+      # on next cycle iteration. See GH-60488
+      del entry, work_item
   except BaseException:
     _base.LOGGER.critical( 'Exception in worker', exc_info=True )
 
 
 class UnsafeThreadPoolExecutor( _base.Executor ):
-  def __init__( self, max_workers ):
+  def __init__( self,
+                max_workers,
+                limits = None,
+                idle_timeout = DEFAULT_IDLE_TIMEOUT ):
     """Initializes a new ThreadPoolExecutor instance.
 
     Args:
         max_workers: The maximum number of threads that can be used to
             execute the given calls.
+        limits: A dict mapping priorities to the maximum number of calls of
+            that priority that can run at the same time. Unlimited if not
+            specified.
+        idle_timeout: Number of seconds after which a thread that had nothing
+            to do is stopped.
     """
     self._max_workers = max_workers
-    self._work_queue = queue.Queue()
+    self._work_queue = _WorkQueue( limits or {}, idle_timeout )
     self._threads = set()
     self._shutdown = False
     self._shutdown_lock = threading.Lock()
 
   def submit( self, fn, *args, **kwargs ):
+    return self.submit_with_priority( DEFAULT_PRIORITY, fn, *args, **kwargs )
+  submit.__doc__ = _base.Executor.submit.__doc__
+
+  def submit_with_priority( self, priority, fn, *args, **kwargs ):
+    """Like submit but the call is scheduled according to |priority|. Calls
+    with the lowest priority number are run first."""
     with self._shutdown_lock:
       if self._shutdown:
         raise RuntimeError( 'cannot schedule new futures after shutdown' )
@@ -93,31 +207,34 @@ class UnsafeThreadPoolExecutor( _base.Executor ):
       f = _base.Future()
       w = _WorkItem( f, fn, args, kwargs )
 
-      self._work_queue.put( w )
-      self._adjust_thread_count()
+      if self._work_queue.put( priority, w, self._max_workers ):
+        self._start_thread()
       return f
-  submit.__doc__ = _base.Executor.submit.__doc__
 
-  def _adjust_thread_count( self ):
+  def stats( self ):
+    """Returns the number of worker threads, how many of them are running a
+    call and the number of calls waiting for a thread."""
+    return self._work_queue.stats()
+
+  def _start_thread( self ):
     # When the executor gets lost, the weakref callback will wake up
     # the worker threads.
     def weakref_cb( _, q=self._work_queue ):
-      q.put( None )
-    # TODO(bquinlan): Should avoid creating new threads if there are more
-    # idle threads than items in the work queue.
-    if len( self._threads ) < self._max_workers:
-      t = threading.Thread( target=_worker,
-                            args=( weakref.ref( self, weakref_cb ),
-                                   self._work_queue ) )
-      t.daemon = True
-      t.start()
-      self._threads.add( t )
+      q.close()
+    t = threading.Thread( target=_worker,
+                          args=( weakref.ref( self, weakref_cb ),
+                                 self._work_queue ) )
+    t.daemon = True
+    t.start()
+    # Forget about the threads that have been stopped.
+    self._threads = { thread for thread in self._threads if thread.is_alive() }
+    self._threads.add( t )
 
   def shutdown( self, wait=True ):
     with self._shutdown_lock:
       self._shutdown = True
-      self._work_queue.put( None )
+      self._work_queue.close()
     if wait:
-      for t in self._threads:
+      for t in list( self._threads ):
         t.join()
   shutdown.__doc__ = _base.Executor.shutdown.__doc__
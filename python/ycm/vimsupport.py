@@ -28,6 +28,8 @@ from ycmd.utils import ( ByteOffsetToCodepointOffset,
                          OnWindows,
                          ToBytes,
                          ToUnicode )
+from ycm import tracing
+from ycm.buffer_data_cache import BufferDataCache
 
 BUFFER_COMMAND_MAP = { 'same-buffer'      : 'edit',
                        'split'            : 'split',
@@ -51,6 +53,15 @@ NO_SELECTION_MADE_MSG = "No valid selection was made; aborting."
 # those same file names back to their originating buffer numbers.
 MADEUP_FILENAME_TO_BUFFER_NUMBER = {}
 
+# Numbers of the modified buffers. This index is maintained from autocommands
+# when Vim supports the BufModifiedSet event, see IndexModifiedBuffers. It is
+# None otherwise, in which case all buffers are checked on each request.
+MODIFIED_BUFFERS = None
+
+# Contents and filetypes of the buffers sent to the server, so that buffers that
+# didn't change are not joined again for each request.
+BUFFER_DATA_CACHE = BufferDataCache()
+
 NO_COMPLETIONS = {
   'line': -1,
   'column': -1,
@@ -119,11 +130,22 @@ def BufferModified( buffer_object ):
 
 
 def GetBufferData( buffer_object ):
-  return {
-    # Add a newline to match what gets saved to disk. See #1455 for details.
-    'contents': JoinLinesAsUnicode( buffer_object ) + '\n',
-    'filetypes': FiletypesForBuffer( buffer_object )
-  }
+  """Returns the contents and filetypes of |buffer_object|. The returned dict is
+  shared between requests and must not be modified."""
+  buffer_number = buffer_object.number
+  filetypes = FiletypesForBuffer( buffer_object )
+
+  def ComputeBufferData():
+    return {
+      # Add a newline to match what gets saved to disk. See #1455 for details.
+      'contents': JoinLinesAsUnicode( buffer_object ) + '\n',
+      'filetypes': filetypes
+    }
+
+  return BUFFER_DATA_CACHE.Get( buffer_number,
+                                GetBufferChangedTick( buffer_number ),
+                                filetypes,
+                                ComputeBufferData )
 
 
 def GetUnsavedAndSpecifiedBufferData( included_buffer, included_filepath ):
@@ -132,10 +154,7 @@ def GetUnsavedAndSpecifiedBufferData( included_buffer, included_filepath ):
   |included_filepath|."""
   buffers_data = { included_filepath: GetBufferData( included_buffer ) }
 
-  for buffer_object in vim.buffers:
-    if not BufferModified( buffer_object ):
-      continue
-
+  for buffer_object in _GetModifiedBuffers():
     filepath = GetBufferFilepath( buffer_object )
     if filepath in buffers_data:
       continue
@@ -145,6 +164,51 @@ def GetUnsavedAndSpecifiedBufferData( included_buffer, included_filepath ):
   return buffers_data
 
 
+def IndexModifiedBuffers():
+  """Start keeping track of the modified buffers instead of going through all
+  buffers for each request. SetBufferModified and ForgetBuffer must then be
+  called when a buffer is modified, saved or unloaded."""
+  global MODIFIED_BUFFERS
+  MODIFIED_BUFFERS = { buffer_object.number for buffer_object in vim.buffers
+                       if BufferModified( buffer_object ) }
+
+
+def SetBufferModified( buffer_number, modified ):
+  if MODIFIED_BUFFERS is None:
+    return
+  if modified:
+    MODIFIED_BUFFERS.add( buffer_number )
+  else:
+    MODIFIED_BUFFERS.discard( buffer_number )
+
+
+def ForgetBuffer( buffer_number ):
+  SetBufferModified( buffer_number, False )
+  BUFFER_DATA_CACHE.Invalidate( buffer_number )
+
+
+def _GetModifiedBuffers():
+  if MODIFIED_BUFFERS is None:
+    return [ buffer_object for buffer_object in vim.buffers
+             if BufferModified( buffer_object ) ]
+
+  modified_buffers = []
+  for buffer_number in sorted( MODIFIED_BUFFERS ):
+    try:
+      buffer_object = vim.buffers[ buffer_number ]
+    except KeyError:
+      # The buffer was wiped out without the autocommands being triggered.
+      MODIFIED_BUFFERS.discard( buffer_number )
+      continue
+    # Only a few buffers are modified so checking them is cheap, and protects
+    # against changes made while autocommands were disabled.
+    if BufferModified( buffer_object ):
+      modified_buffers.append( buffer_object )
+    else:
+      MODIFIED_BUFFERS.discard( buffer_number )
+  return modified_buffers
+
+
 def GetBufferNumberForFilename( filename, create_buffer_if_needed = False ):
   realpath = os.path.realpath( filename )
   return MADEUP_FILENAME_TO_BUFFER_NUMBER.get( realpath, GetIntValue(
@@ -163,6 +227,10 @@ def BufferIsVisible( buffer_number ):
   return window_number != -1
 
 
+def BufferIsLoaded( buffer_number ):
+  return GetBoolValue( f'bufloaded( { buffer_number } )' )
+
+
 def GetBufferFilepath( buffer_object ):
   if buffer_object.name:
     return os.path.abspath( ToUnicode( buffer_object.name ) )
@@ -577,6 +645,18 @@ def GetVimGlobalsKeys():
   return vim.eval( 'keys( g: )' )
 
 
+def GetVimGlobalsFingerprint( prefix ):
+  """Returns a string that changes whenever a Vim global variable whose name
+  starts with |prefix| is added, removed or modified, or None if the values
+  of these variables can't be converted to Unicode."""
+  try:
+    return vim.eval( 'string( map( sort( filter( keys( g: ), '
+                     f'\'v:val =~# "^{ prefix }"\' ) ), '
+                     '\'[ v:val, g:[ v:val ] ]\' ) )' )
+  except UnicodeDecodeError:
+    return None
+
+
 def VimExpressionToPythonType( vim_expression ):
   """Returns a Python type from the return value of the supplied Vim expression.
   If the expression returns a list, dict or other non-string type, then it is
@@ -877,6 +957,10 @@ def CurrentFiletypes():
   return ToUnicode( filetypes ).split( '.' )
 
 
+def InInsertMode():
+  return 'i' in vim.eval( 'mode()' )
+
+
 def CurrentFiletypesEnabled( disabled_filetypes ):
   """Return False if one of the current filetypes is disabled, True otherwise.
   |disabled_filetypes| must be a dictionary where keys are the disabled
@@ -1002,6 +1086,7 @@ def _OpenFileInSplitIfNeeded( filepath ):
   return ( buffer_num, True )
 
 
+@tracing.Traced( tracing.UI )
 def ReplaceChunks( chunks, silent=False ):
   """Apply the source file deltas supplied in |chunks| to arbitrary files.
   |chunks| is a list of changes defined by ycmd.responses.FixItChunk,
@@ -20,18 +20,23 @@ import json
 import logging
 import os
 import signal
+import socket
+import threading
 import vim
-from subprocess import PIPE
-from tempfile import NamedTemporaryFile
+from subprocess import DEVNULL, PIPE
+from tempfile import NamedTemporaryFile, gettempdir
+from time import perf_counter
 from ycm import base, paths, signature_help, vimsupport
 from ycm.buffer import BufferDict
 from ycmd import utils
 from ycmd.request_wrap import RequestWrap
 from ycm.omni_completer import OmniCompleter
-from ycm import syntax_parse
-from ycm.hierarchy_tree import HierarchyTree
+from ycm import startup_profile, tracing
+from ycm.client import json_codec
 from ycm.client.ycmd_keepalive import YcmdKeepalive
-from ycm.client.base_request import BaseRequest, BuildRequestData
+from ycm.client.base_request import ( BaseRequest, BuildRequestData,
+                                      NewRequestTimer, RequestFiletype,
+                                      NOTIFIED_POLLERS, Server )
 from ycm.client.completer_available_request import SendCompleterAvailableRequest
 from ycm.client.command_request import ( SendCommandRequest,
                                          SendCommandRequestAsync,
@@ -41,12 +46,13 @@ from ycm.client.completion_request import CompletionRequest
 from ycm.client.resolve_completion_request import ResolveCompletionItem
 from ycm.client.signature_help_request import ( SignatureHelpRequest,
                                                 SigHelpAvailableByFileType )
-from ycm.client.debug_info_request import ( SendDebugInfoRequest,
-                                            FormatDebugInfoResponse )
 from ycm.client.omni_completion_request import OmniCompletionRequest
-from ycm.client.event_notification import SendEventNotificationAsync
+from ycm.client.event_notification import ( EventNotification,
+                                             SendEventNotificationAsync )
 from ycm.client.shutdown_request import SendShutdownRequest
-from ycm.client.messages_request import MessagesPoll
+from ycm.client.messages_request import ( MULTIPLEXED_MESSAGES_EXTENSION,
+                                          MessagesPoll,
+                                          MultiplexedMessagesPoll )
 
 
 def PatchNoProxy():
@@ -89,15 +95,47 @@ PYTHON_TOO_OLD_MESSAGE = (
   'Your python is too old to run YCM server. '
   'Please see troubleshooting guide on YCM GitHub wiki.'
 )
+SERVER_RESTARTED_MESSAGE = (
+  'The ycmd server crashed. Restarting it ({restart}/{max_restarts})...' )
+SERVER_RECYCLED_MESSAGE = (
+  'The ycmd server uses {memory_mb} MiB, more than {limit_mb} MiB. '
+  'Replacing it...' )
 SERVER_IDLE_SUICIDE_SECONDS = 1800  # 30 minutes
+# Exit codes of the server that restarting it doesn't fix.
+UNRECOVERABLE_EXIT_CODES = { 3, 4, 7, 8 }
+# How often Vim calls SuperviseServer, and while buffers are being replayed.
+SUPERVISION_INTERVAL_MILLISECONDS = 1000
+REPLAY_INTERVAL_MILLISECONDS = 100
 CLIENT_LOGFILE_FORMAT = 'ycm_'
 SERVER_LOGFILE_FORMAT = 'ycmd_{port}_{std}_'
+SERVER_UNIX_SOCKET_FORMAT = 'ycmd_{pid}_{suffix}.sock'
 
 # Flag to set a file handle inheritable by child processes on Windows. See
 # https://msdn.microsoft.com/en-us/library/ms724935.aspx
 HANDLE_FLAG_INHERIT = 0x00000001
 
 
+class _PhaseTimes:
+  """Times the consecutive phases of a task, each one lasting from the end of
+  the previous one, to log them."""
+
+  def __init__( self ):
+    self._phases = []
+    self._phase_start = perf_counter()
+
+
+  def EndPhase( self, name ):
+    now = perf_counter()
+    self._phases.append( ( name, now - self._phase_start ) )
+    self._phase_start = now
+
+
+  def Log( self, logger, task ):
+    logger.info( '%s: %s', task, ', '.join(
+      f'{ name } { duration * 1000:.2f} ms'
+      for name, duration in self._phases ) )
+
+
 class YouCompleteMe:
   def __init__( self, default_options = {} ):
     self._logger = logging.getLogger( 'ycm' )
@@ -105,33 +143,75 @@ class YouCompleteMe:
     self._server_stdout = None
     self._server_stderr = None
     self._server_popen = None
+    self._server_unix_socket = None
+    self._server_launch = None
+    self._server_launch_error = None
+    self._shared_server = None
+    self._attached_server = None
     self._default_options = default_options
     self._ycmd_keepalive = YcmdKeepalive()
+    self._session_recorder = None
+    # Created when first used, see _Supervisor and _MemoryWatchdog.
+    self._supervisor = None
+    self._replay_request = None
+    self._memory_watchdog = None
+    # The server started to replace the current one because it used too much
+    # memory, see _RecycleServer. The current server keeps answering the
+    # requests until the new one is ready and has the state of the buffers.
+    self._replacement_server = None
     self._SetUpLogging()
+    startup_profile.EndPhase( 'Set up logging' )
     self._SetUpServer()
+    startup_profile.EndPhase( 'Start the server' )
+    if self._user_options[ 'trace_events' ] > 0:
+      tracing.Enable( self._user_options[ 'trace_events' ] )
     self._ycmd_keepalive.Start()
-    self._current_hierarchy = HierarchyTree()
+    startup_profile.EndPhase( 'Start the keepalive' )
+    # Created when first used, like the other features that are not needed to
+    # complete, so that Vim starts faster.
+    self._current_hierarchy = None
+
+
+  def _CurrentHierarchy( self ):
+    if self._current_hierarchy is None:
+      from ycm.hierarchy_tree import HierarchyTree
+      self._current_hierarchy = HierarchyTree()
+    return self._current_hierarchy
+
+
+  def _Supervisor( self ):
+    if self._supervisor is None:
+      from ycm.server_supervisor import ServerSupervisor
+      self._supervisor = ServerSupervisor()
+    return self._supervisor
+
+
+  def _MemoryWatchdog( self ):
+    if self._memory_watchdog is None:
+      from ycm.memory_watchdog import MemoryWatchdog
+      self._memory_watchdog = MemoryWatchdog()
+    return self._memory_watchdog
 
 
   def InitializeCurrentHierarchy( self, items, kind ):
-    return self._current_hierarchy.SetRootNode( items, kind )
+    return self._CurrentHierarchy().SetRootNode( items, kind )
 
 
   def UpdateCurrentHierarchy( self, handle : int, direction : str ):
-    if not self._current_hierarchy.UpdateChangesRoot( handle, direction ):
+    if not self._CurrentHierarchy().UpdateChangesRoot( handle, direction ):
       items = self._ResolveHierarchyItem( handle, direction )
-      self._current_hierarchy.UpdateHierarchy( handle, items, direction )
+      self._CurrentHierarchy().UpdateHierarchy( handle, items, direction )
 
       if items is not None and direction == 'up':
         offset = sum( len( item[ 'locations' ] ) for item in items )
       else:
         offset = 0
 
-      return self._current_hierarchy.HierarchyToLines(), offset
+      return self._CurrentHierarchy().HierarchyToLines(), offset
     else:
-      location = self._current_hierarchy.HandleToRootLocation( handle )
-      kind = self._current_hierarchy._kind
-      self._current_hierarchy.Reset()
+      location = self._CurrentHierarchy().HandleToRootLocation( handle )
+      kind = self._CurrentHierarchy()._kind
+      self._CurrentHierarchy().Reset()
       items = GetRawCommandResponse(
         [ f'{ kind.title() }Hierarchy' ],
         silent = False,
@@ -145,35 +225,37 @@ class YouCompleteMe:
 
   def _ResolveHierarchyItem( self, handle : int, direction : str ):
     return GetRawCommandResponse(
-      self._current_hierarchy.ResolveArguments( handle, direction ),
+      self._CurrentHierarchy().ResolveArguments( handle, direction ),
       silent = False
     )
 
 
   def ShouldResolveItem( self, handle : int, direction : str ):
-    return self._current_hierarchy.ShouldResolveItem( handle, direction )
+    return self._CurrentHierarchy().ShouldResolveItem( handle, direction )
 
 
   def ResetCurrentHierarchy( self ):
-    self._current_hierarchy.Reset()
+    self._CurrentHierarchy().Reset()
 
 
   def JumpToHierarchyItem( self, handle ):
-    self._current_hierarchy.JumpToItem(
+    self._CurrentHierarchy().JumpToItem(
         handle,
         self._user_options[ 'goto_buffer_command' ] )
 
 
   def _SetUpServer( self ):
-    self._available_completers = {}
+    """Sets up the client and chooses the address of the server, then launches
+    the server in the background. Only the steps that need Vim or that the
+    requests depend on are done here, so that a slow filesystem doesn't block
+    Vim. The server is considered alive while it's being launched."""
+    times = _PhaseTimes()
     self._user_notified_about_crash = False
-    self._filetypes_with_keywords_loaded = set()
     self._server_is_ready_with_cache = False
-    self._message_poll_requests = {}
+    self._ForgetServerState()
 
     self._latest_completion_request = None
     self._latest_signature_help_request = None
-    self._signature_help_available_requests = SigHelpAvailableByFileType()
     self._command_requests = {}
     self._next_command_request_id = 0
 
@@ -183,33 +265,137 @@ class YouCompleteMe:
     self._buffers = BufferDict( self._user_options )
 
     self._SetLogLevel()
+    times.EndPhase( 'read the options' )
+
+    self._server_popen = None
+    self._attached_server = None
+    self._server_launch_error = None
+    # The requests sent while the server is launched are refused, like when
+    # it's starting. A shared server started by another Vim replaces this
+    # address once attached to.
+    self._server_unix_socket = self._ChooseServerUnixSocket()
+    server_port = utils.GetUnusedLocalhostPort()
+    self._ConnectToServer( 'http://127.0.0.1:' + str( server_port ),
+                           os.urandom( HMAC_SECRET_LENGTH ) )
+    times.EndPhase( 'choose the server address' )
+
+    self._server_launch = threading.Thread( target = self._LaunchServer,
+                                            args = ( server_port, ),
+                                            name = 'ycmd launch',
+                                            daemon = True )
+    self._server_launch.start()
+    times.EndPhase( 'start the launch' )
+    times.Log( self._logger, 'Server set up' )
+
+
+  def _ForgetServerState( self ):
+    """Forgets what the server was told or answered, for a new server."""
+    self._available_completers = {}
+    self._filetypes_with_keywords_loaded = set()
+    self._message_poll_requests = {}
+    self._messages_poll = None
+    self._signature_help_available_requests = SigHelpAvailableByFileType()
+
+
+  def _LaunchServer( self, server_port ):
+    times = _PhaseTimes()
+    try:
+      self._LaunchOrAttachToServer( server_port, times )
+    except Exception as error:
+      # Vim can't be called from this thread. The error is shown by
+      # NotifyUserIfServerCrashed.
+      self._server_launch_error = (
+        f"Unable to start the ycmd server. { str( error ).rstrip( '.' ) }. "
+        "Correct the error then restart the server "
+        "with ':YcmRestartServer'." )
+      self._logger.exception( self._server_launch_error )
+    times.Log( self._logger, 'Server launched' )
 
-    hmac_secret = os.urandom( HMAC_SECRET_LENGTH )
+
+  def _LaunchOrAttachToServer( self, server_port, times ):
+    shared = self._SharedServer()
+    if shared is None:
+      self._StartServer( server_port, times )
+      return
+    # Vim instances started at the same time wait for the first one to start
+    # the server.
+    with shared.Lock():
+      times.EndPhase( 'lock the shared server' )
+      server = shared.Attach()
+      if server is not None:
+        self._AttachToServer( server )
+        times.EndPhase( 'attach to the shared server' )
+      else:
+        self._StartServer( server_port, times, shared = True )
+        shared.Register( self._ServerDescription() )
+    self._shared_server = shared
+
+
+  def _WaitForServerLaunch( self ):
+    if self._server_launch is not None:
+      self._server_launch.join()
+
+
+  def _ServerLaunching( self ):
+    return self._server_launch is not None and self._server_launch.is_alive()
+
+
+  def _SharedServer( self ):
+    """Returns the registry of the server shared with the other Vim instances
+    with the same options, or None if the server isn't shared."""
+    if not self._user_options[ 'shared_server' ]:
+      return None
+    from ycm import shared_server
+    if not shared_server.Supported():
+      self._logger.warning( 'The server cannot be shared on this system' )
+      return None
+    try:
+      return shared_server.SharedServer( shared_server.ServerKey(
+        dict( self._user_options ), paths.PathToServerScript() ) )
+    except OSError:
+      self._logger.exception( 'Unable to share the server' )
+      return None
+
+
+  def _StartServer( self, server_port, times, shared = False ):
+    """Starts the server at the address chosen by _SetUpServer."""
+    ( self._server_popen,
+      self._server_stdout,
+      self._server_stderr ) = self._StartServerProcess(
+        server_port,
+        BaseRequest.hmac_secret,
+        self._server_unix_socket,
+        times,
+        shared )
+
+
+  def _StartServerProcess( self,
+                           server_port,
+                           hmac_secret,
+                           unix_socket,
+                           times,
+                           shared = False ):
+    """Starts a server listening on |server_port|, and on |unix_socket| if set,
+    and returns its process and the paths of its stdout and stderr logfiles."""
     options_dict = dict( self._user_options )
     options_dict[ 'hmac_secret' ] = utils.ToUnicode(
       base64.b64encode( hmac_secret ) )
     options_dict[ 'server_keep_logfiles' ] = self._user_options[
       'keep_logfiles' ]
+    # A server that doesn't support Unix domain sockets ignores this option and
+    # requests are then sent over TCP.
+    if unix_socket:
+      options_dict[ 'unix_socket' ] = unix_socket
 
     # The temp options file is deleted by ycmd during startup.
     with NamedTemporaryFile( delete = False, mode = 'w+' ) as options_file:
       json.dump( options_dict, options_file )
+    times.EndPhase( 'write the options file' )
 
-    server_port = utils.GetUnusedLocalhostPort()
-
-    BaseRequest.server_location = 'http://127.0.0.1:' + str( server_port )
-    BaseRequest.hmac_secret = hmac_secret
-
-    try:
-      python_interpreter = paths.PathToPythonInterpreter()
-    except RuntimeError as error:
-      error_message = (
-        f"Unable to start the ycmd server. { str( error ).rstrip( '.' ) }. "
-        "Correct the error then restart the server "
-        "with ':YcmRestartServer'." )
-      self._logger.exception( error_message )
-      vimsupport.PostVimMessage( error_message )
-      return
+    python_interpreter = paths.PathToPythonInterpreter(
+      self._user_options[ 'server_python_interpreter' ],
+      use_cache = self._user_options[ 'startup_cache' ] )
+    times.EndPhase( 'find the Python interpreter' )
 
     args = [ python_interpreter,
              paths.PathToServerScript(),
@@ -218,18 +404,79 @@ class YouCompleteMe:
              f'--log={ self._user_options[ "log_level" ] }',
              f'--idle_suicide_seconds={ SERVER_IDLE_SUICIDE_SECONDS }' ]
 
-    self._server_stdout = utils.CreateLogfile(
+    stdout = utils.CreateLogfile(
         SERVER_LOGFILE_FORMAT.format( port = server_port, std = 'stdout' ) )
-    self._server_stderr = utils.CreateLogfile(
+    stderr = utils.CreateLogfile(
         SERVER_LOGFILE_FORMAT.format( port = server_port, std = 'stderr' ) )
-    args.append( f'--stdout={ self._server_stdout }' )
-    args.append( f'--stderr={ self._server_stderr }' )
+    args.append( f'--stdout={ stdout }' )
+    args.append( f'--stderr={ stderr }' )
 
     if self._user_options[ 'keep_logfiles' ]:
       args.append( '--keep_logfiles' )
+    times.EndPhase( 'create the logfiles' )
+
+    if shared:
+      # The server outlives this Vim if other ones are attached to it. It must
+      # not write to pipes that nobody reads anymore nor receive the signals
+      # sent to the terminal of this Vim.
+      popen = utils.SafePopen( args, stdin = DEVNULL,
+                               stdout = DEVNULL,
+                               stderr = DEVNULL,
+                               start_new_session = True )
+    else:
+      popen = utils.SafePopen( args, stdin_windows = PIPE,
+                               stdout = PIPE, stderr = PIPE )
+    times.EndPhase( 'start the process' )
+    return popen, stdout, stderr
 
-    self._server_popen = utils.SafePopen( args, stdin_windows = PIPE,
-                                          stdout = PIPE, stderr = PIPE )
+
+  def _AttachToServer( self, server ):
+    """Uses the |server| started by another Vim instance, as described by
+    _ServerDescription."""
+    self._server_popen = None
+    self._attached_server = server
+    self._server_unix_socket = server[ 'unix_socket' ]
+    self._server_stdout = server[ 'stdout' ]
+    self._server_stderr = server[ 'stderr' ]
+    self._ConnectToServer( server[ 'location' ],
+                           base64.b64decode( server[ 'hmac_secret' ] ) )
+
+
+  def _ServerDescription( self ):
+    return { 'pid': self._server_popen.pid,
+             'location': BaseRequest.server_location,
+             'unix_socket': self._server_unix_socket,
+             'hmac_secret': utils.ToUnicode(
+               base64.b64encode( BaseRequest.hmac_secret ) ),
+             'stdout': self._server_stdout,
+             'stderr': self._server_stderr }
+
+
+  def _ConnectToServer( self, location, hmac_secret ):
+    BaseRequest.server_location = location
+    BaseRequest.hmac_secret = hmac_secret
+    # Connections to the previous server, and what it knew, are useless now.
+    BaseRequest.ConnectionPool().Reset()
+    BaseRequest.ConnectionPool().SetUnixSocket( self._server_unix_socket )
+    BaseRequest.FileDataSync().Reset()
+
+
+  def _ChooseServerUnixSocket( self ):
+    if ( not self._user_options[ 'server_use_unix_socket' ] or
+         utils.OnWindows() or
+         not hasattr( socket, 'AF_UNIX' ) ):
+      return None
+    # The previous server ignored its socket; so will this one.
+    if BaseRequest.ConnectionPool().UnixSocketUnsupported():
+      self._logger.info( 'The ycmd server does not support Unix domain '
+                         'sockets, talking to it over TCP' )
+      return None
+    # The runtime directory is only accessible to the user. Unix socket paths
+    # are limited to about a hundred characters so fall back to the temporary
+    # directory rather than to a longer path.
+    directory = os.environ.get( 'XDG_RUNTIME_DIR' ) or gettempdir()
+    return os.path.join( directory, SERVER_UNIX_SOCKET_FORMAT.format(
+      pid = os.getpid(), suffix = os.urandom( 4 ).hex() ) )
 
 
   def _SetUpLogging( self ):
@@ -273,11 +520,19 @@ class YouCompleteMe:
 
 
   def IsServerAlive( self ):
+    if self._ServerLaunching():
+      return True
+    if self._attached_server is not None:
+      from ycm.shared_server import ProcessIsRunning
+      return ProcessIsRunning( self._attached_server[ 'pid' ] )
     # When the process hasn't finished yet, poll() returns None.
     return bool( self._server_popen ) and self._server_popen.poll() is None
 
 
+  @tracing.Traced( tracing.POLL )
   def CheckIfServerIsReady( self ):
+    if self._ServerLaunching():
+      return False
     if not self._server_is_ready_with_cache and self.IsServerAlive():
       self._server_is_ready_with_cache = BaseRequest().GetDataFromHandler(
           'ready', display_message = False )
@@ -289,12 +544,27 @@ class YouCompleteMe:
 
 
   def NotifyUserIfServerCrashed( self ):
-    if ( not self._server_popen or self._user_notified_about_crash or
-         self.IsServerAlive() ):
+    if ( self._user_notified_about_crash or
+         self.IsServerAlive() or
+         self._ServerWillBeRestarted() ):
+      return
+
+    if self._server_launch_error is not None:
+      error_message = self._server_launch_error
+    elif self._attached_server is not None:
+      # The exit code of a server started by another Vim is unknown. It was
+      # most likely restarted from that Vim.
+      error_message = SERVER_SHUTDOWN_MESSAGE
+    elif self._server_popen:
+      error_message = self._ServerExitMessage( self._server_popen.poll() )
+    else:
       return
     self._user_notified_about_crash = True
+    self._logger.error( error_message )
+    vimsupport.PostVimMessage( error_message )
 
-    return_code = self._server_popen.poll()
+
+  def _ServerExitMessage( self, return_code ):
     logfile = os.path.basename( self._server_stderr )
     # See https://github.com/Valloric/ycmd#exit-codes for the list of exit
     # codes.
@@ -313,28 +583,318 @@ class YouCompleteMe:
 
     if return_code != 8:
       error_message = SERVER_SHUTDOWN_MESSAGE + ' ' + error_message
-    self._logger.error( error_message )
-    vimsupport.PostVimMessage( error_message )
+    return error_message
 
 
   def ServerPid( self ):
+    self._WaitForServerLaunch()
+    if self._attached_server is not None:
+      return self._attached_server[ 'pid' ]
     if not self._server_popen:
       return -1
     return self._server_popen.pid
 
 
-  def _ShutdownServer( self ):
+  def _ShutdownServer( self, restart = False ):
+    self._WaitForServerLaunch()
+    self._DiscardReplacementServer()
+    if self._shared_server is not None:
+      shared = self._shared_server
+      self._shared_server = None
+      # The other Vim instances may still use the server, unless it's being
+      # restarted.
+      if not shared.Detach( self.ServerPid(), shut_down = restart ):
+        return
     SendShutdownRequest()
+    # The server removes its socket when shutting down but it may have crashed.
+    if self._server_unix_socket:
+      utils.RemoveIfExists( self._server_unix_socket )
 
 
   def RestartServer( self ):
+    self._Supervisor().Reset()
     vimsupport.PostVimMessage( 'Restarting ycmd server...' )
-    self._ShutdownServer()
+    self._ShutdownServer( restart = True )
+    self._SetUpServer()
+
+
+  def SuperviseServer( self ):
+    """Called regularly by Vim. Restarts the server, after a delay growing with
+    each restart, when it crashed for a reason that a restart may fix. Replays
+    the state of the buffers once a restarted server is ready, one buffer at a
+    time. Returns whether the server was restarted, whether Vim must give the
+    buffers to replay to the server replacing the current one with
+    ReplayServerState, whether the current server was replaced, and when to
+    call this method again, in milliseconds."""
+    if self.IsServerAlive():
+      self._Supervisor().OnServerAlive()
+      return self._SuperviseAliveServer()
+
+    # The server being replaced crashed. It's restarted like any other.
+    self._DiscardReplacementServer()
+
+    if not self._ServerWillBeRestarted():
+      self.NotifyUserIfServerCrashed()
+      return self._Supervision( False, SUPERVISION_INTERVAL_MILLISECONDS )
+
+    delay = self._Supervisor().RestartDelay()
+    if delay > 0:
+      return self._Supervision( False, min( SUPERVISION_INTERVAL_MILLISECONDS,
+                                            int( delay * 1000 ) + 1 ) )
+
+    self._Supervisor().OnServerRestarted()
+    from ycm.server_supervisor import MAX_RESTARTS
+    message = SERVER_RESTARTED_MESSAGE.format(
+      restart = self._Supervisor().Restarts(), max_restarts = MAX_RESTARTS )
+    self._logger.warning( message )
+    vimsupport.PostVimMessage( message )
+    self._ShutdownServer( restart = True )
     self._SetUpServer()
+    return self._Supervision( True, SUPERVISION_INTERVAL_MILLISECONDS )
+
+
+  def _SuperviseAliveServer( self ):
+    if not self.IsServerReady():
+      return self._Supervision( False, SUPERVISION_INTERVAL_MILLISECONDS )
+    if self._ReplayNextBuffer():
+      return self._Supervision( False, REPLAY_INTERVAL_MILLISECONDS )
+    if self._replacement_server is not None:
+      return self._SuperviseReplacementServer()
+    # Starting a server takes resources away from the completion the user is
+    # waiting for.
+    if self._ServerUsesTooMuchMemory() and not vimsupport.InInsertMode():
+      self._RecycleServer()
+      return self._Supervision( False, REPLAY_INTERVAL_MILLISECONDS )
+    return self._Supervision( False, SUPERVISION_INTERVAL_MILLISECONDS )
+
+
+  def _ServerUsesTooMuchMemory( self ):
+    limit_mb = self._user_options[ 'server_memory_limit_mb' ]
+    # A shared server may be used by other Vim instances.
+    return ( limit_mb > 0 and
+             self._shared_server is None and
+             self._attached_server is None and
+             self._MemoryWatchdog().ShouldRecycle( self.ServerPid(),
+                                                   limit_mb ) )
+
+
+  def _RecycleServer( self ):
+    """Starts a new server to replace the current one, which keeps answering the
+    requests until the new one is ready and the state of the buffers was
+    replayed to it. See _SuperviseReplacementServer."""
+    from ycm.memory_watchdog import MEBIBYTE
+    memory = self._MemoryWatchdog().Sample( self.ServerPid() )
+    message = SERVER_RECYCLED_MESSAGE.format(
+      memory_mb = sum( memory.values() ) // MEBIBYTE,
+      limit_mb = self._user_options[ 'server_memory_limit_mb' ] )
+    self._logger.warning( message )
+    vimsupport.PostVimMessage( message )
+    self._MemoryWatchdog().OnRecycled()
+
+    server_port = utils.GetUnusedLocalhostPort()
+    replacement = {
+      'server': Server( 'http://127.0.0.1:' + str( server_port ),
+                        os.urandom( HMAC_SECRET_LENGTH ),
+                        self._ChooseServerUnixSocket() ),
+      'popen': None,
+      'stdout': None,
+      'stderr': None,
+      'ready': False,
+      'ready_request': None }
+    replacement[ 'launch' ] = threading.Thread(
+      target = self._LaunchReplacementServer,
+      args = ( replacement, server_port ),
+      name = 'ycmd replacement launch',
+      daemon = True )
+    replacement[ 'launch' ].start()
+    self._replacement_server = replacement
+
+
+  def _LaunchReplacementServer( self, replacement, server_port ):
+    server = replacement[ 'server' ]
+    try:
+      ( replacement[ 'popen' ],
+        replacement[ 'stdout' ],
+        replacement[ 'stderr' ] ) = self._StartServerProcess(
+          server_port,
+          server.hmac_secret,
+          server.unix_socket,
+          _PhaseTimes() )
+    except Exception:
+      self._logger.exception( 'Unable to start the new ycmd server' )
+
+
+  def _SuperviseReplacementServer( self ):
+    """Waits for the server replacing the current one to be ready, then asks
+    Vim for the buffers to replay to it and switches to it once they were
+    replayed, outside of insert mode. Keeps the current server if the new one
+    exits."""
+    replacement = self._replacement_server
+    if replacement[ 'launch' ].is_alive():
+      return self._Supervision( False, REPLAY_INTERVAL_MILLISECONDS )
+    popen = replacement[ 'popen' ]
+    if popen is None or popen.poll() is not None:
+      self._logger.error( 'The new ycmd server exited, keeping the current one '
+                          '(PID %s)', self.ServerPid() )
+      self._DiscardReplacementServer()
+      return self._Supervision( False, SUPERVISION_INTERVAL_MILLISECONDS )
+
+    if not replacement[ 'ready' ]:
+      replacement[ 'ready' ] = self._ReplacementServerIsReady()
+      # Vim replies with ReplayServerState once the new server is ready.
+      return self._Supervision( False,
+                                REPLAY_INTERVAL_MILLISECONDS,
+                                replay = replacement[ 'ready' ] )
+
+    # The requests in flight would be lost.
+    if vimsupport.InInsertMode():
+      return self._Supervision( False, REPLAY_INTERVAL_MILLISECONDS )
+    self._SwitchToReplacementServer()
+    return self._Supervision( False,
+                              SUPERVISION_INTERVAL_MILLISECONDS,
+                              replaced = True )
+
+
+  def _ReplacementServerIsReady( self ):
+    replacement = self._replacement_server
+    future = replacement[ 'ready_request' ]
+    if future is None:
+      replacement[ 'ready_request' ] = BaseRequest().GetDataFromHandlerAsync(
+        'ready', server = replacement[ 'server' ] )
+      return False
+    if not future.done():
+      return False
+    replacement[ 'ready_request' ] = None
+    return bool( BaseRequest().HandleFuture( future, display_message = False ) )
+
+
+  def _SwitchToReplacementServer( self ):
+    replacement = self._replacement_server
+    self._replacement_server = None
+    retired_popen = self._server_popen
+    retired_unix_socket = self._server_unix_socket
+
+    # The poll in progress on the current server would never be answered.
+    if self._messages_poll is not None:
+      self._messages_poll.Cancel()
+
+    server = replacement[ 'server' ]
+    server.connection_pool.Reset()
+    self._server_popen = replacement[ 'popen' ]
+    self._server_unix_socket = server.unix_socket
+    self._server_stdout = replacement[ 'stdout' ]
+    self._server_stderr = replacement[ 'stderr' ]
+    self._ConnectToServer( server.location, server.hmac_secret )
+    self._ForgetServerState()
+
+    self._logger.info( 'Shutting down the replaced ycmd server (PID %s)',
+                       retired_popen.pid )
+    # ycmd shuts its completers down when terminated, like when it receives a
+    # shutdown request.
+    if retired_popen.poll() is None:
+      retired_popen.terminate()
+    if retired_unix_socket:
+      utils.RemoveIfExists( retired_unix_socket )
+
+
+  def _DiscardReplacementServer( self ):
+    replacement = self._replacement_server
+    if replacement is None:
+      return
+    self._replacement_server = None
+    # What is left to replay was meant for the new server.
+    self._replay_request = None
+    self._Supervisor().StartReplay( [] )
+
+    replacement[ 'launch' ].join()
+    replacement[ 'server' ].connection_pool.Reset()
+    popen = replacement[ 'popen' ]
+    if popen is not None and popen.poll() is None:
+      popen.terminate()
+    if replacement[ 'server' ].unix_socket:
+      utils.RemoveIfExists( replacement[ 'server' ].unix_socket )
+
+
+  def _Supervision( self,
+                    restarted,
+                    wait_milliseconds,
+                    replay = False,
+                    replaced = False ):
+    return { 'restarted': int( restarted ),
+             'replay': int( replay ),
+             'replaced': int( replaced ),
+             'wait_milliseconds': wait_milliseconds }
+
+
+  def _ServerWillBeRestarted( self ):
+    if ( not self._user_options[ 'auto_restart_server' ] or
+         self._Supervisor().GaveUp() or
+         self._server_launch_error is not None ):
+      return False
+    if self._attached_server is not None:
+      return True
+    return bool( self._server_popen ) and (
+      self._server_popen.poll() not in UNRECOVERABLE_EXIT_CODES )
+
+
+  def ReplayServerState( self, buffer_numbers ):
+    """Sends the state of |buffer_numbers|, the buffers other than the current
+    one that were known to the previous server, to the restarted server, or the
+    state of all the buffers to the server replacing the current one. The first
+    buffers are replayed first."""
+    self._replay_request = None
+    self._Supervisor().StartReplay(
+      [ int( buffer_number ) for buffer_number in buffer_numbers ] )
+
+
+  def _ReplayNextBuffer( self ):
+    """Replays the state of the next buffer once the previous one was parsed, so
+    that the server isn't flooded with requests. Returns whether there is
+    anything left to replay."""
+    if self._replay_request is not None:
+      if not self._replay_request.Done():
+        return True
+      self._replay_request = None
+
+    buffer_number = self._Supervisor().NextReplayedBuffer()
+    # The buffer may have been unloaded since.
+    while ( buffer_number is not None and
+            not vimsupport.BufferIsLoaded( buffer_number ) ):
+      buffer_number = self._Supervisor().NextReplayedBuffer()
+    if buffer_number is None:
+      return False
+
+    extra_data = {}
+    self._AddExtraConfDataIfNeeded( extra_data )
+    server = ( self._replacement_server[ 'server' ]
+               if self._replacement_server is not None else None )
+    self.StartRequestBatch()
+    try:
+      SendEventNotificationAsync( 'BufferVisit',
+                                  buffer_number,
+                                  server = server )
+      self._replay_request = EventNotification( 'FileReadyToParse',
+                                                buffer_number,
+                                                extra_data,
+                                                server )
+      self._replay_request.Start()
+    finally:
+      self.FlushRequestBatch()
+    return True
 
 
   def SendCompletionRequest( self, force_semantic = False ):
-    request_data = BuildRequestData()
+    # The response to the previous request, if it's still pending, is useless
+    # now.
+    if self._latest_completion_request:
+      self._latest_completion_request.Cancel()
+
+    timer = NewRequestTimer( 'completions' )
+    with timer.Time( 'build' ):
+      request_data = BuildRequestData()
+      # The build phase is recorded under the filetype of the request, like the
+      # other phases.
+      timer.filetype = RequestFiletype( request_data )
     request_data[ 'force_semantic' ] = force_semantic
 
     if not self.NativeFiletypeCompletionUsable():
@@ -346,19 +906,26 @@ class YouCompleteMe:
         return
 
     self._AddExtraConfDataIfNeeded( request_data )
-    self._latest_completion_request = CompletionRequest( request_data )
+    self._latest_completion_request = CompletionRequest( request_data, timer )
     self._latest_completion_request.Start()
 
 
+  @tracing.Traced( tracing.POLL )
   def CompletionRequestReady( self ):
     return bool( self._latest_completion_request and
                  self._latest_completion_request.Done() )
 
 
+  @tracing.Traced( tracing.UI )
   def GetCompletionResponse( self ):
     return self._latest_completion_request.Response()
 
 
+  def OnCompletionDisplayed( self, seconds ):
+    if self._latest_completion_request:
+      self._latest_completion_request.OnDisplayed( seconds )
+
+
   def SignatureHelpAvailableRequestComplete( self, filetype, send_new=True ):
     """Triggers or polls signature help available request. Returns whether or
     not the request is complete. When send_new is False, won't send a new
@@ -399,6 +966,8 @@ class YouCompleteMe:
 
       self._AddExtraConfDataIfNeeded( request_data )
 
+      if self._latest_signature_help_request:
+        self._latest_signature_help_request.Cancel()
       self._latest_signature_help_request = SignatureHelpRequest( request_data )
       self._latest_signature_help_request.Start()
       return True
@@ -406,11 +975,13 @@ class YouCompleteMe:
     return False
 
 
+  @tracing.Traced( tracing.POLL )
   def SignatureHelpRequestReady( self ):
     return bool( self._latest_signature_help_request and
                  self._latest_signature_help_request.Done() )
 
 
+  @tracing.Traced( tracing.UI )
   def GetSignatureHelpResponse( self ):
     return self._latest_signature_help_request.Response()
 
@@ -592,6 +1163,7 @@ class YouCompleteMe:
       pass
 
 
+  @tracing.Traced( tracing.POLL )
   def OnPeriodicTick( self ):
     if not self.IsServerAlive():
       # Server has died. We'll reset when the server is started again.
@@ -600,6 +1172,9 @@ class YouCompleteMe:
       # Try again in a jiffy
       return True
 
+    if MULTIPLEXED_MESSAGES_EXTENSION in BaseRequest.server_extensions:
+      return self._PollMultiplexedMessages()
+
     for w in vim.windows:
       for filetype in vimsupport.FiletypesForBuffer( w.buffer ):
         if filetype not in self._message_poll_requests:
@@ -613,6 +1188,26 @@ class YouCompleteMe:
     return any( self._message_poll_requests.values() )
 
 
+  def _PollMultiplexedMessages( self ):
+    if self._messages_poll is None:
+      self._messages_poll = MultiplexedMessagesPoll()
+    for w in vim.windows:
+      for filetype in vimsupport.FiletypesForBuffer( w.buffer ):
+        if filetype not in self._message_poll_requests:
+          self._messages_poll.Subscribe(
+            filetype, vimsupport.GetBufferFilepath( w.buffer ) )
+          self._message_poll_requests[ filetype ] = self._messages_poll
+
+    self._messages_poll.Poll( self )
+
+    # All the polled filetypes share the same request. None means don't poll
+    # this filetype.
+    for filetype, poll in self._message_poll_requests.items():
+      if poll and not poll.Polling( filetype ):
+        self._message_poll_requests[ filetype ] = None
+    return any( self._message_poll_requests.values() )
+
+
   def OnFileReadyToParse( self ):
     if not self.IsServerAlive():
       self.NotifyUserIfServerCrashed()
@@ -637,6 +1232,7 @@ class YouCompleteMe:
     SendEventNotificationAsync( 'BufferUnload', deleted_buffer_number )
 
 
+  @tracing.Traced( tracing.UI )
   def UpdateMatches( self ):
     self.CurrentBuffer().UpdateMatches()
 
@@ -659,6 +1255,14 @@ class YouCompleteMe:
     SendEventNotificationAsync( 'BufferVisit', extra_data = extra_data )
 
 
+  def StartRequestBatch( self ):
+    BaseRequest.StartRequestBatch()
+
+
+  def FlushRequestBatch( self ):
+    BaseRequest.FlushRequestBatch()
+
+
   def CurrentBuffer( self ):
     return self.Buffer( vimsupport.GetCurrentBufferNumber() )
 
@@ -693,10 +1297,50 @@ class YouCompleteMe:
 
 
   def OnVimLeave( self ):
+    if self._session_recorder:
+      self._session_recorder.Stop()
+    self.StopResponseNotifier()
     self._ShutdownServer()
     self._CleanLogfile()
 
 
+  def StartResponseNotifier( self ):
+    """Starts notifying Vim of the arrival of responses. Returns the address
+    Vim must connect to, the token it must send once connected and the pollers
+    that are notified, or an empty dictionary if the notifier can't be
+    started."""
+    if BaseRequest.response_notifier is not None:
+      self.StopResponseNotifier()
+    from ycm.client.response_notifier import ResponseNotifier
+    notifier = ResponseNotifier()
+    try:
+      address = notifier.Start()
+    except OSError:
+      self._logger.exception( 'Unable to start the response notifier' )
+      return {}
+    BaseRequest.response_notifier = notifier
+    return {
+      'address': address,
+      'token': notifier.token,
+      'pollers': NOTIFIED_POLLERS
+    }
+
+
+  def StopResponseNotifier( self ):
+    notifier = BaseRequest.response_notifier
+    if notifier is not None:
+      BaseRequest.response_notifier = None
+      notifier.Stop()
+
+
+  def FirstPollDelay( self, poller ):
+    """Returns the number of milliseconds after which the Vim poller named
+    |poller| should check for the response it waits for the first time, or 0
+    if the server latency is unknown yet."""
+    delay = BaseRequest.latency_estimates.FirstPollDelay( poller )
+    return 0 if delay is None else round( delay * 1000 )
+
+
   def OnCurrentIdentifierFinished( self ):
     SendEventNotificationAsync( 'CurrentIdentifierFinished' )
 
@@ -744,12 +1388,14 @@ class YouCompleteMe:
         self._user_options[ 'open_loclist_on_ycm_diags' ] )
 
 
+  @tracing.Traced( tracing.POLL )
   def FileParseRequestReady( self ):
     # Return True if server is not ready yet, to stop repeating check timer.
     return ( not self.IsServerReady() or
              self.CurrentBuffer().FileParseRequestReady() )
 
 
+  @tracing.Traced( tracing.UI )
   def HandleFileParseRequest( self, block = False ):
     if not self.IsServerReady():
       return
@@ -790,7 +1436,67 @@ class YouCompleteMe:
     return self.CurrentBuffer().ShouldResendParseRequest()
 
 
+  def LatencyStats( self ):
+    """Returns a table of the percentiles of the time taken by each phase of
+    the requests, in milliseconds."""
+    rows = BaseRequest.request_timings.Percentiles()
+    if not rows:
+      return 'No request was timed yet.'
+    lines = [ f'{ "Handler":<24} { "Filetype":<12} { "Phase":<9} '
+              f'{ "Count":>6} { "p50":>9} { "p95":>9} { "p99":>9}' ]
+    for row in rows:
+      lines.append( f'{ row[ "handler" ]:<24} { row[ "filetype" ]:<12} '
+                    f'{ row[ "phase" ]:<9} { row[ "count" ]:>6} '
+                    f'{ row[ "p50" ]:>9.2f} { row[ "p95" ]:>9.2f} '
+                    f'{ row[ "p99" ]:>9.2f}' )
+    return '\n'.join( lines )
+
+
+  def DumpLatencySamples( self, filepath ):
+    """Writes the raw samples of the time taken by each phase of the requests
+    to |filepath| as JSON."""
+    with open( filepath, 'w' ) as samples_file:
+      json.dump( BaseRequest.request_timings.Samples(), samples_file )
+    vimsupport.PostVimMessage( f'Latency samples written to { filepath }',
+                               warning = False )
+
+
+  def DumpTrace( self, filepath ):
+    if not tracing.Enabled():
+      vimsupport.PostVimMessage(
+        'Tracing is disabled. Set the g:ycm_trace_events option to enable it.' )
+      return
+    events = tracing.Dump( filepath )
+    vimsupport.PostVimMessage( f'{ events } events written to { filepath }',
+                               warning = False )
+
+
+  def StartSessionRecording( self, filepath, options ):
+    self.StopSessionRecording()
+    from ycm.session_recording import SessionRecorder
+    self._session_recorder = SessionRecorder( filepath, options )
+    vimsupport.PostVimMessage( f'Recording the session to { filepath }',
+                               warning = False )
+
+
+  def StopSessionRecording( self ):
+    if not self._session_recorder:
+      return
+    events = self._session_recorder.Stop()
+    self._session_recorder = None
+    vimsupport.PostVimMessage( f'{ events } session events recorded',
+                               warning = False )
+
+
+  def RecordSessionEvent( self, event, args ):
+    if self._session_recorder:
+      self._session_recorder.Record( event, args )
+
+
   def DebugInfo( self ):
+    from ycm.client.debug_info_request import ( SendDebugInfoRequest,
+                                                FormatDebugInfoResponse )
+    self._WaitForServerLaunch()
     debug_info = ''
     if self._client_logfile:
       debug_info += f'Client logfile: { self._client_logfile }\n'
@@ -798,8 +1504,12 @@ class YouCompleteMe:
     self._AddExtraConfDataIfNeeded( extra_data )
     debug_info += FormatDebugInfoResponse( SendDebugInfoRequest( extra_data ) )
     debug_info += f'Server running at: { BaseRequest.server_location }\n'
-    if self._server_popen:
-      debug_info += f'Server process ID: { self._server_popen.pid }\n'
+    if self.ServerPid() != -1:
+      debug_info += f'Server process ID: { self.ServerPid() }\n'
+    debug_info += self._ServerMemoryDebugInfo()
+    if self._shared_server is not None:
+      debug_info += ( 'Server shared by '
+                      f'{ self._shared_server.Clients() } Vim instances\n' )
     if self._server_stdout and self._server_stderr:
       debug_info += ( 'Server logfiles:\n'
                       f'  { self._server_stdout }\n'
@@ -810,14 +1520,84 @@ class YouCompleteMe:
                     str( not vimsupport.VimIsNeovim() ) )
     debug_info += ( '\nPopup windows supported: ' +
                     str( vimsupport.VimSupportsPopupWindows() ) )
+    connections = BaseRequest.ConnectionPool().Stats()
+    debug_info += ( f'\nServer connections ({ connections[ "transport" ] }): '
+                    f'{ connections[ "opened" ] } opened, '
+                    f'{ connections[ "reused" ] } reused, '
+                    f'{ connections[ "reconnected" ] } reconnected, '
+                    f'{ connections[ "idle" ] } idle' )
+    keepalive = self._ycmd_keepalive.Stats()
+    debug_info += ( f'\nServer keepalive: { keepalive[ "status" ] }, '
+                    f'{ keepalive[ "pings" ] } pings, '
+                    f'{ keepalive[ "skipped" ] } skipped' )
+    if keepalive[ 'round_trip_time' ] is not None:
+      debug_info += f', last ping took { keepalive[ "round_trip_time" ] } ms'
+    file_data = BaseRequest.FileDataSync().Stats()
+    if file_data[ 'enabled' ]:
+      debug_info += ( '\nFile contents: '
+                      f'{ file_data[ "sent" ] } sent, '
+                      f'{ file_data[ "skipped" ] } skipped as unchanged, '
+                      f'{ file_data[ "resynced" ] } resynced' )
+    else:
+      debug_info += '\nFile contents: always sent'
+    executor = BaseRequest.Executor().stats()
+    debug_info += ( '\nRequest threads: '
+                    f'{ executor[ "workers" ] } running, '
+                    f'{ executor[ "busy_workers" ] } busy, '
+                    f'{ executor[ "queued" ] } queued requests' )
+    dropped_requests = ', '.join(
+      f'{ count } { handler }'
+      for handler, count in sorted( BaseRequest.dropped_requests.items() ) )
+    debug_info += f'\nDropped requests: { dropped_requests or "none" }'
+    buffer_data = vimsupport.BUFFER_DATA_CACHE.Stats()
+    debug_info += ( '\nBuffer contents cache: '
+                    f'{ buffer_data[ "hits" ] } hits, '
+                    f'{ buffer_data[ "misses" ] } misses, '
+                    f'{ buffer_data[ "entries" ] } buffers, '
+                    f'{ buffer_data[ "size" ] } characters' )
+    debug_info += f'\nJSON library: { json_codec.Name() }'
+    notifier = BaseRequest.response_notifier
+    if notifier is not None and notifier.Connected():
+      debug_info += ( '\nResponse notifications: '
+                      f'{ notifier.Stats()[ "sent" ] } sent' )
+    else:
+      debug_info += '\nResponse notifications: disabled'
+    for poller, estimate in sorted(
+        BaseRequest.latency_estimates.Stats().items() ):
+      debug_info += ( f'\nExpected { poller } response time: '
+                      f'{ estimate[ "mean" ] } ms '
+                      f'(± { estimate[ "deviation" ] } ms, '
+                      f'{ estimate[ "samples" ] } samples)' )
+    startup = startup_profile.Results()
+    if startup is not None:
+      debug_info += ( f'\nStartup time: { startup[ "total_ms" ]:.2f} ms, '
+                      f'{ startup[ "import_ms" ]:.2f} ms importing modules' )
     return debug_info
 
 
+  def _ServerMemoryDebugInfo( self ):
+    if not self.IsServerAlive():
+      return ''
+    from ycm.memory_watchdog import MEBIBYTE, ProcessTreeMemory
+    memory = ProcessTreeMemory( self.ServerPid() )
+    if memory is None:
+      return ''
+    debug_info = ( f'Server memory: { sum( memory.values() ) // MEBIBYTE } MiB '
+                   f'in { len( memory ) } processes' )
+    limit_mb = self._user_options[ 'server_memory_limit_mb' ]
+    if limit_mb > 0:
+      debug_info += ( f', recycled above { limit_mb } MiB '
+                      f'({ self._MemoryWatchdog().Recycles() } times)' )
+    return debug_info + '\n'
+
+
   def GetLogfiles( self ):
+    self._WaitForServerLaunch()
     logfiles_list = [ self._client_logfile,
                       self._server_stdout,
                       self._server_stderr ]
 
+    from ycm.client.debug_info_request import SendDebugInfoRequest
     extra_data = {}
     self._AddExtraConfDataIfNeeded( extra_data )
     debug_info = SendDebugInfoRequest( extra_data )
@@ -988,6 +1768,7 @@ class YouCompleteMe:
 
     if self.IsServerReady():
       self._filetypes_with_keywords_loaded.add( filetype )
+    from ycm import syntax_parse
     extra_data[ 'syntax_keywords' ] = list(
        syntax_parse.SyntaxKeywordsForCurrentBuffer() )
 